@@ -0,0 +1,43 @@
+'''Purpose: Throughput of CreateWv3 block writer vs per sample struct loop'''
+import io
+import os
+import sys
+import time
+import struct
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from CreateWv3 import WvWriteData                           # noqa: E402 pylint: disable=E0401,C0413
+
+def LegacyWriteData(fot, IQArry):
+    """Original CreateWv3 data loop, kept as reference"""
+    for IQ in IQArry:
+        data = int(round(IQ[0] * 32767))
+        data = struct.pack('<h', data)
+        fot.write(data)
+        data = int(round(IQ[1] * 32767))
+        data = struct.pack('<h', data)
+        fot.write(data)
+
+def bench(samples):
+    t = np.arange(samples)
+    IQArry = 0.9 * np.stack((np.cos(0.01 * t), np.sin(0.01 * t)), axis=1)
+
+    legacy = io.BytesIO()
+    tick = time.perf_counter()
+    LegacyWriteData(legacy, IQArry)
+    tLegacy = time.perf_counter() - tick
+
+    block = io.BytesIO()
+    tick = time.perf_counter()
+    WvWriteData(block, IQArry[:, 0], IQArry[:, 1])
+    tBlock = time.perf_counter() - tick
+
+    same = legacy.getvalue() == block.getvalue()
+    print(f"{samples:>9d} Samples Legacy:{samples / tLegacy / 1e6:8.3f}MSa/s "
+          f"Block:{samples / tBlock / 1e6:8.3f}MSa/s Speedup:{tLegacy / tBlock:7.1f}x Identical:{same}")
+    return same
+
+if __name__ == "__main__":
+    print(sys.version)
+    for num in [10000, 100000, 1000000]:
+        bench(num)
@@ -0,0 +1,44 @@
+'''Purpose: Time and peak memory of *.env -> *.wv conversion, list parse vs chunked parse'''
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from CreateWv3 import CreateWv, EnvHeader                   # noqa: E402 pylint: disable=E0401,C0413
+
+def LegacyRead(fileIn):
+    """Original CreateWv3 parse: list of string lists, then float array"""
+    with open(fileIn, 'r') as fin:
+        EnvHeader(fin)
+        IQArry = [line.strip().split(',') for line in fin]
+        IQArry = np.asarray(IQArry, dtype=float)
+    return IQArry
+
+def measure(func, *args):
+    tracemalloc.start()
+    tick = time.perf_counter()
+    func(*args)
+    tSec = time.perf_counter() - tick
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tSec, peak
+
+def bench(samples, path):
+    fileIn = os.path.join(path, 'Bench.env')
+    t = np.arange(samples)
+    with open(fileIn, 'w') as fot:
+        fot.write("#Bench\n30000000.000000\n")
+        np.savetxt(fot, 0.7 * np.stack((np.cos(0.01 * t), np.sin(0.01 * t)), axis=1), fmt='%f,%f')
+    tLegacy, mLegacy = measure(LegacyRead, fileIn)
+    tChunk, mChunk = measure(CreateWv, fileIn)
+    size = os.path.getsize(fileIn) / 1e6
+    print(f"{samples:>9d} Samples {size:7.1f}MB  ListParse:{tLegacy:7.3f}s {mLegacy / 1e6:8.1f}MB  "
+          f"ChunkConvert:{tChunk:7.3f}s {mChunk / 1e6:8.1f}MB")
+
+if __name__ == "__main__":
+    print(sys.version)
+    with tempfile.TemporaryDirectory() as tmp:
+        for num in [100000, 1000000]:
+            bench(num, tmp)
@@ -0,0 +1,40 @@
+'''Purpose: Gen_FMChirp / Gen_FM whole array generation vs per sample loop'''
+import os
+import sys
+import time
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'test'))
+from IQGen_Mod import IQGen                                 # noqa: E402 pylint: disable=E0401,C0413
+from test_IQGen_Mod import LegacyFMChirp, LegacyFM          # noqa: E402 pylint: disable=E0401,C0413
+
+def timeit(func, *args):
+    tick = time.perf_counter()
+    with contextlib.redirect_stdout(None):
+        out = func(*args)
+    return time.perf_counter() - tick, out
+
+def benchChirp(RampTime):
+    wave = IQGen()
+    tLegacy, (IData, QData) = timeit(LegacyFMChirp, wave.FC1, wave.FC2, 2.0e9, RampTime)
+    tArray, _ = timeit(wave.Gen_FMChirp, RampTime)
+    err = max(np.max(np.abs(wave.IData - IData)), np.max(np.abs(wave.QData - QData)))
+    print(f"FMChirp {RampTime * 1e6:7.1f}us {len(IData):>8d} Samples Loop:{tLegacy:8.3f}s "
+          f"Array:{tArray:8.4f}s Speedup:{tLegacy / tArray:7.1f}x MaxErr:{err:.1e}")
+
+def benchFM(NumPeriods):
+    wave = IQGen()
+    wave.NumPeriods = NumPeriods
+    tLegacy, (IData, QData) = timeit(LegacyFM, wave.FC1, wave.FMod, wave.OverSamp * wave.FC1, NumPeriods)
+    tArray, _ = timeit(wave.Gen_FM)
+    err = max(np.max(np.abs(wave.IData - IData)), np.max(np.abs(wave.QData - QData)))
+    print(f"FM      {NumPeriods:>7d}Pd {len(IData):>8d} Samples Loop:{tLegacy:8.3f}s "
+          f"Array:{tArray:8.4f}s Speedup:{tLegacy / tArray:7.1f}x MaxErr:{err:.1e}")
+
+if __name__ == "__main__":
+    print(sys.version)
+    for ramp in [10e-6, 100e-6, 1000e-6]:
+        benchChirp(ramp)
+    for periods in [100, 1000, 10000]:
+        benchFM(periods)
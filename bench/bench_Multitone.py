@@ -0,0 +1,38 @@
+'''Purpose: N tone generation, one IFFT vs summing N sinusoids in time'''
+import os
+import sys
+import time
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Multitone import IQGen, TonePhases               # noqa: E402 pylint: disable=E0401,C0413
+
+def TimeSum(wave):
+    """Gen2Tone style: one cos/sin pair per tone"""
+    samples = int(round(wave.OverSamp * wave.NumTones * wave.NumPeriods))
+    t = np.arange(samples) / (wave.OverSamp * wave.NumTones * wave.ToneSpace)
+    IData = np.zeros(samples)
+    QData = np.zeros(samples)
+    for freq, phase in zip(wave.ToneFreqs(), TonePhases(wave.NumTones, wave.TonePhase)):
+        IData += np.cos(2 * np.pi * freq * t + phase)
+        QData += np.sin(2 * np.pi * freq * t + phase)
+    return IData, QData
+
+if __name__ == "__main__":
+    print(sys.version)
+    for numTones in [10, 100, 1000, 4000]:
+        wave = IQGen()
+        wave.NumTones   = numTones
+        wave.NumPeriods = 4
+        wave.PostNorm   = 'none'
+        wave.maxAmpl    = 1e9
+        tick = time.perf_counter()
+        IData, QData = TimeSum(wave)
+        tSum = time.perf_counter() - tick
+        tick = time.perf_counter()
+        with contextlib.redirect_stdout(None):
+            wave.GenMultitone()
+        tFFT = time.perf_counter() - tick
+        err = max(np.max(np.abs(wave.IData - IData)), np.max(np.abs(wave.QData - QData)))
+        print(f"{numTones:>5d} Tones {len(IData):>8d} Samples Sum:{tSum:8.4f}s IFFT:{tFFT:8.4f}s "
+              f"Speedup:{tSum / tFFT:7.1f}x MaxErr:{err:.1e}")
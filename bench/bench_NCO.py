@@ -0,0 +1,38 @@
+'''Purpose: NCO tone/chirp vs float time vector cos/sin, speed and phase error at record end'''
+import os
+import sys
+import time
+from fractions import Fraction
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_NCO import Tone, Chirp                           # noqa: E402 pylint: disable=E0401,C0413
+
+Fs   = 2.0e9
+FREQ = 123.456789e6
+RATE = 1e12                                                 # Chirp Hz/s
+
+def Legacy(samples, rate):
+    t = np.arange(samples) / Fs
+    phase = 2 * np.pi * (FREQ * t + rate * t * t / 2)
+    return np.cos(phase) + 1j * np.sin(phase)
+
+def EndError(IQ, rate):
+    """Max error of the last 100 samples vs exact rational phase"""
+    idx = range(len(IQ) - 100, len(IQ))
+    cyc = [float((Fraction(FREQ) * n / Fraction(Fs) + Fraction(rate) * n * n / (2 * Fraction(Fs) ** 2)) % 1) for n in idx]
+    return np.max(np.abs(IQ[idx] - np.exp(2j * np.pi * np.array(cyc))))
+
+def timeit(func, *args):
+    tick = time.perf_counter()
+    out = func(*args)
+    return time.perf_counter() - tick, out
+
+if __name__ == "__main__":
+    print(sys.version)
+    for samples in [10 ** 5, 10 ** 6, 10 ** 7]:
+        for name, rate, nco in [('Tone', 0.0, lambda n: Tone(FREQ, Fs, n)),
+                                ('Chirp', RATE, lambda n: Chirp(FREQ, RATE, Fs, n))]:
+            tOld, old = timeit(Legacy, samples, rate)
+            tNCO, new = timeit(nco, samples)
+            print(f"{name:<6s}{samples:>9d} Samples cos/sin:{tOld:8.4f}s NCO:{tNCO:8.4f}s "
+                  f"Speedup:{tOld / tNCO:5.1f}x EndErr cos/sin:{EndError(old, rate):.1e} NCO:{EndError(new, rate):.1e}")
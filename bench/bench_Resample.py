@@ -0,0 +1,40 @@
+'''Purpose: Synthesize at the final clock vs at a low rate + polyphase resample (FsOut)'''
+import os
+import sys
+import time
+import contextlib
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import IQGen_Mod                                            # noqa: E402 pylint: disable=E0401,C0413
+import IQGen_OFDM                                           # noqa: E402 pylint: disable=E0401,C0413
+
+def timeit(wave, genFunc):
+    tick = time.perf_counter()
+    with contextlib.redirect_stdout(None):
+        getattr(wave, genFunc)()
+    return time.perf_counter() - tick
+
+def benchChirpSum(FsLow):
+    direct = IQGen_Mod.IQGen()
+    low = IQGen_Mod.IQGen()
+    low.FsChirp = FsLow
+    low.FsOut   = direct.FsChirp
+    tDirect, tLow = timeit(direct, 'Gen_FMChirpSum'), timeit(low, 'Gen_FMChirpSum')
+    print(f"FMChirpSum {len(direct.IData):>8d} Samples 2GHz:{tDirect:8.4f}s "
+          f"{FsLow / 1e6:.0f}MHz+Resample:{tLow:8.4f}s Speedup:{tDirect / tLow:5.1f}x")
+
+def benchOFDM(overLow, overHigh, symbols):
+    direct = IQGen_OFDM.IQGen()
+    direct.OverSamp, direct.NumSymbols = overHigh, symbols
+    low = IQGen_OFDM.IQGen()
+    low.OverSamp, low.NumSymbols = overLow, symbols
+    low.FsOut = direct.K * overHigh * direct.SubSpace
+    tDirect, tLow = timeit(direct, 'GenOFDM'), timeit(low, 'GenOFDM')
+    print(f"OFDM       {len(direct.IData):>8d} Samples x{overHigh:<3d}IFFT:{tDirect:8.4f}s "
+          f"x{overLow}+Resample:{tLow:8.4f}s Speedup:{tDirect / tLow:5.1f}x")
+
+if __name__ == "__main__":
+    print(sys.version)
+    for FsLow in [20e6, 100e6, 400e6]:
+        benchChirpSum(FsLow)
+    for symbols in [1000, 10000]:
+        benchOFDM(2, 32, symbols)
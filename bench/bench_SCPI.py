@@ -0,0 +1,87 @@
+'''Purpose: ARB upload throughput and peak memory, in-memory payload vs streamed block
+         Batch of uploads, connection per upload vs SCPIPool session
+         The mock instrument runs in its own process, so tracemalloc only sees the client.'''
+import os
+import sys
+import time
+import multiprocessing
+import tracemalloc
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_SCPI import MockSCPI, SCPISock, SCPIPool         # noqa: E402 pylint: disable=E0401,C0413
+
+def LegacyUpload(SMW, IData, QData):
+    """Original VSG_SCPI_Write payload: vstack, big-endian copy, bytes concat, one write"""
+    scpi   = ':MMEM:DATA:UNPR "NVWFM://var//user//Legacy.wv",#'
+    iqsize = str(len(IData) * 4)
+    scpi   = scpi + str(len(iqsize)) + iqsize
+    iqdata = np.vstack((IData, QData)).reshape((-1,), order='F')
+    bits   = np.array(iqdata * 32767, dtype='>i2')
+    SMW.sock.sendall(bytes(scpi, 'utf-8') + bits.tobytes() + b'\n')
+
+def StreamUpload(SMW, IData, QData):
+    SMW.write_block(':MMEM:DATA:UNPR "NVWFM://var//user//Stream.wv",', IData, QData)
+
+def measure(func, SMW, IData, QData):
+    tracemalloc.start()
+    tick = time.perf_counter()
+    func(SMW, IData, QData)
+    SMW.query('*OPC?')                                      # Wait for the mock to take it all
+    tSec = time.perf_counter() - tick
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tSec, peak
+
+def PerCallBatch(host, port, waves):
+    """Original VSG_SCPI_Write pattern: connect, upload, CLOC, SEL, SYST:ERR? per waveform"""
+    for name, IData, QData in waves:
+        SMW = SCPISock(host, port)
+        SMW.write_block(f':MMEM:DATA:UNPR "NVWFM://var//user//{name}",', IData, QData)
+        SMW.write(f'SOUR1:BB:ARB:WAV:CLOC "/var/user/{name}",1e9')
+        SMW.write(f'BB:ARB:WAV:SEL "/var/user/{name}"')
+        SMW.query('SYST:ERR?')
+        SMW.close()
+
+def MockServer(conn):
+    """Child process: MockSCPI on a free port, (host, port) sent back, runs until told to stop"""
+    with MockSCPI() as mock:
+        conn.send((mock.host, mock.port))
+        try:
+            conn.recv()
+        except EOFError:                                    # Parent gone
+            pass
+
+def PoolBatch(host, port, waves):
+    with SCPIPool(port=port) as pool:
+        pool.Batch([(host, name, IData, QData, 1e9) for name, IData, QData in waves])
+
+if __name__ == "__main__":
+    print(sys.version)
+    conn, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=MockServer, args=(child,), daemon=True)
+    server.start()
+    host, port = conn.recv()
+    try:
+        SMW = SCPISock(host, port)
+        for samples in [100000, 1000000, 4000000]:
+            t = np.arange(samples)
+            IData, QData = 0.7 * np.cos(0.01 * t), 0.7 * np.sin(0.01 * t)
+            tLegacy, mLegacy = measure(LegacyUpload, SMW, IData, QData)
+            tStream, mStream = measure(StreamUpload, SMW, IData, QData)
+            print(f"{samples:>9d} Samples Legacy:{4 * samples / tLegacy / 1e6:7.1f}MB/s {mLegacy / 1e6:7.1f}MB  "
+                  f"Stream:{4 * samples / tStream / 1e6:7.1f}MB/s {mStream / 1e6:7.1f}MB")
+        SMW.close()
+
+        for count in [10, 50]:
+            t = np.arange(20000)
+            waves = [(f"W{idx}.wv", 0.7 * np.cos(0.01 * t), 0.7 * np.sin(0.01 * t)) for idx in range(count)]
+            tick = time.perf_counter()
+            PerCallBatch(host, port, waves)
+            tPerCall = time.perf_counter() - tick
+            tick = time.perf_counter()
+            PoolBatch(host, port, waves)
+            tPool = time.perf_counter() - tick
+            print(f"{count:>9d} Uploads PerCall:{tPerCall * 1e3:8.2f}ms  Pool:{tPool * 1e3:8.2f}ms")
+    finally:
+        conn.send('stop')
+        server.join()
@@ -0,0 +1,152 @@
+'''Purpose: Time and peak memory of generators, writers and the spectrum stage, saved as JSON
+
+python bench/bench_Suite.py --out base.json                         Record a run
+python bench/bench_Suite.py --out new.json --compare base.json      Record and flag regressions
+python bench/bench_Suite.py --compare base.json new.json            Compare two saved runs
+'''
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import importlib
+import contextlib
+import tracemalloc
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from CreateWv3 import CreateWv                              # noqa: E402 pylint: disable=E0401,C0413
+
+SIZES = [10000, 100000, 1000000]
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+def NewWave(module, samples, genFunc='Gen1Tone_IQ'):
+    """IQGen of module sized to about samples, generated once if genFunc"""
+    wave = importlib.import_module(module).IQGen()
+    wave.NumPeriods = max(1, samples // wave.OverSamp)
+    if genFunc:
+        with quiet():
+            getattr(wave, genFunc)()
+    return wave
+
+def GenCase(module, genFunc):
+    def setup(samples, path):                               # pylint: disable=W0613
+        wave = NewWave(module, samples, None)
+        return wave, getattr(wave, genFunc)
+    return setup
+
+def ChirpCase(samples, path):                               # pylint: disable=W0613
+    wave = NewWave('IQGen_Mod', samples, None)
+    return wave, lambda: wave.Gen_FMChirp(RampTime=samples / 4.0e9)     # Up + down ramp at 2GHz
+
+def WvWriteCase(samples, path):
+    wave = NewWave('IQGen_2Tone', samples)
+    wave.filename = os.path.join(path, 'Bench.env')
+    return wave, wave.WvWrite
+
+def CreateWvCase(samples, path):
+    wave, _ = WvWriteCase(samples, path)
+    with quiet():
+        wave.WvWrite()
+    return wave, lambda: CreateWv(wave.filename)
+
+def FFTCase(samples, path):                                 # pylint: disable=W0613
+    wave = NewWave('IQGen_2Tone', samples)
+    return wave, wave.Spectrum
+
+CASES = {'Gen1Tone_IQ': GenCase('IQGen_2Tone', 'Gen1Tone_IQ'),
+         'Gen2Tone': GenCase('IQGen_2Tone', 'Gen2Tone'),
+         'Gen_FM': GenCase('IQGen_Mod', 'Gen_FM'),
+         'Gen_FMChirp': ChirpCase,
+         'Gen_FMChirpSum': GenCase('IQGen_Mod', 'Gen_FMChirpSum'),  # Fixed 2M samples
+         'WvWrite': WvWriteCase,
+         'CreateWv': CreateWvCase,
+         'FFT': FFTCase}
+
+def Measure(func, repeat=3):
+    """Best of repeat wall time, then peak traced memory of one more run"""
+    best = float('inf')
+    for _ in range(repeat):
+        tick = time.perf_counter()
+        with quiet():
+            func()
+        best = min(best, time.perf_counter() - tick)
+    tracemalloc.start()
+    with quiet():
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def RunSuite(names, sizes, repeat=3):
+    results = []
+    with tempfile.TemporaryDirectory() as path:
+        for name in names:
+            done = set()
+            for samples in sizes:
+                wave, func = CASES[name](samples, path)
+                with quiet():
+                    func()                                  # Warm up, also sizes the waveform
+                actual = len(wave.IData)
+                if actual in done:                          # Size does not scale this case
+                    continue
+                done.add(actual)
+                sec, peak = Measure(func, repeat)
+                results.append({'name': name, 'samples': actual, 'sec': sec, 'peakMB': peak / 1e6})
+                print(f"{name:<15s}{actual:>9d} Samples {sec * 1e3:10.2f}ms {peak / 1e6:9.2f}MB")
+    return {'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'results': results}
+
+def Compare(base, new, threshold=1.25, floor=1e-3):
+    """Print new vs base per (name, samples), return the regressed entries
+    Times below floor seconds in both runs are too noisy to flag."""
+    baseRes = {(res['name'], res['samples']): res for res in base['results']}
+    regress = []
+    for res in new['results']:
+        old = baseRes.get((res['name'], res['samples']))
+        if old is None:
+            continue
+        tRatio = res['sec'] / max(old['sec'], 1e-9)
+        mRatio = res['peakMB'] / max(old['peakMB'], 1e-6)
+        slow   = tRatio > threshold and max(res['sec'], old['sec']) > floor
+        fat    = mRatio > threshold and res['peakMB'] - old['peakMB'] > 1
+        flag   = ' REGRESSION' if slow or fat else ''
+        print(f"{res['name']:<15s}{res['samples']:>9d} Time x{tRatio:6.2f} Mem x{mRatio:6.2f}{flag}")
+        if flag:
+            regress.append(res)
+    return regress
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='IQGen benchmark suite')
+    parser.add_argument('files', nargs='*', help='saved run to compare against --compare, skips running')
+    parser.add_argument('--only', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', default='')
+    parser.add_argument('--compare', default='', help='baseline JSON')
+    parser.add_argument('--threshold', type=float, default=1.25, help='ratio flagged as regression')
+    args = parser.parse_args()
+
+    if args.files:
+        with open(args.files[0]) as fin:
+            run = json.load(fin)
+    else:
+        print(sys.version)
+        run = RunSuite(args.only, args.sizes, args.repeat)
+        if args.out:
+            with open(args.out, 'w') as fot:
+                json.dump(run, fot, indent=1)
+            print(f"Bench: {args.out}")
+    if args.compare:
+        with open(args.compare) as fin:
+            regressions = Compare(json.load(fin), run, args.threshold)
+        print(f"Bench: {len(regressions)} regressions")
+        sys.exit(1 if regressions else 0)
@@ -7,21 +7,171 @@
 #        Values: Sqrt(I^2 + Q^2) < 1
 #        Exampl: 0.34345435,-1.398283
 #
+import os
 import math
 import time
-import struct
+import shutil
+import tempfile
+import warnings
 import numpy as np
 
-def CreateWv(fileIn):
-    WaveWrit = fileIn.split(".")[0] + ".wv"
-    print("CreateWv.py:" + WaveWrit)
-    fin = open(fileIn, 'r')
-    fot = open(WaveWrit, 'wb')
+CHUNK    = 65536                                            # IQ pairs per disk write
+ENVCHUNK = 1 << 22                                          # *.env text bytes per parse block
+
+def WvHeader(comment, date, clock, RMS, MAX, samples):
+    """*.wv header bytes up to and including the '{WAVEFORM-n: #' tag"""
+    numBytes = 4 * samples + 1                              # Waveform = NumSamples * 4 + 1
+    header = "{TYPE: SMU-WV,0}" +\
+             f"{{COMMENT: {comment}}}" +\
+             f"{{DATE:{date}}}" +\
+             f"{{CLOCK:{clock}}}" +\
+             f"{{CLOCK MARKER: {clock}}}" +\
+             f"{{LEVEL OFFS:{RMS:.4f},{MAX:.4f}}}" +\
+             f"{{SAMPLES:{samples:d}}}" +\
+             "{MARKER LIST 1: 0:1;20:0}" +\
+             "{MARKER LIST 2: 0:0}" +\
+             "{MARKER LIST 3: 0:0}" +\
+             "{MARKER LIST 4: 0:0}" +\
+             f"{{WAVEFORM-{numBytes:d}: #"
+    return header.encode()
+
+def WvSumSq(IData, QData, chunk=CHUNK):
+    """Return (sum, max) of I^2 + Q^2, computed block by block"""
+    SUM = 0.0
+    MAX = 0.0
+    for start in range(0, len(IData), chunk):
+        Iblk = IData[start:start + chunk]
+        Qblk = QData[start:start + chunk]
+        SQR = np.multiply(Iblk, Iblk, dtype=np.float64)     # float32 views summed in float64
+        SQR += np.multiply(Qblk, Qblk, dtype=np.float64)
+        SUM += float(np.sum(SQR))
+        MAX = max(MAX, float(np.max(SQR)))
+    return SUM, MAX
+
+def WvLevel(samples, SUM, MAX):
+    """Return (RMS, MAX) level offsets in dB"""
+    RMS = 10 * math.log10(samples / SUM)
+    MAX = 10 * math.log10(1 / MAX)
+    return RMS, MAX
+
+def WvStats(IData, QData, chunk=CHUNK):
+    """Return (RMS, MAX) level offsets in dB, computed block by block"""
+    return WvLevel(len(IData), *WvSumSq(IData, QData, chunk))
+
+def WvReport(comment, clock, samples, RMS, MAX):
+    print(f"  Comment:{comment}")
+    print(f"  ClockRt:{clock}")
+    print(f"  Samples:{samples}")
+    print(f"  RMSValu:{RMS:.6f}")
+    print(f"  MaxValu:{MAX:.6f}")
+
+def WvQuantBlocks(IData, QData, chunk=CHUNK, dtype='<i2'):
+    """Yield (Nx2 int16 block, saturated pair count) per chunk
+    IQData = Round(Real * 32767), clipped to the int16 range.  The block
+    buffer is reused, copy it if it has to outlive the next iteration.
+    dtype '<i2' for *.wv files, '>i2' for SCPI uploads."""
+    scratch = np.empty((chunk, 2), dtype=np.float64)        # Scaled IQ block
+    data    = np.empty((chunk, 2), dtype=dtype)             # Quantized IQ block
+    samples = len(IData)
+    for start in range(0, samples, chunk):
+        stop = min(start + chunk, samples)
+        n = stop - start
+        blk = scratch[:n]
+        np.multiply(IData[start:stop], 32767, out=blk[:, 0], dtype=np.float64)   # float32 input scaled in float64
+        np.multiply(QData[start:stop], 32767, out=blk[:, 1], dtype=np.float64)
+        numSat = int(np.count_nonzero((np.abs(blk) > 32767).any(axis=1)))
+        np.rint(blk, out=blk)                               # Round half even, same as round()
+        np.clip(blk, -32768, 32767, out=blk)
+        np.copyto(data[:n], blk, casting='unsafe')
+        yield data[:n], numSat
+
+def WvQuantize(IData, QData, chunk=CHUNK):
+    """Return (Nx2 little-endian int16 array, saturated pair count)"""
+    IQi16  = np.empty((len(IData), 2), dtype='<i2')
+    numSat = 0
+    start  = 0
+    for data, blkSat in WvQuantBlocks(IData, QData, chunk):
+        IQi16[start:start + len(data)] = data
+        start  += len(data)
+        numSat += blkSat
+    return IQi16, numSat
+
+def WvWriteData(fot, IData, QData, chunk=CHUNK):
+    """Write I/Q as interleaved little-endian int16, return saturated pair count"""
+    numSat = 0
+    for data, blkSat in WvQuantBlocks(IData, QData, chunk):
+        fot.write(data)
+        numSat += blkSat
+    return numSat
+
+def WvFileWrite(WaveWrit, IData, QData, clock, comment="", chunk=CHUNK):
+    """Write I/Q vectors to a *.wv file, clock written as given"""
     date = time.strftime("%Y-%m-%d;%H:%M:%S")
+    samples = len(IData)
+    RMS, MAX = WvStats(IData, QData, chunk)
+    WvReport(comment, clock, samples, RMS, MAX)
 
-    ###############################################################################
-    # File Read
-    ###############################################################################
+    with open(WaveWrit, 'wb') as fot:
+        fot.write(WvHeader(comment, date, clock, RMS, MAX, samples))
+        numSat = WvWriteData(fot, IData, QData, chunk)
+        fot.write("}".encode())
+    if numSat:
+        print(f"  Error IQ > 1: {numSat} samples saturated")
+    return numSat
+
+def MwvHeader(comment, date, clocks, levels, starts, lengths, names, RMS, MAX):
+    """Multi segment *.wv header bytes up to and including the '{WAVEFORM-n: #' tag
+    levels: Nx2 per segment (RMS, MAX) offsets in dB"""
+    samples  = int(starts[-1] + lengths[-1])
+    numBytes = 4 * samples + 1
+    header = "{TYPE: SMU-MWV,0}" +\
+             f"{{COMMENT: {comment}}}" +\
+             f"{{DATE:{date}}}" +\
+             f"{{CLOCK:{max(clocks)}}}" +\
+             f"{{LEVEL OFFS:{RMS:.4f},{MAX:.4f}}}" +\
+             f"{{SAMPLES:{samples:d}}}" +\
+             f"{{MWV_SEGMENT_COUNT:{len(lengths):d}}}" +\
+             f"{{MWV_SEGMENT_LENGTH:{','.join(f'{n:d}' for n in lengths)}}}" +\
+             f"{{MWV_SEGMENT_START:{','.join(f'{n:d}' for n in starts)}}}" +\
+             "{MWV_SEGMENT_CLOCK_MODE:UNCHANGED}" +\
+             f"{{MWV_SEGMENT_CLOCK:{','.join(str(clk) for clk in clocks)}}}" +\
+             "{MWV_SEGMENT_LEVEL_MODE:UNCHANGED}" +\
+             f"{{MWV_SEGMENT_LEVEL_OFFS:{','.join(f'{lvl:.4f}' for lvl in np.ravel(levels))}}}" +\
+             "{MWV_SEGMENT_FILES:" + ",".join('"' + name + '"' for name in names) + "}" +\
+             "{MARKER LIST 1: 0:1;20:0}" +\
+             f"{{WAVEFORM-{numBytes:d}: #"
+    return header.encode()
+
+def WvMultiWrite(WaveWrit, waves, names=None, comment="", chunk=CHUNK):
+    """Pack IQGen/Common results into one multi segment *.wv
+    waves: objects with IData, QData, Fs.  Each segment is streamed to disk
+    in turn, nothing is concatenated.  Return saturated pair count."""
+    date    = time.strftime("%Y-%m-%d;%H:%M:%S")
+    IQ      = [(np.asarray(wave.IData), np.asarray(wave.QData)) for wave in waves]  # Views, blocks scaled in float64
+    names   = names or [f"Seg{idx}.wv" for idx in range(len(waves))]
+    lengths = np.array([len(IData) for IData, _ in IQ], dtype=np.int64)
+    starts  = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    clocks  = [wave.Fs for wave in waves]
+    SQR     = np.array([WvSumSq(IData, QData, chunk) for IData, QData in IQ])      # (SUM, MAX) per segment
+    levels  = np.column_stack((10 * np.log10(lengths / SQR[:, 0]), 10 * np.log10(1 / SQR[:, 1])))
+    RMS, MAX = WvLevel(int(lengths.sum()), float(SQR[:, 0].sum()), float(SQR[:, 1].max()))
+    for name, clock, start, level in zip(names, clocks, starts, levels):
+        print(f"  Segment:{name} @{start:d} Clock:{clock} RMS:{level[0]:.4f} Max:{level[1]:.4f}")
+    WvReport(comment, max(clocks), int(lengths.sum()), RMS, MAX)
+
+    numSat = 0
+    with open(WaveWrit, 'wb') as fot:
+        fot.write(MwvHeader(comment, date, clocks, levels, starts, lengths, names, RMS, MAX))
+        for IData, QData in IQ:
+            numSat += WvWriteData(fot, IData, QData, chunk)
+        fot.write("}".encode())
+    if numSat:
+        print(f"  Error IQ > 1: {numSat} samples saturated")
+    return numSat
+
+def EnvHeader(fin):
+    """Parse *.env comment header, return (clock, comment)
+    Last '#' line is the comment, first non '#' line is the clock"""
     prevread = " "
     while 1:                                            # Comment Header Parse
         currread  = fin.readline().strip()
@@ -30,67 +180,64 @@ def CreateWv(fileIn):
             comment = prevread[1:]                      # Previous line has Comment
             break
         prevread = currread
+    return clock, comment
 
-    IQArry = np.array([])
-    IQArry = [line.strip().split(',') for line in fin]
-    IQArry = np.asfarray(IQArry, float)
-    samples = len(IQArry)
-    fin.close()                                         # Close Input File
-
-    ###############################################################################
-    # Calculate RMS
-    ###############################################################################
-    SUM = 0
-    MAX = 0
-    for IQ in IQArry:
-        SQR = pow(IQ[0], 2) + pow(IQ[1], 2)
-        SUM += SQR
-        if SQR > MAX:
-            MAX = SQR
-
-    RMS = 10 * math.log10(samples / SUM)
-    MAX = 10 * math.log10(1 / MAX)
+def EnvRead(fin, chunk=ENVCHUNK):
+    """Yield Nx2 float blocks of I,Q rows, reading ~chunk bytes of text at a time"""
+    while 1:
+        text = fin.read(chunk)
+        if not text:
+            break
+        text += fin.readline()                          # Finish partial line
+        with warnings.catch_warnings():                 # numpy<2 warns on bad data
+            warnings.simplefilter('error', DeprecationWarning)
+            try:
+                IQArry = np.fromstring(text.replace(',', ' '), sep=' ')
+            except DeprecationWarning as err:
+                raise ValueError(str(err)) from err
+        if IQArry.size % 2:
+            raise ValueError("EnvRead: odd number of values, expected I,Q rows")
+        yield IQArry.reshape(-1, 2)
 
-    print(f"  Comment:{comment}")
-    print(f"  ClockRt:{clock}")
-    print(f"  Samples:{samples}")
-    print(f"  RMSValu:{RMS:.6f}")
-    print(f"  MaxValu:{MAX:.6f}")
+def CreateWv(fileIn, chunk=ENVCHUNK, progress=None):
+    """Convert *.env to *.wv in bounded memory
+    Text is parsed block by block, quantized data is spooled to a temp file
+    until RMS/peak for the header are known.
+    progress(samples) is called after every block, it may raise to abort."""
+    WaveWrit = os.path.splitext(fileIn)[0] + ".wv"
+    print("CreateWv.py:" + WaveWrit)
+    date = time.strftime("%Y-%m-%d;%H:%M:%S")
 
     ###############################################################################
-    # File Header Write
+    # File Read
     ###############################################################################
-    fot.write("{TYPE: SMU-WV,0}".encode())                  # Type: No change needed.
-    fot.write(f"{{COMMENT: {comment}}}".encode())           # Comment
-    fot.write(f"{{DATE:{date}}}".encode())                  # Date:2005-11-25;12:33:51
-    fot.write(f"{{CLOCK:{clock}}}".encode())                # Wavefm Clock
-    fot.write(f"{{CLOCK MARKER: {clock}}}".encode())        # Marker Clock
-    fot.write(f"{{LEVEL OFFS:{RMS:.4f},{MAX:.4f}}}".encode())# RMS,Peak
-    fot.write(f"{{SAMPLES:{samples:d}}}".encode())          # NumSamples
-    fot.write("{MARKER LIST 1: 0:1;20:0}".encode())         # MkrList MkrOnly
-    fot.write("{MARKER LIST 2: 0:0}".encode())              # MkrList MkrOnly
-    fot.write("{MARKER LIST 3: 0:0}".encode())              # MkrList MkrOnly
-    fot.write("{MARKER LIST 4: 0:0}".encode())              # MkrList MkrOnly
-    numBytes = 4 * samples + 1
-    fot.write((f"{{WAVEFORM-{numBytes:d}: #").encode())     # Waveform = NumSamples * 4 + 1
-
-    # ##############################################################################
-    # File Data Write
-    # IQData is a 2byte little edian integer
-    # IQData = Round(Real * 32768)
-    # ##############################################################################
-    # i = 0
-    for IQ in IQArry:
-        if (IQ[0] > 1) or (IQ[1] > 1):
-            print(f"Error IQ > 1: {IQ[0]}, {IQ[1]}")
-        data = int(round(IQ[0] * 32767))
-        data = struct.pack('<h', data)                      # i:4byte h:2byte H:unsigned2byte
-        fot.write(data)
-        data = int(round(IQ[1] * 32767))
-        data = struct.pack('<h', data)                      # i:4byte h:2byte H:unsigned2byet
-        fot.write(data)
-    fot.write("}".encode())
-    fot.close()                                             # Close Output File
+    SUM = 0.0
+    MAX = 0.0
+    samples = 0
+    numSat = 0
+    with open(fileIn, 'r') as fin, tempfile.TemporaryFile() as spool:
+        clock, comment = EnvHeader(fin)
+        for IQArry in EnvRead(fin, chunk):
+            blkSum, blkMax = WvSumSq(IQArry[:, 0], IQArry[:, 1])
+            SUM += blkSum
+            MAX = max(MAX, blkMax)
+            samples += len(IQArry)
+            numSat += WvWriteData(spool, IQArry[:, 0], IQArry[:, 1])
+            if progress:
+                progress(samples)
+        RMS, MAX = WvLevel(samples, SUM, MAX)
+        WvReport(comment, clock, samples, RMS, MAX)
+
+        ###############################################################################
+        # File Write
+        ###############################################################################
+        spool.seek(0)
+        with open(WaveWrit, 'wb') as fot:
+            fot.write(WvHeader(comment, date, clock, RMS, MAX, samples))
+            shutil.copyfileobj(spool, fot, 1 << 20)
+            fot.write("}".encode())
+    if numSat:
+        print(f"  Error IQ > 1: {numSat} samples saturated")
 
 if __name__ == "__main__":
     filename    = "IQGen_1Tone_100MHz.env"
@@ -2,6 +2,8 @@
 import sys
 import numpy             as np
 from IQGen_Common        import Common                      # pylint: disable=E0401
+from IQGen_Plan          import CoherentPlan                # pylint: disable=E0401
+from IQGen_NCO           import Tone                        # pylint: disable=E0401
 
 class IQGen(Common):
     def __init__(self):
@@ -12,6 +14,7 @@ class IQGen(Common):
         self.FC2        = 3e6                               # Tone2,Hz
         self.NumPeriods = 10                                # Number of Periods
         self.fBeta      = 0.2                               # Filter Beta
+        self.Coherent   = 0                                 # 1:Shortest whole cycle loop, NumPeriods ignored
         self.IQpoints   = 0                                 # Display points
         self.Fs         = 0                                 # Sampling Rate
         self.IData      = []
@@ -26,6 +29,23 @@ class IQGen(Common):
                  'fBeta       : %5.2f\n' % self.fBeta
         return OutStr
 
+    def ToneSamples(self, freqs):
+        """Set Fs, return the sample count: NumPeriods of FC1 at OverSamp * FC1,
+        or if Coherent the shortest loop where all freqs complete whole cycles
+        (NumPeriods again if that loop is longer than MAXSAMPLES)"""
+        plan = None
+        if self.Coherent:
+            try:
+                plan = CoherentPlan(freqs, self.OverSamp * abs(self.FC1))
+            except ValueError as err:
+                print(f"GenCW: {err}, using NumPeriods")
+        if plan is None:
+            self.Fs = self.OverSamp * (self.FC1)            # Sampling Frequency
+            return int(self.OverSamp * self.NumPeriods)
+        self.Fs = plan['Fs']
+        print(f"GenCW: Coherent {plan['samples']} Samples @ {self.Fs / 1e6:.3f}MHz cycles {plan['cycles']}")
+        return plan['samples']
+
     def Gen1Tone_IQ(self):
         # ## I:Cos Q:Sin  -Frq:Nul +Frq:Pos 1.000 Normal Case
         # ## I:Sin Q:Cos  -Frq:Neg +Frq:Nul 1.500
@@ -34,62 +54,35 @@ class IQGen(Common):
         # ## I:Zer Q:Sin  -Frq:Neg +Frq:Pos 0.500
         # ## I:Zer Q:Cos  -Frq:Neg +Frq:Pos 0.015
 
-        self.Fs = self.OverSamp * (self.FC1)                  # Sampling Frequency
-        StopTime = self.NumPeriods / self.FC1                 # Waveforms
-        # t = np.arange(0, StopTime, 1/self.Fs)                # create time array
-        t = np.linspace(0, StopTime, num=self.OverSamp * self.NumPeriods, endpoint=False)     # Create time array
-        #  self.IData = 0.7071 * np.cos(2*np.pi*self.FC1*t)
-        #  self.QData = 0.7071 * np.sin(2*np.pi*self.FC1*t)
-        self.IData = np.cos(2 * np.pi * self.FC1 * t)
-        self.QData = np.sin(2 * np.pi * self.FC1 * t)
+        samples = self.ToneSamples([self.FC1])
+        IQ = Tone(self.FC1, self.Fs, samples)               # NCO, exact phase
+        self.IData = IQ.real
+        self.QData = IQ.imag
 
-        # ## Clipping
-        maxA = self.maxAmpl
-        for i, currVal in enumerate(self.IData):
-            if currVal > self.maxAmpl:
-                self.IData[i] = maxA
-            if currVal < -self.maxAmpl:
-                self.IData[i] = -maxA
-        for i, currVal in enumerate(self.QData):
-            if currVal > self.maxAmpl:
-                self.QData[i] = maxA
-            if currVal < -self.maxAmpl:
-                self.QData[i] = -maxA
+        self.PostProcess()                                  # Clipping
 
         print(f"GenCW: {self.FC1/1e6:.3f}MHz tone RBW:{self.FC1 / self.NumPeriods / 1e3:.3f}kHz")
         print(f"GenCW: {self.Fs/self.FC1:.2f} Oversample")
 
     def Gen1Tone_Analog(self):
 
-        self.Fs = self.OverSamp * (self.FC1)                  # Sampling Frequency
-        StopTime = self.NumPeriods / self.FC1                 # Waveforms
-        t = np.linspace(0, StopTime, num=self.OverSamp * self.NumPeriods, endpoint=False)     # Create time array
-        self.IData = np.cos(2 * np.pi * self.FC1 * t)
-        self.QData = np.arange(0, StopTime)
+        samples = self.ToneSamples([self.FC1])
+        self.IData = Tone(self.FC1, self.Fs, samples).real
+        self.QData = np.zeros_like(self.IData)
 
-        # ## Clipping
-        maxA = self.maxAmpl
-        for i, currVal in enumerate(self.IData):
-            if currVal > self.maxAmpl:
-                self.IData[i] = maxA
-            if currVal < -self.maxAmpl:
-                self.IData[i] = -maxA
+        self.PostProcess()                                  # Clipping
 
         print(f"GenCW: {self.FC1/1e6:.3f}MHz tone RBW:{self.FC1/self.NumPeriods/1e3:.3f}kHz")
         print(f"GenCW: {self.Fs/self.FC1:.2f} Oversample")
 
     def Gen2Tone(self):
-        self.Fs = self.OverSamp * (self.FC1)                # Sampling Frequency
-        StopTime = self.NumPeriods / self.FC1               # Waveforms
-        dt = 1 / self.Fs                                    # seconds per sample
-        t = np.arange(0, StopTime, dt)                      # create time array
-        t = np.linspace(0, StopTime, num=self.OverSamp * self.NumPeriods, endpoint=False)     # Create time array
-        I1_Ch = 0.7071 * np.cos(2 * np.pi * self.FC1 * t)
-        Q1_Ch = 0.7071 * np.sin(2 * np.pi * self.FC1 * t)
-        I2_Ch = 0.7071 * np.cos(2 * np.pi * self.FC2 * t)
-        Q2_Ch = 0.7071 * np.sin(2 * np.pi * self.FC2 * t)
-        self.IData = I1_Ch + I2_Ch
-        self.QData = Q1_Ch + Q2_Ch
+        samples = self.ToneSamples([self.FC1, self.FC2])
+        IQ = Tone(self.FC1, self.Fs, samples)
+        IQ += Tone(self.FC2, self.Fs, samples)
+        IQ *= 0.7071
+        self.IData = IQ.real
+        self.QData = IQ.imag
+        self.PostProcess('peak')                            # Two tones peak at 1.414
 
         print(f"GenCW: {self.FC1 / 1e6:.3f}MHz {self.FC2 / 1e6:.3f}MHz tones generated")
         print(f"GenCW: {self.Fs / self.FC1:.2f} {self.Fs / self.FC2:.2f} Oversample")
@@ -111,8 +104,7 @@ if __name__ == "__main__":
     # Wvform.VSG_SCPI_Write()
     # Wvform.plot_IQ_FFT()
 
-    for i in range(1, 5, 1):
-        Wvform.FC1        = i * 100e6                       # Tone1,Hz
-        Wvform.filename = f'IQGen_1Tone_{Wvform.FC1/1e6:.0f}MHz.env'
-        Wvform.WvWrite("IQGen_2Tone")
-        Wvform.createWv()
+    from IQGen_Sweep import Sweep                           # pylint: disable=C0415,E0401
+    Sweep('IQGen_2Tone', 'Gen1Tone_IQ', {'FC1': [100e6, 200e6, 300e6, 400e6],
+                                         'OverSamp': [30],
+                                         'NumPeriods': [12]})
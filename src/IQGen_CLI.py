@@ -0,0 +1,88 @@
+# ### Purpose : Headless command line waveform generation
+# ###
+# ### python IQGen_CLI.py IQGen_2Tone Gen2Tone FC1=1e6 FC2=3e6 -o TwoTone.wv
+# ### python IQGen_CLI.py IQGen_Mod Gen_FMChirp RampTime=50e-6 -o Chirp.wv --iqtar
+# ### python IQGen_CLI.py IQGen_Mod --list
+# ###     KEY=VALUE sets an IQGen attribute, or a generator argument if the
+# ###     generator takes one of that name.  matplotlib is only imported when
+# ###     --png is given.
+import os
+import sys
+import ast
+import time
+import inspect
+import argparse
+import importlib
+from IQGen_Common import Common                             # pylint: disable=E0401
+
+MODULES = ['IQGen_2Tone', 'IQGen_Mod', 'IQGen_Multitone', 'IQGen_OFDM']
+
+def ParseValue(text):
+    """'1e6' -> 1000000.0, '[1,2]' -> [1, 2], anything else stays a string"""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+def Generators(wave):
+    """Generator method names of an IQGen object"""
+    return [name for name, _ in inspect.getmembers(type(wave), inspect.isfunction)
+            if name.startswith('Gen') and not hasattr(Common, name)]
+
+def Run(module, genFunc, settings, out, iqtar=0, png='', env=0):
+    """Generate module.IQGen().<genFunc>(), write out (*.wv), return the IQGen object"""
+    wave = importlib.import_module(module).IQGen()
+    if genFunc not in Generators(wave):
+        raise SystemExit(f"IQGen_CLI: {module} has no generator '{genFunc}', try: {' '.join(Generators(wave))}")
+    args = inspect.signature(getattr(wave, genFunc)).parameters
+    kwargs = {}
+    for key, val in settings.items():
+        if key in args:
+            kwargs[key] = val
+        elif hasattr(wave, key):
+            setattr(wave, key, val)
+        else:
+            raise SystemExit(f"IQGen_CLI: {module}.IQGen has no attribute '{key}'")
+
+    wave.Generate(genFunc, **kwargs)
+    wave.filename = os.path.splitext(out)[0] + ".env"
+    wave.createWv(env)
+    if iqtar:
+        wave.iqtarWrite(os.path.splitext(out)[0] + ".iq.tar")
+    if png:
+        wave.PlotFile = png
+        wave.plot_IQ_FFT()
+    return wave
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate an IQGen waveform and write *.wv')
+    parser.add_argument('module', choices=MODULES)
+    parser.add_argument('genFunc', nargs='?', default='')
+    parser.add_argument('settings', nargs='*', metavar='KEY=VALUE')
+    parser.add_argument('-o', '--out', default='', help='*.wv file, default <genFunc>.wv')
+    parser.add_argument('--iqtar', action='store_true', help='also write *.iq.tar')
+    parser.add_argument('--png', default='', help='also save a time/frequency plot')
+    parser.add_argument('--env', action='store_true', help='write via *.env text like WvWrite')
+    parser.add_argument('--list', action='store_true', help='list generators and attributes')
+    args = parser.parse_args(argv)
+
+    tick = time.perf_counter()
+    if args.list or not args.genFunc:
+        wave = importlib.import_module(args.module).IQGen()
+        print("Generators: " + " ".join(Generators(wave)))
+        print(wave)
+        return 0
+    settings = {}
+    for item in args.settings:
+        key, sep, val = item.partition('=')
+        if not sep:
+            parser.error(f"expected KEY=VALUE, got '{item}'")
+        settings[key] = ParseValue(val)
+    wave = Run(args.module, args.genFunc, settings, args.out or args.genFunc + ".wv", args.iqtar, args.png, args.env)
+    for event in wave.Events:
+        print(f"IQGen_CLI: {event['stage']:<12s}{event['sec']:8.4f}sec {event['name']}")
+    print(f"IQGen_CLI: {time.perf_counter() - tick:.3f}sec total")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# ### Purpose : Parameter keyed on-disk waveform cache with LRU eviction
+# ###
+# ### Cache = WvCache('IQGen_Cache', maxBytes=1 << 30)
+# ### Cache = WvCache(UserCacheDir())         Per user, not the working directory
+# ### Cache.Generate(wave, 'Gen2Tone')         IQ/Fs from cache or generator
+# ### Cache.WvPath(wave, 'Gen2Tone')           Finished *.wv from cache or generator
+# ###
+# ### Key = sha256 of module, class, generator name, scalar IQGen attributes and
+# ### the source of the generator module and every local module it imports.  Entries are evicted
+# ### least recently used first once the cache grows past maxBytes.
+# ### One cache directory per process, the index is not locked.
+import os
+import ast
+import json
+import time
+import hashlib
+import functools
+import importlib.util
+import numpy as np
+
+NOKEY = {'Fs', 'IQlen', 'IQ', 'IData', 'QData', 'IQi16', 'comment', 'filename', 'IQpoints', 'PlotFile', 'PlotWidth',
+         'FFTSize', 'FFTOverlap', 'FFTWindow', 'FFTBeta', 'Events', 'TraceMem'}   # Outputs and display only settings
+
+def SourceFiles(module):
+    """Source files of module and every module it imports from the same directory
+    Found from the import statements (lazy ones included), so the result does
+    not depend on what the running process happened to import."""
+    spec = importlib.util.find_spec(module)
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return []
+    path  = os.path.dirname(spec.origin)
+    files = []
+    todo  = [spec.origin]
+    while todo:
+        fileIn = todo.pop()
+        if fileIn in files:
+            continue
+        files.append(fileIn)
+        with open(fileIn, 'rb') as fin:
+            tree = ast.parse(fin.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                local = os.path.join(path, name.split('.')[0] + '.py')
+                if os.path.exists(local):
+                    todo.append(local)
+    return sorted(files)
+
+@functools.lru_cache(maxsize=None)
+def CodeVersion(module):
+    """Hash of the generator module source and all local modules it imports
+    (IQGen_Common, IQGen_NCO, IQGen_Plan, IQGen_Resample, CreateWv3, ..)"""
+    digest = hashlib.sha256()
+    for fileIn in SourceFiles(module):
+        digest.update(os.path.basename(fileIn).encode())
+        with open(fileIn, 'rb') as fin:
+            digest.update(fin.read())
+    return digest.hexdigest()
+
+def UserCacheDir(name='IQGen'):
+    """Per user cache directory: $XDG_CACHE_HOME, %LOCALAPPDATA% or ~/.cache, plus name"""
+    root = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, name)
+
+def CacheParams(wave):
+    """Scalar generator parameters of wave, lists/tuples of scalars included"""
+    params = {}
+    for key, val in sorted(vars(wave).items()):
+        if key in NOKEY or key.startswith('_'):
+            continue
+        if isinstance(val, (bool, int, float, str)) or val is None:
+            params[key] = val
+        elif isinstance(val, complex):
+            params[key] = repr(val)
+        elif isinstance(val, (list, tuple, np.ndarray)) and np.ndim(val) == 1 and len(val) < 4096:
+            params[key] = [float(x) if isinstance(x, (int, float, np.number)) else str(x) for x in val]
+    return params
+
+class WvCache:
+    def __init__(self, path='IQGen_Cache', maxBytes=1 << 30):
+        self.path     = path
+        self.maxBytes = maxBytes
+        self.hits     = 0
+        self.misses   = 0
+        os.makedirs(path, exist_ok=True)
+        self.indexFile = os.path.join(path, 'index.json')
+        try:
+            with open(self.indexFile, 'r') as fin:
+                self.index = json.load(fin)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def __str__(self):
+        stats = self.Stats()
+        return 'Entries     : %d\n' % stats['entries'] +\
+               'Size        : %.1f MB\n' % (stats['bytes'] / 1e6) +\
+               'Hit/Miss    : %d/%d\n' % (stats['hits'], stats['misses'])
+
+    def Key(self, wave, genFunc):
+        module = type(wave).__module__
+        ident = {'module': module,
+                 'class': type(wave).__name__,
+                 'genFunc': genFunc,
+                 'params': CacheParams(wave),
+                 'version': CodeVersion(module)}
+        return hashlib.sha256(json.dumps(ident, sort_keys=True).encode()).hexdigest()[:32]
+
+    def fileOf(self, key, ext):
+        return os.path.join(self.path, key + ext)
+
+    def Generate(self, wave, genFunc):
+        """Fill wave.IQ/IQi16/Fs/comment from cache, run wave.<genFunc>() on a miss"""
+        key = self.Key(wave, genFunc)
+        entry = self.index.get(key)
+        if entry and os.path.exists(self.fileOf(key, '.npz')):
+            self.hits += 1
+            with np.load(self.fileOf(key, '.npz')) as data:
+                wave.IQ    = data['IQ']
+                wave.IQi16 = data['IQi16'] if 'IQi16' in data.files else None    # PostQuant output
+            wave.Fs      = entry['Fs']
+            wave.comment = entry['comment']
+            self.touch(key)
+            return key
+        self.misses += 1
+        wave.Generate(genFunc)
+        arrays = {'IQ': wave.IQ}
+        if wave.IQi16 is not None:
+            arrays['IQi16'] = wave.IQi16
+        np.savez(self.fileOf(key, '.npz'), **arrays)
+        self.index[key] = {'genFunc': genFunc, 'Fs': wave.Fs, 'comment': wave.comment}
+        self.touch(key)
+        return key
+
+    def WvPath(self, wave, genFunc):
+        """Path of the cached *.wv for these parameters, generated and written on a miss"""
+        key = self.Generate(wave, genFunc)
+        WaveWrit = self.fileOf(key, '.wv')
+        if not os.path.exists(WaveWrit):
+            filename = wave.filename
+            wave.filename = self.fileOf(key, '.env')
+            try:
+                wave.createWv()
+            finally:
+                wave.filename = filename
+            self.touch(key)
+        return WaveWrit
+
+    def touch(self, key):
+        """Mark key most recently used, update its size, evict and save the index"""
+        entry = self.index[key]
+        entry['atime'] = time.time()
+        entry['bytes'] = sum(os.path.getsize(self.fileOf(key, ext)) for ext in ('.npz', '.wv')
+                             if os.path.exists(self.fileOf(key, ext)))
+        self.Evict(keep=key)
+        with open(self.indexFile, 'w') as fot:
+            json.dump(self.index, fot)
+
+    def Evict(self, keep=None):
+        """Drop least recently used entries until the cache fits maxBytes"""
+        total = sum(entry['bytes'] for entry in self.index.values())
+        for key in sorted(self.index, key=lambda k: self.index[k]['atime']):
+            if total <= self.maxBytes:
+                break
+            if key == keep:
+                continue
+            total -= self.index[key]['bytes']
+            for ext in ('.npz', '.wv'):
+                if os.path.exists(self.fileOf(key, ext)):
+                    os.remove(self.fileOf(key, ext))
+            del self.index[key]
+
+    def Stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.index),
+                'bytes': sum(entry['bytes'] for entry in self.index.values())}
+
+if __name__ == "__main__":
+    from IQGen_2Tone import IQGen                                       # pylint: disable=C0415,E0401
+    Cache = WvCache()
+    for _ in range(3):
+        tick = time.perf_counter()
+        print(Cache.WvPath(IQGen(), 'Gen2Tone'), f"{time.perf_counter() - tick:.4f}sec")
+    print(Cache)
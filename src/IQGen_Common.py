@@ -1,8 +1,25 @@
 # ### Purpose : Rohde & Schwarz waveform generation common functions
+import os
 import sys
-import matplotlib.pyplot as plt
+import json
+import time
+import contextlib
+import tracemalloc
 import numpy as np
-from CreateWv3 import CreateWv
+from CreateWv3 import CreateWv, WvFileWrite, WvQuantize, WvSumSq
+from ReadWv import WvFile
+from IQTar import IQTarWrite, IQTarRead
+from IQGen_Spectrum import Welch
+from IQGen_Plot import NewFigure, DrawIQ, DrawLine, SaveFigure
+from IQGen_SCPI import SCPISock, SCPIPORT
+from IQGen_Resample import Resample, TRANS
+
+def EventLog(fot):
+    """OnEvent callback writing one JSON line per stage event to fot"""
+    def write(event):
+        fot.write(json.dumps(event) + "\n")
+        fot.flush()
+    return write
 
 class Common:
     def __init__(self):
@@ -14,10 +31,33 @@ class Common:
         self.fBeta      = 0.2           # Filter Beta
         self.IQpoints   = 0             # Display points
         self.Fs         = 0             # Sampling Rate
+        self.IQType     = 'complex128'  # Sample store dtype, 'complex64' halves memory (float32 I/Q)
+        self.IQ         = np.zeros(0, dtype=self.IQType)    # I + jQ, IData/QData are views of it
+        self._IQpending = None          # (half, IQ) set at a new length, other half not yet
         self.IData      = []
         self.QData      = []
         self.IQlen      = 1
         self.filename   = 'CreateWv.env'
+        self.comment    = ''            # *.wv comment
+        self.PostClip   = 1             # Clip I & Q to +/-maxAmpl
+        self.PostNorm   = ''            # '':Generator default 'none' 'peak' 'rms'
+        self.PostLevel  = 1.0           # Peak or RMS magnitude after normalize
+        self.FsOut      = 0             # Resample to this clock before PostProcess, 0:off
+        self.fTrans     = TRANS         # Resample filter transition, fraction of the lower Nyquist band
+        self.PostQuant  = 0             # Quantize to int16 grid, fills IQi16
+        self.IQi16      = None          # Nx2 little-endian int16 IQ
+        self.FFTSize    = 4096          # Welch segment length
+        self.FFTOverlap = 0.5           # Welch segment overlap, 0..1
+        self.FFTWindow  = 'hann'        # 'hann' 'hamming' 'blackman' 'kaiser'(FFTBeta) 'rect'
+        self.FFTBeta    = 8.6           # Kaiser window beta, ~blackman sidelobes
+        self.PlotFile   = ''            # Save plots to this PNG instead of showing them
+        self.PlotWidth  = 1000          # Min/max envelope bins per trace, 0:all points
+        self.VSGHost    = '192.168.1.114'   # Signal generator for VSG_SCPI_Write
+        self.VSGPort    = SCPIPORT      # Raw socket SCPI port
+        self.Events     = []            # Stage events: generate postprocess write convert upload
+        self.OnEvent    = None          # Callback(event) per finished stage, e.g. EventLog(fot)
+        self.TraceMem   = 0             # Record peakMB per stage with tracemalloc (slow)
+        self._memStack  = []            # Peak so far of each open traced stage
 
     def __str__(self):
         OutStr    = 'maxAmpl      : %5.2f\n' % self.maxAmpl +\
@@ -28,8 +68,86 @@ class Common:
                     'fBeta        : %5.2f\n' % self.fBeta
         return OutStr
 
+    @property
+    def IData(self):
+        return self.IQ.real
+
+    @IData.setter
+    def IData(self, value):
+        self.setIQ(value, 'real')
+
+    @property
+    def QData(self):
+        return self.IQ.imag
+
+    @QData.setter
+    def QData(self, value):
+        self.setIQ(value, 'imag')
+
+    def setIQ(self, value, part):
+        """Copy value into the I or Q half of IQ
+        A new length reallocates IQ with the other half zeroed until it is set
+        too; setting that half to yet another length raises ValueError."""
+        value = np.asarray(value)
+        pending = self._IQpending
+        if pending is not None and pending[1] is not self.IQ:
+            pending = None                                  # IQ replaced as a whole since
+        if len(value) != len(self.IQ):
+            if pending is not None and pending[0] != part:
+                raise ValueError(f"setIQ: {len(value)} samples, the other half was just set to {len(self.IQ)}")
+            self.IQ = np.zeros(len(value), dtype=self.IQType)
+            pending = (part, self.IQ)
+        else:
+            if self.IQ.dtype != self.IQType:
+                self.IQ = self.IQ.astype(self.IQType)       # Keeps the other half
+                pending = pending and (pending[0], self.IQ)
+            if pending is not None and pending[0] != part:
+                pending = None                              # Both halves set
+        self._IQpending = pending
+        target = getattr(self.IQ, part)
+        if value.ctypes.data != target.ctypes.data or value.strides != target.strides:
+            target[...] = value                             # IData *= x hands back the view itself
+
+    @contextlib.contextmanager
+    def Stage(self, stage, name=''):
+        """Time the with-block as one event, fill event['bytes'] etc. inside it
+        event: stage name start sec samples bytes peakMB"""
+        event = {'stage': stage, 'name': name, 'start': time.time(), 'sec': 0.0,
+                 'samples': None, 'bytes': None, 'peakMB': None}
+        if self.TraceMem:
+            owner = not tracemalloc.is_tracing()
+            if owner:
+                tracemalloc.start()
+            elif self._memStack:                            # Keep outer stage peak before reset
+                self._memStack[-1] = max(self._memStack[-1], tracemalloc.get_traced_memory()[1])
+            if hasattr(tracemalloc, 'reset_peak'):          # Python 3.9+, else peak since tracing started
+                tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            self._memStack.append(base)
+        tick = time.perf_counter()
+        try:
+            yield event
+        finally:
+            event['sec'] = time.perf_counter() - tick
+            if event['samples'] is None:
+                event['samples'] = len(self.IQ)
+            if self.TraceMem:
+                peak = max(self._memStack.pop(), tracemalloc.get_traced_memory()[1])
+                event['peakMB'] = (peak - base) / 1e6
+                if self._memStack:
+                    self._memStack[-1] = max(self._memStack[-1], peak)
+                if owner:
+                    tracemalloc.stop()
+            self.Events.append(event)
+            if self.OnEvent:
+                self.OnEvent(event)
+
+    def Generate(self, genFunc, **kwargs):
+        """Run generator method genFunc(**kwargs) as a 'generate' stage"""
+        with self.Stage('generate', genFunc):
+            getattr(self, genFunc)(**kwargs)
+
     def WvWrite(self, comment=""):
-        comment = sys._getframe().f_back.f_code.co_name + ":" + comment     # pylint: disable=W0212
         print("WvWrt: %dSamples @ %.0fMHz FFTres:%.3fkHz" % (len(self.IData), self.Fs / 1e6, self.Fs / (len(self.IData) * 1e3)))
         fot = open(self.filename, 'w')
         fot.write("####################################################\n")
@@ -47,48 +165,80 @@ class Common:
         fot.close()
         # print("CWGen: %d Samples @ %.0fMHz FFT res:%f kHz"%(len(self.IData),self.Fs / 1e6, self.Fs / (self.IQlen*1e3)))
 
-    def plot_IQ_FFT(self, Plot3=[9999, 9999]):                              # pylint: disable=W0102
-        # #####################################
-        # ### Calculate FFT
-        # #####################################
-        # IQ = np.vectorize(complex)(self.IData,self.QData)
-        IQ = np.asarray(self.IData) + 1j * np.asarray(self.QData)
-        self.IQlen = len(self.IData)
+    def Resample(self, FsOut=None):
+        """Polyphase resample IQ from Fs to FsOut (default self.FsOut)
+        fTrans (0..1) is the filter transition as a fraction of the lower Nyquist band."""
+        FsOut = FsOut or self.FsOut
+        with self.Stage('resample', f"{self.Fs / 1e6:.3f}->{FsOut / 1e6:.3f}MHz") as event:
+            IQ, self.Fs = Resample(self.IQ, self.Fs, FsOut, self.fTrans)
+            self.IQ = IQ.astype(self.IQType, copy=False)
+            event['FsOut'] = FsOut                          # Requested
+            event['Fs']    = self.Fs                        # Actual, up/down approximation of FsOut
+        if self.Fs != FsOut:
+            print(f"Resmp: {FsOut / 1e6:.6f}MHz approximated as {self.Fs / 1e6:.6f}MHz")
+
+    def PostProcess(self, normDefault='none'):
+        """Resample, normalize, clip and quantize IData/QData in place
+        Stages are set per waveform by FsOut, PostNorm, PostClip, PostQuant.
+        normDefault is the generator's choice when PostNorm is ''."""
+        if self.FsOut and self.FsOut != self.Fs:
+            self.Resample()
+        with self.Stage('postprocess', self.PostNorm or normDefault):
+            self.IQi16 = None
+
+            # ## Normalize
+            norm = self.PostNorm or normDefault
+            if norm in ('peak', 'rms'):
+                SUM, MAX = WvSumSq(self.IData, self.QData)
+                level = np.sqrt(MAX) if norm == 'peak' else np.sqrt(SUM / len(self.IData))
+                if level > 0:
+                    gain = self.PostLevel / level
+                    self.IData *= gain
+                    self.QData *= gain
+                    print(f"PostP: {norm} normalize x{gain:.4f}")
+            elif norm != 'none':
+                raise ValueError(f"PostProcess: unknown PostNorm '{norm}'")
 
-        # fltr = np.kaiser(len(IQ), self.fBeta)
-        # IQ = np.multiply(IQ, fltr)
-        mag = np.fft.fft(IQ) / self.IQlen
-        mag = np.fft.fftshift(mag)                          # ag = mag[range(N / 2)]
-        mag = 20 * np.log10(np.abs(mag)) + 30
+            # ## Clipping
+            if self.PostClip:
+                np.clip(self.IData, -self.maxAmpl, self.maxAmpl, out=self.IData)
+                np.clip(self.QData, -self.maxAmpl, self.maxAmpl, out=self.QData)
 
-        # frq = (np.arange(N)*self.Fs) / N
-        frq = np.fft.fftfreq(self.IQlen, d=1 / (self.Fs))
-        frq = np.fft.fftshift(frq)                          # frq = frq[range(N / 2)]
+            # ## Quantize
+            if self.PostQuant:
+                self.IQi16, numSat = WvQuantize(self.IData, self.QData)
+                np.divide(self.IQi16[:, 0], 32767, out=self.IData)  # Snap to int16 grid
+                np.divide(self.IQi16[:, 1], 32767, out=self.QData)
+                if numSat:
+                    print(f"PostP: {numSat} samples saturated")
+
+    def Spectrum(self, nfft=None):
+        """Averaged windowed spectrum of IData + jQData, return (frq, mag dB)"""
+        self.IQlen = len(self.IData)
+        return Welch(self.IData, self.QData, self.Fs, nfft or self.FFTSize,
+                     self.FFTOverlap, self.FFTWindow, self.FFTBeta)
+
+    def plot_IQ_FFT(self, Plot3=[9999, 9999], spectrum=None):              # pylint: disable=W0102
+        # #####################################
+        # ### Calculate FFT, unless (frq, mag) was computed already
+        # #####################################
+        frq, mag = spectrum if spectrum is not None else self.Spectrum()
 
         # #####################################
         # ### Plot Data
         # #####################################
-        plt.clf()
-        plt.subplot(2, 1, 1)                                # Time Domain
-        plt.title("I:Blue Q:Yellow")
-        plt.plot(self.IData, "b", self.IData, "b")
-        plt.plot(self.QData, "y", self.QData, "y")
-        if Plot3[0] != 9999:
-            plt.plot(Plot3, "g", Plot3, "g")
-
-        plt.subplot(2, 1, 2)                                # Frequency Domain
-        if self.IQpoints:
-            plt.plot(frq, np.real(mag), 'bo')
-        plt.plot(frq, mag)
-        plt.xlabel('Freq')
-        plt.ylabel('magnitude')
-        # plt.xlim(-3e6,3e6)
-        plt.grid(True)
+        fig = NewFigure(self.PlotFile)
+        DrawIQ(fig, self.IData, self.QData, frq, mag, self.PlotWidth, self.IQpoints,
+               None if Plot3[0] == 9999 else Plot3)
+        if self.PlotFile:
+            SaveFigure(fig, self.PlotFile)
+            return
+        import matplotlib.pyplot as plt                                     # pylint: disable=C0415
         plt.show(block=False)
         plt.pause(2)
         plt.close()
 
-    def VSG_SCPI_Write(self):
+    def VSG_SCPI_Write(self, host=None, name='IQGen.wv', pool=None):
         # ## :MMEM:DATA:UNPR "NVWFM: /  / var /  / user /  / <wave.wv>",#<numSize><NumBytes><I0Q0...IxQx>
         # ##     wave.wv : Name of *.wv to be created
         # ##     numSize : Number of bytes in <NumBytes> string
@@ -96,46 +246,89 @@ class Common:
         # ##               Each I (or Q) value is two bytes
         # ##               I(2 bytes) + Q(2bytes) = 4 bytes / IQ pair
         # ##               NumBytes = NumIQPair * 4
-        from rssd.VSG.Common    import VSG                                  # pylint: disable=C0415,E0401
-        SMW = VSG().jav_Open('192.168.1.114')                               # Create SMW Object
-
-        # ## ASCII
-        scpi   = ':MMEM:DATA:UNPR "NVWFM://var//user//IQGen.wv",#'          # Ascii Cmd
-        iqsize = str(len(self.IData) * 4)                                   # Calculate bytes of IQ data
-        scpi   = scpi + str(len(iqsize)) + iqsize                           # Calculate length of iqsize string
-        # ## Binary
-        iqdata = np.vstack((self.IData, self.QData)).reshape((-1,), order='F') # Combine I&Q Data
-        bits   = np.array(iqdata * 32767, dtype='>i2')                      # Convert to big-endian 2byte int
-        cmd    = bytes(scpi, 'utf-8') + bits.tostring()                     # Add ASCII + Bin
-        SMW.K2.write_raw(cmd)
-
-        SMW.write(f'SOUR1:BB:ARB:WAV:CLOC "/var/user/IQGen.wv",{self.Fs}')  # Set Fs / Clk Rate
-        SMW.write('BB:ARB:WAV:SEL "/var/user/IQGen.wv"')                    # Select Arb File
-        print(SMW.query('SYST:ERR?'))
+        # ## pool: SCPIPool session to reuse, errors are then left for pool.Check()
+        # ## Return saturated pair count, as WvFileWrite
+        if pool is not None:
+            with self.Stage('upload', name) as event:
+                event['bytes'] = 4 * len(self.IQ)
+                numSat = pool.Upload(host or self.VSGHost, name, self.IData, self.QData, self.Fs)
+                event['saturated'] = numSat
+        else:
+            SMW = SCPISock(host or self.VSGHost, self.VSGPort)              # Create SMW Object
+
+            # ## ASCII + streamed big-endian 2byte int binary block
+            with self.Stage('upload', name) as event:
+                event['bytes'] = 4 * len(self.IQ)
+                numSat = SMW.write_block(f':MMEM:DATA:UNPR "NVWFM://var//user//{name}",', self.IData, self.QData)
+                event['saturated'] = numSat
+
+            SMW.write(f'SOUR1:BB:ARB:WAV:CLOC "/var/user/{name}",{self.Fs}')   # Set Fs / Clk Rate
+            SMW.write(f'BB:ARB:WAV:SEL "/var/user/{name}"')                     # Select Arb File
+            print(SMW.query('SYST:ERR?'))
+            SMW.close()
+        if numSat:
+            print(f"  Error IQ > 1: {numSat} samples saturated")
+        return numSat
 
     def plotLine(self, trace1, trace2=[1]):                                 # pylint: disable=W0102
-        plt.plot(trace1, "b")
-        if len(trace2) > 1:
-            plt.plot(trace2, "y")
-        plt.xlabel('time,sec')
-        plt.ylabel('magnitude')
-        plt.title('plot')
-        plt.grid(True)
-        plt.show()
+        fig = NewFigure(self.PlotFile)
+        DrawLine(fig, [trace1, trace2] if len(trace2) > 1 else [trace1], width=self.PlotWidth)
+        self.plotShow(fig)
 
     def plotXY(self, t):
         """Plot IData vs QData"""
-        plt.plot(t, self.IData, "b", t, self.QData, "y")
-        # plt.plot(t, self.IData, "bo", t, self.QData, "yo")
-        plt.xlabel('time,sec')
-        plt.ylabel('magnitude')
-        plt.title('plot')
-        plt.grid(True)
-        # plt.savefig("test.png")
-        plt.show()
-
-    def createWv(self):
-        CreateWv(self.filename)
+        fig = NewFigure(self.PlotFile)
+        DrawLine(fig, [self.IData, self.QData], t, self.PlotWidth)
+        self.plotShow(fig)
+
+    def plotShow(self, fig):
+        if self.PlotFile:
+            SaveFigure(fig, self.PlotFile)
+        else:
+            import matplotlib.pyplot as plt                                 # pylint: disable=C0415
+            plt.show()
+
+    def createWv(self, env=0):
+        """Write *.wv straight from IData/QData, *.env only if env is set"""
+        WaveWrit = os.path.splitext(self.filename)[0] + ".wv"
+        if env:
+            with self.Stage('write', self.filename) as event:
+                self.WvWrite(self.comment)
+                event['bytes'] = os.path.getsize(self.filename)
+            with self.Stage('convert', WaveWrit) as event:
+                CreateWv(self.filename)
+                event['bytes'] = os.path.getsize(WaveWrit)
+            return
+        print("CreateWv.py:" + WaveWrit)
+        with self.Stage('write', WaveWrit) as event:
+            WvFileWrite(WaveWrit, self.IData, self.QData, f"{self.Fs:f}", self.comment)
+            event['bytes'] = os.path.getsize(WaveWrit)
+
+    def readWv(self, fileIn):
+        """Load IData/QData/Fs back from *.wv or *.iqw"""
+        wave = WvFile(fileIn)
+        self.IQ      = wave.IQ().astype(self.IQType, copy=False)
+        self.Fs      = wave.Fs
+        self.comment = wave.comment
+
+    def iqtarWrite(self, filename):
+        """Save IData/QData/Fs to an R&S iq-tar file"""
+        with self.Stage('write', filename) as event:
+            filename = IQTarWrite(filename, self.IQ, self.Fs, self.comment)
+            event['bytes'] = os.path.getsize(filename)
+        return filename
+
+    def iqtarRead(self, filename, channel=0):
+        """Load IData/QData/Fs from an R&S iq-tar file"""
+        IQ, self.Fs, meta = IQTarRead(filename)
+        if IQ.ndim > 1:
+            IQ = IQ[:, channel]
+        self.IQ = np.zeros(len(IQ), dtype=self.IQType)     # Own writable copy of the memmap
+        if np.iscomplexobj(IQ):
+            self.IQ[:] = IQ
+        else:
+            self.IQ.real = IQ
+        self.comment = meta.get('Comment', '')
 
 if __name__ == "__main__":
     print(sys.version)
@@ -1,4 +1,6 @@
 """Simple GUI to display DSP concepts"""
+import os
+import shutil
 import tkinter                 as Tkinter
 from   tkinter                 import ttk
 # import tkinter.messagebox  as tkMessageBox
@@ -7,13 +9,20 @@ import tkinter.filedialog  as tkFileDialog
 # Code specific libraries
 # import random
 # import math
-import pickle       # to save/load object
-import copy         # copy object
 # from os.path        import split
 from IQGen_2Tone    import IQGen
+from IQGen_Cache    import WvCache, UserCacheDir
+from IQGen_Worker   import Worker
+from IQGen_Session  import SessionLoad
+from CreateWv3      import CreateWv
 
 END = Tkinter.END
 CWVar = IQGen()
+Cache = None                                                # WvCache, opened by the first worker job
+Work = Worker()                                             # Generation, FFT, conversion off the UI thread
+SessionFile = "CWGen_GUI.json"                              # Parameters + history, no samples
+OnDone = {}                                                 # Job name: UI thread callback(result)
+pollMs = 50                                                 # Worker event poll interval
 
 btnWid = 15
 textWindWid = 120
@@ -42,44 +51,94 @@ def btn_Waveforms():
         lstWaveF.insert(END, i)
     lstWaveF.see(END)
 
+def GetCache():
+    """Worker: WvCache in the user cache directory, created on first use"""
+    global Cache                                            # pylint: disable=W0603
+    if Cache is None:
+        Cache = WvCache(UserCacheDir())
+    return Cache
+
+def job_WaveCreate(worker, wave, files):
+    """Worker: convert selected *.env files, or write the current waveform
+    Return the *.wv files written"""
+    written = []
+    for fileIn in files:
+        CreateWv(fileIn, progress=lambda n, f=fileIn: worker.progress(f"CreateWv: {f} {n} samples"))
+        written.append(os.path.splitext(fileIn)[0] + ".wv")
+    if not files:
+        wave.OnEvent = lambda event: worker.progress(f"CWGen: {event['stage']} {event['sec']:.3f}sec")
+        WaveWrit = os.path.splitext(wave.filename)[0] + ".wv"
+        shutil.copyfile(GetCache().WvPath(wave, 'Gen2Tone'), WaveWrit)    # Cached *.wv, written once per setting
+        written.append(WaveWrit)
+    return written
+
 def btn_WaveCreate():
-    exec(open("./CreateWv3.py").read())                 # pylint: disable=W0122
-    fprintf("Waveform File created")
+    files = [f for f in lstWaveF.get(0, END) if f.endswith('.env')]
+    runJob('WaveCreate', job_WaveCreate, lambda done: fprintf(f"Waveform File created {done}"), GUIWave(), files)
 
 def btn_SaveCond():
-    try:
-        del CWVar.GUI_Element
-        del CWVar.GUI_Object
-    except:
-        pass
     CWVar.FC1        = float(Entry1.get())
     CWVar.FC2        = float(Entry2.get())
     CWVar.NumPeriods = float(Entry3.get())
     CWVar.fBeta      = float(Entry4.get())
+    CWVar.OverSamp   = float(Entry5.get())
     dataSave(CWVar)
 
-def btn_Test():
-    pass
+def btn_Cancel():
+    Work.cancel()
+    fprintf("CWGen: Cancel requested")
 
 def btn_Clear():
     # posi = lstOutpt.curselection()
     lstOutpt.delete(0, END)
 
+def GUIWave():
+    """IQGen with the entry values, built on the UI thread"""
+    wave = IQGen()
+    wave.FC1           = float(Entry1.get())
+    wave.FC2           = float(Entry2.get())
+    wave.NumPeriods    = float(Entry3.get())
+    wave.fBeta         = float(Entry4.get())
+    wave.OverSamp      = float(Entry5.get())
+    return wave
+
+def job_PlotFFT(worker, wave):
+    """Worker: generate (or fetch from cache) and compute the spectrum"""
+    wave.OnEvent = lambda event: worker.progress(f"CWGen: {event['stage']} {event['sec']:.3f}sec")
+    GetCache().Generate(wave, 'Gen2Tone')
+    worker.check()
+    return wave, wave.Spectrum()
+
+def plot_Done(result):
+    wave, spectrum = result
+    fprintf(f"CWGen Plotted, cache hit/miss {Cache.hits}/{Cache.misses}")
+    wave.plot_IQ_FFT(spectrum=spectrum)                     # matplotlib stays on the UI thread
+
 def btn_PlotFFT():
     fprintf("CWGen: Run Tests")
     btn_SaveCond()
-    CWVar = IQGen()                                         # pylint: disable=W0621
-    CWVar.FC1           = float(Entry1.get())
-    CWVar.FC2           = float(Entry2.get())
-    CWVar.NumPeriods    = float(Entry3.get())
-    CWVar.fBeta         = float(Entry4.get())
-    CWVar.OverSamp      = float(Entry5.get())
-    # CWVar.GUI_Element   = lstOutpt                        #Send GUI window handle
-    # CWVar.GUI_Object    = GUI                             #Send GUI handle
-    # print(type(lstOutpt))
-    CWVar.Gen2Tone()
-    CWVar.plot_IQ_FFT()
-    fprintf("CWGen Plotted")
+    runJob('PlotFFT', job_PlotFFT, plot_Done, GUIWave())
+
+def runJob(name, func, done, *args):
+    if Work.busy():
+        fprintf(f"CWGen: busy, {name} queued")
+    OnDone[name] = done
+    Work.submit(name, func, *args)
+
+def pollWorker():
+    """Drain worker events on the UI thread, then poll again"""
+    for kind, name, data in Work.poll():
+        if kind == 'progress':
+            fprintf(data)
+        elif kind == 'done':
+            OnDone.pop(name, fprintf)(data)
+        elif kind == 'cancelled':
+            OnDone.pop(name, None)
+            fprintf(f"CWGen: {name} cancelled")
+        else:
+            OnDone.pop(name, None)
+            fprintf(f"CWGen: {name} failed: {data}")
+    GUI.after(pollMs, pollWorker)
 
 def menu_Open():
     asdf = tkFileDialog.askopenfilename()
@@ -87,6 +146,7 @@ def menu_Open():
 
 def menu_Exit():
     global GUI                                              # pylint: disable=W0603
+    Work.cancel()
     btn_SaveCond()
     GUI.quit()
     GUI.destroy()
@@ -114,25 +174,21 @@ def fprintf(inStr):
         pass
 
 def dataSave(data):
-    with open("CWGen_GUI.dat", "wb") as f:
-        # print data
-        pickle.dump(data, f)
+    Session.Record(data, 'Gen2Tone')
+    Session.Save(SessionFile)
     fprintf("DataSave: File Saved")
 
 def dataLoad():
-    try:
-        with open("CWGen_GUI.dat", "rb") as f:
-            data = pickle.load(f)
-        fprintf("DataLoad: OK")
-    except:
-        data = copy.copy(CWVar)
-        fprintf("DataLoad: Default")
+    """IQGen with the saved parameters, samples are regenerated (or cached) on first Plot"""
+    data = Session.Wave()
+    fprintf("DataLoad: OK" if Session.params else "DataLoad: Default")
     return data
 
 # *****************************************************************
 # Define GUI Widgets
 # *****************************************************************
-CWVar = copy.copy(dataLoad())
+Session = SessionLoad(SessionFile)
+CWVar = dataLoad()
 GUI = Tkinter.Tk()                                          # Create GUI object
 GUI.title("CW to FFT View")                                 # GUI Title
 Lbl1    = Tkinter.Label(GUI, text="FC1")                    # Create Label
@@ -154,7 +210,7 @@ Entry5.insert(END, CWVar.OverSamp)                          # Default Value
 btnWaveF = Tkinter.Button(GUI, width=btnWid, text="Select *.WV", command=btn_Waveforms)
 btnWaveC = Tkinter.Button(GUI, width=btnWid, text="Gen *.wv", command=btn_WaveCreate)
 btnSaveC = Tkinter.Button(GUI, width=btnWid, text="Save", command=btn_SaveCond)
-btnClear = Tkinter.Button(GUI, width=btnWid, text="Test", command=btn_Test)
+btnClear = Tkinter.Button(GUI, width=btnWid, text="Cancel", command=btn_Cancel)
 btnRunIt = Tkinter.Button(GUI, width=btnWid, text="Plot", command=btn_PlotFFT)
 btnQuit  = Tkinter.Button(GUI, width=btnWid, text="Quit", command=menu_Exit)
 lstOutpt = Tkinter.Listbox(GUI, width=textWindWid, bg=ColorBG, fg=ColorFG)
@@ -212,4 +268,5 @@ menu.add_cascade(label="Edit", menu=editMenu)            # add dropdown menu
 # *****************************************************************
 # Start Program
 # *****************************************************************
+GUI.after(pollMs, pollWorker)                           # Worker results back on the UI thread
 GUI.mainloop()                                          # Display window
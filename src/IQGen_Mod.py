@@ -1,6 +1,7 @@
 import sys
 import numpy as np
 from IQGen_Common import Common                             # pylint: disable=E0401
+from IQGen_NCO import Tone, Chirp, FM, Ramp, PhaseWords, Expj   # pylint: disable=E0401
 
 # #####################################################################
 # ## Purpose  : Rohde & Schwarz Single tone generation
@@ -28,6 +29,7 @@ class IQGen(Common):
         self.IQlen      = 0                                 # IQ Length
         self.IQpoints   = 0                                 # Display points
         self.FMod       = 10e3                              # Modulation Frequency
+        self.FsChirp    = 2.0e9                             # Chirp synthesis rate, with FsOut for narrow sweeps
 
         self.Fs         = 0                                 # Sampling Rate
         self.IData      = []
@@ -47,26 +49,25 @@ class IQGen(Common):
         self.Fs = self.OverSamp * (self.FC1)                # Sampling Frequency
         StopTime = self.NumPeriods / self.FC1               # Waveforms
         dt = 1 / self.Fs                                    # seconds per sample
-        time = np.arange(0, StopTime, dt)                   # create time array
+        samples = int(np.ceil(StopTime / dt))               # len(np.arange(0, StopTime, dt))
         modIndx = 3
 
         # rmp_arry = self.FuncGenTri(time.size,modIndx)
-        sin_arry = np.sin(2.0 * np.pi * self.FMod * time)
-        # cos_arry = np.cos(2.0 * np.pi * self.FMod * time)
+        sin_arry = Tone(self.FMod, self.Fs, samples).imag
+        # cos_arry = Tone(self.FMod, self.Fs, samples).real
         mod_arry = sin_arry
-        self.IData = np.zeros_like(mod_arry)
-        self.QData = np.zeros_like(mod_arry)
-        for i, t in enumerate(time):
-            # ## sin(2(pi)fc+(beta)sin(2(pi)fm))
-            # ## sin(2(pi)fc+(beta)modArry)
-            self.IData[i] = np.cos(2.0 * np.pi * self.FC1 * t + modIndx * mod_arry[i])
-            self.QData[i] = np.sin(2.0 * np.pi * self.FC1 * t + modIndx * mod_arry[i])
+        # ## sin(2(pi)fc+(beta)sin(2(pi)fm))
+        # ## sin(2(pi)fc+(beta)modArry)
+        IQ = Expj(Ramp(self.FC1, self.Fs, samples) + PhaseWords(modIndx * mod_arry))
+        self.IData = IQ.real
+        self.QData = IQ.imag
         print("GenFM: FC:%.3fMHz FMod:%.3fMHz tones generated" % (self.FC1 / 1e6, self.FMod / 1e6))
 
-        self.WvWrite()
+        self.PostProcess()
+        self.comment = "Gen_FM:"
         # self.plot_IQ_FFT(mod_arry)
 
-    def Gen_FMChirp(self):
+    def Gen_FMChirp(self, RampTime=100e-6):
         # #####################################################################
         # ## Source:  https://en.wikipedia.org/wiki/Chirp
         # ## sine (phi + 2Pi (F0t + (k * t * t)/2)
@@ -77,25 +78,17 @@ class IQGen(Common):
         # #####################################################################
         # ## User Input
         # #####################################################################
-        self.Fs = 2.0e9                                     # Sampling Frequency
-        RampTime = 100e-6
+        self.Fs = self.FsChirp                              # Sampling Frequency
 
         # ## Code Start
-        time = np.arange(0, RampTime, 1 / self.Fs)          # Create time array
-        self.IData  = [0.00] * time.size                    # Create empty array
-        self.QData  = [0.00] * time.size                    # Create empty array
-        I_Dn        = [0.00] * time.size                    # Create empty array
-        Q_Dn        = [0.00] * time.size                    # Create empty array
+        samples = int(np.ceil(RampTime / (1 / self.Fs)))    # len(np.arange(0, RampTime, 1 / Fs))
         K = ((self.FC2 - self.FC1) / RampTime)              # Define FM sweep rate
 
-        for i, t in enumerate(time):
-            self.IData[i] = np.cos(2.0 * np.pi * (self.FC1 * t + K * t * t / 2))
-            self.QData[i] = np.sin(2.0 * np.pi * (self.FC1 * t + K * t * t / 2))
-            I_Dn[i]       = np.cos(2.0 * np.pi * (self.FC2 * t - K * t * t / 2))
-            Q_Dn[i]       = np.sin(2.0 * np.pi * (self.FC2 * t - K * t * t / 2))
-
-        self.IData.extend(I_Dn)                             # Sweep I Down
-        self.QData.extend(Q_Dn)                             # Sweep Q Down
+        IQ = np.empty(2 * samples, dtype=complex)
+        IQ[:samples] = Chirp(self.FC1, K, self.Fs, samples)     # Sweep Up:   FC1*t + K*t*t/2
+        IQ[samples:] = Chirp(self.FC2, -K, self.Fs, samples)    # Sweep Down: FC2*t - K*t*t/2
+        self.IData = IQ.real
+        self.QData = IQ.imag
         # self.IData = self.IData[::-1]                     # Reverse I
         # self.QData = self.QData[::-1]                     # Reverse Q
 
@@ -103,7 +96,8 @@ class IQGen(Common):
         print("GenFM: %fsec ramp at %.0f MHz/Sec" % (RampTime, K / 1e6))
         print("GenFM: " + commnt)
 
-        self.WvWrite(commnt)
+        self.PostProcess()
+        self.comment = "Gen_FMChirp:" + commnt
 
     def Gen_FMChirpSum(self):
         ##################################################################
@@ -112,16 +106,17 @@ class IQGen(Common):
         # ## User Input
         ##################################################################
         # self.FC1                                                  # Start Frequency
-        Fs = 2.0e9                                                  # Sampling Frequency
+        Fs = self.FsChirp                                           # Sampling Frequency
+        self.Fs = Fs
         RampTime = 1000e-6                                          # Time from F1 to F2
         Points  = int(Fs * RampTime)                                # Num waveform points
         PhStep  = self.FC1 / (Points - 1)
         # self.IData = [0.00] * Points                              # Create empty array
         # self.QData = [0.00] * Points                              # Create empty array
         fm1 = np.arange(-self.FC1 / 2, +self.FC1 / 2, PhStep)       # freq vs time
-        phase = 2.0 * np.pi / Fs * np.cumsum(fm1)                   # freq vs time --> phase vs time
-        self.IData = 0.707 * np.cos(phase)                          # Gen I Data
-        self.QData = 0.707 * np.sin(phase)                          # Gen Q Data
+        IQ = 0.707 * FM(fm1, Fs)                                    # freq vs time --> exact phase vs time
+        self.IData = IQ.real                                        # Gen I Data
+        self.QData = IQ.imag                                        # Gen Q Data
 
         print("Points" + str(Points))
         # if 1:                                                     # Up and down sweep
@@ -135,7 +130,8 @@ class IQGen(Common):
 
         cmmnt = f"{self.FC1/1e6} to {self.FC2/1e6}MHz sweep in {RampTime}sec"
         print("GenFM: " + cmmnt)
-        self.WvWrite(cmmnt)
+        self.PostProcess()
+        self.comment = "Gen_FMChirpSum:" + cmmnt
 
     def Gen_PhaseMod(self):
         angle = 87
@@ -149,12 +145,10 @@ class IQGen(Common):
         print("GenCW: %.3fMHz %.3fMHz tones generated" % (self.FC1 / 1e6, self.FC2 / 1e6))
         print("GenCW: %.2f %.2f Oversample" % (self.Fs / self.FC1, self.Fs / self.FC2))
 
-        self.WvWrite()
+        self.PostProcess()
+        self.comment = "Gen_PhaseMod:"
         # self.plot_IQ_FFT(Fs, self.IData, self.QData)
 
-        self.GUI_Element.insert(0, "CWGen")
-        self.GUI_Object.update()
-
 
 ######################################################################
 # ## Run if Main
@@ -0,0 +1,111 @@
+# ### Purpose : N tone multitone generator, one inverse FFT for all tones
+# ###
+# ### Tones sit on FFT bins of a NumPeriods long record, so the waveform
+# ### repeats seamlessly.  Cost is one O(N log N) IFFT regardless of NumTones.
+# ###     Fs       = OverSamp * NumTones * ToneSpace
+# ###     Samples  = OverSamp * NumTones * NumPeriods
+# ###     Tone m   = ToneStart + m * ToneSpace, m = 0..NumTones-1
+import sys
+import time
+import numpy             as np
+from IQGen_Common        import Common                      # pylint: disable=E0401
+
+def TonePhases(numTones, phase='newman', seed=0):
+    """Per tone start phase, radians
+    'newman'   : pi * m^2 / N          low crest factor
+    'schroeder': -pi * m * (m+1) / N   low crest factor, equal amplitudes
+    'zero'     : all 0                 worst case crest factor
+    'random'   : uniform 0..2pi, seed
+    or a sequence of numTones phases"""
+    m = np.arange(numTones)
+    if isinstance(phase, str):
+        if phase == 'newman':
+            return np.pi * m ** 2 / numTones
+        if phase == 'schroeder':
+            return -np.pi * m * (m + 1) / numTones
+        if phase == 'zero':
+            return np.zeros(numTones)
+        if phase == 'random':
+            return np.random.default_rng(seed).uniform(0, 2 * np.pi, numTones)
+        raise ValueError(f"TonePhases: unknown phase '{phase}'")
+    phase = np.asarray(phase, dtype=float)
+    if phase.shape != (numTones,):
+        raise ValueError(f"TonePhases: {len(phase)} phases for {numTones} tones")
+    return phase
+
+def CrestFactor(IData, QData):
+    """Peak to average power ratio, dB"""
+    power = IData * IData + QData * QData
+    return 10 * np.log10(np.max(power) / np.mean(power))
+
+class IQGen(Common):
+    def __init__(self):
+        super().__init__()
+        self.maxAmpl    = 1                                 # clipping value
+        self.OverSamp   = 4                                 # Fs / occupied bandwidth
+        self.NumTones   = 10                                # Number of tones
+        self.ToneSpace  = 1e6                               # Tone spacing,Hz
+        self.ToneStart  = None                              # First tone,Hz  None:-NumTones//2 * ToneSpace
+        self.ToneAmpl   = None                              # Per tone linear amplitude, None:all 1
+        self.TonePhase  = 'newman'                          # 'newman' 'schroeder' 'zero' 'random' or per tone list
+        self.NumPeriods = 1                                 # Tone spacing periods
+        self.IQpoints   = 0                                 # Display points
+        self.Fs         = 0                                 # Sampling Rate
+        self.IData      = []
+        self.QData      = []
+
+    def __str__(self):
+        OutStr = 'NumTones    : %5d\n' % self.NumTones +\
+                 'ToneSpace   : %5.2f\n' % self.ToneSpace +\
+                 'OverSamp    : %5.2f\n' % self.OverSamp +\
+                 'NumPeriods  : %5.2f\n' % self.NumPeriods +\
+                 'TonePhase   : %s\n' % self.TonePhase
+        return OutStr
+
+    def ToneFreqs(self):
+        """Tone frequencies, Hz"""
+        start = self.ToneStart
+        if start is None:
+            start = -(self.NumTones // 2) * self.ToneSpace
+        return start + np.arange(self.NumTones) * self.ToneSpace
+
+    def GenMultitone(self):
+        tick = time.perf_counter()
+        samples = int(round(self.OverSamp * self.NumTones * self.NumPeriods))
+        self.Fs = self.OverSamp * self.NumTones * self.ToneSpace   # Sampling Frequency
+        binHz   = self.Fs / samples                         # = ToneSpace / NumPeriods
+
+        freqs = self.ToneFreqs()
+        bins  = np.rint(freqs / binHz).astype(np.int64)
+        if np.any(np.abs(bins) > samples // 2):
+            raise ValueError(f"GenMultitone: tones exceed +/-Fs/2 ({self.Fs / 2e6:.3f}MHz), raise OverSamp")
+        if np.any(np.abs(bins * binHz - freqs) > 1e-6 * binHz):
+            print(f"GenMultitone: tones moved to the {binHz / 1e3:.3f}kHz bin grid")
+        ampl  = np.ones(self.NumTones) if self.ToneAmpl is None else np.asarray(self.ToneAmpl, dtype=float)
+        phase = TonePhases(self.NumTones, self.TonePhase)
+
+        spec = np.zeros(samples, dtype=np.complex128)
+        np.add.at(spec, bins % samples, ampl * np.exp(1j * phase))  # Tones sharing a bin add up
+        IQ = np.fft.ifft(spec) * samples                    # Sum of ampl * exp(j(2pi f t + phase))
+        self.IData = IQ.real
+        self.QData = IQ.imag
+        self.comment = "GenMultitone:" + f"{self.NumTones} tones {self.ToneSpace / 1e6:.3f}MHz {self.TonePhase}"
+        crest = CrestFactor(IQ.real, IQ.imag)
+        self.PostProcess('peak')
+
+        print(f"GenMultitone: {self.NumTones} tones {self.ToneSpace / 1e6:.3f}MHz spacing "
+              f"Crest:{crest:.2f}dB {time.perf_counter() - tick:.4f}sec")
+        print(f"GenMultitone: {samples} Samples @ {self.Fs / 1e6:.3f}MHz")
+
+# #####################################################################
+# ## Run if Main
+# #####################################################################
+if __name__ == "__main__":
+    print(sys.version)
+    Wvform = IQGen()                                        # Create object
+    Wvform.NumTones  = 1000                                 # Number of tones
+    Wvform.ToneSpace = 10e3                                 # Tone spacing,Hz
+    Wvform.TonePhase = 'newman'                             # Low crest factor
+    Wvform.GenMultitone()
+    # Wvform.createWv()
+    # Wvform.plot_IQ_FFT()
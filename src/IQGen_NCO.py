@@ -0,0 +1,87 @@
+# ### Purpose : Numerically controlled oscillator with an exact integer phase
+# ###
+# ### Phase is a uint64 accumulator, 2^64 counts = one cycle, so frequency
+# ### words add exactly and wrap for free; there is no float time vector
+# ### losing phase resolution as the record grows.
+# ###     Tone : rows of BLOCK samples, exp(j*start[row]) * exp(j*word*k),
+# ###            row starts taken exactly from the accumulator
+# ###     Chirp: linear FM, accumulator p + w*n + h*n*n split the same way,
+# ###            the row x k cross term resynced exactly every RESYNC rows
+# ###     FM   : any per sample frequency, exact cumsum of words
+# ###
+# ### IQ = Tone(1e6, 100e6, 4096)          exp(j*2*pi*1e6*n/100e6), complex128
+from fractions import Fraction
+import numpy as np
+
+CYCLE  = 2 ** 64                                            # Accumulator counts per cycle
+RAD    = 2 * np.pi / CYCLE                                  # Radians per accumulator count
+BLOCK  = 1024                                               # Samples per rotation row
+RESYNC = 64                                                 # Chirp rows per exact resync
+
+def FreqWord(freq, Fs):
+    """Accumulator increment per sample of freq at Fs, int 0..2^64-1"""
+    return round(Fraction(freq) / Fraction(Fs) * CYCLE) % CYCLE
+
+def CycleWords(cycles):
+    """Cycles (float array) -> uint64 accumulator counts, wrapped to one cycle"""
+    cycles = np.asarray(cycles, dtype=np.float64)
+    cycles = cycles - np.floor(cycles + 0.5)                # -0.5..0.5, fits int64
+    return np.rint(cycles * CYCLE).astype(np.int64).view(np.uint64)
+
+def PhaseWords(phase):
+    """Radians (float array) -> uint64 accumulator counts"""
+    return CycleWords(np.asarray(phase, dtype=np.float64) / (2 * np.pi))
+
+def Ramp(freq, Fs, samples, phase=0.0):
+    """Accumulator of a constant freq, phase + word * n"""
+    return np.arange(samples, dtype=np.uint64) * np.uint64(FreqWord(freq, Fs)) + PhaseWords(phase)
+
+def Expj(acc):
+    """exp(j*2*pi*acc/2^64) of a uint64 accumulator array, complex128"""
+    angle = np.asarray(acc, dtype=np.uint64).view(np.int64) * RAD   # -pi..pi
+    IQ = np.empty(angle.shape, dtype=np.complex128)
+    np.cos(angle, out=IQ.real)
+    np.sin(angle, out=IQ.imag)
+    return IQ
+
+def Tone(freq, Fs, samples, phase=0.0, block=BLOCK):
+    """exp(j*(2*pi*freq*n/Fs + phase)), n = 0..samples-1
+    About samples/block + block sin/cos instead of one pair per sample."""
+    word  = np.uint64(FreqWord(freq, Fs))
+    block = max(1, min(block, samples))
+    rows  = -(-samples // block)
+    start = np.arange(rows, dtype=np.uint64) * np.uint64(int(word) * block % CYCLE) + PhaseWords(phase)
+    IQ = Expj(start)[:, None] * Expj(np.arange(block, dtype=np.uint64) * word)
+    return IQ.reshape(-1)[:samples]
+
+def Chirp(freq, rate, Fs, samples, phase=0.0, block=BLOCK, resync=RESYNC):
+    """exp(j*(2*pi*(freq*t + rate*t*t/2) + phase)), t = n/Fs, sweep rate in Hz/s
+    acc[s+k] = (p + w*s + h*s*s) + (w*k + h*k*k) + 2*h*s*k, s = row * block
+    Row starts and the cross term come from 128 bit w, h, so rounding does not grow with s."""
+    W     = round(Fraction(freq) / Fraction(Fs) * CYCLE * CYCLE)
+    H     = round(Fraction(rate) / (2 * Fraction(Fs) ** 2) * CYCLE * CYCLE)
+    word  = np.uint64(((W + CYCLE // 2) >> 64) % CYCLE)
+    half  = np.uint64(((H + CYCLE // 2) >> 64) % CYCLE)
+    block = max(1, min(block, samples))
+    rows  = -(-samples // block)
+    k     = np.arange(block, dtype=np.uint64)
+    start = np.array([((W * s + H * s * s + CYCLE // 2) >> 64) % CYCLE for s in range(0, rows * block, block)],
+                     dtype=np.uint64)
+    start = Expj(start + PhaseWords(phase))
+    inner = Expj(word * k + half * k * k)
+    cross = k * np.uint64(((2 * H * block + CYCLE // 2) >> 64) % CYCLE)    # Cross term per row step
+    steps = Expj(np.arange(min(resync, rows), dtype=np.uint64)[:, None] * cross)
+    IQ = np.empty((rows, block), dtype=np.complex128)
+    for first in range(0, rows, resync):
+        last = min(first + resync, rows)
+        base = inner * Expj(cross * np.uint64(first))       # Exact, no drift between resyncs
+        np.multiply(steps[:last - first], base, out=IQ[first:last])
+        IQ[first:last] *= start[first:last, None]
+    return IQ.reshape(-1)[:samples]
+
+def FM(freqs, Fs, phase=0.0):
+    """exp(j*(phase + 2*pi*cumsum(freqs)/Fs)), freqs in Hz per sample
+    Words are summed exactly, so long records keep their phase."""
+    acc = np.cumsum(CycleWords(np.asarray(freqs) / Fs), dtype=np.uint64)
+    acc += PhaseWords(phase)
+    return Expj(acc)
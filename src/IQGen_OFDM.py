@@ -0,0 +1,108 @@
+# ### Purpose : OFDM generator, port of Matlab/OFDM.m on top of Common
+# ###
+# ### K subcarriers, every K/NumPilot'th carrier plus the last one is a pilot,
+# ### the rest carry Mu bit Gray mapped square QAM (Mu=4: 16QAM table of OFDM.m).
+# ###     Bits -> QAM    : one table lookup for all symbols
+# ###     QAM  -> time   : one 2-D IFFT, NumSymbols x (K * OverSamp)
+# ###     Cyclic prefix  : last CP samples of each row copied in front by slicing
+import sys
+import time
+import numpy             as np
+from IQGen_Common        import Common                      # pylint: disable=E0401
+
+def QAMTable(mu):
+    """Gray mapped square QAM, table[int of mu bits MSB first] = symbol
+    mu=4 is the mapping_table of OFDM.m, e.g. (0,0,1,0) -> -3+3j"""
+    if mu < 2 or mu % 2:
+        raise ValueError(f"QAMTable: mu must be even, got {mu}")
+    half = mu // 2
+    gray = np.arange(1 << half)
+    level = gray.copy()
+    shift = gray >> 1
+    while shift.any():                                      # Gray -> binary position
+        level ^= shift
+        shift >>= 1
+    level = 2 * level - ((1 << half) - 1)                   # ..., -3, -1, 1, 3, ...
+    idx = np.arange(1 << mu)
+    return level[idx >> half] + 1j * level[idx & ((1 << half) - 1)]
+
+class IQGen(Common):
+    def __init__(self):
+        super().__init__()
+        self.maxAmpl    = 1                                 # clipping value
+        self.OverSamp   = 1                                 # IFFT size / K
+        self.K          = 64                                # number of OFDM subcarriers
+        self.CP         = 16                                # cyclic prefix, subcarrier samples
+        self.NumPilot   = 8                                 # pilot carriers per OFDM symbol, +1 last carrier
+        self.PilotValue = 3 + 3j                            # known value each pilot transmits
+        self.Mu         = 4                                 # bits per QAM symbol
+        self.SubSpace   = 312.5e3                           # subcarrier spacing,Hz
+        self.NumSymbols = 1000                              # number of OFDM symbols
+        self.Seed       = 0                                 # payload bit generator seed
+        self.IQpoints   = 0                                 # Display points
+        self.Fs         = 0                                 # Sampling Rate
+        self.IData      = []
+        self.QData      = []
+        self.Bits       = None                              # NumSymbols x payload bits of the last run
+
+    def __str__(self):
+        OutStr = 'K           : %5d\n' % self.K +\
+                 'CP          : %5d\n' % self.CP +\
+                 'NumPilot    : %5d\n' % self.NumPilot +\
+                 'Mu          : %5d\n' % self.Mu +\
+                 'SubSpace    : %5.2f\n' % self.SubSpace +\
+                 'NumSymbols  : %5d\n' % self.NumSymbols
+        return OutStr
+
+    def Carriers(self):
+        """(pilot, data) subcarrier indices 0..K-1"""
+        allCarriers = np.arange(self.K)
+        pilotCarriers = np.hstack([allCarriers[::self.K // self.NumPilot], [allCarriers[-1]]])
+        dataCarriers = np.delete(allCarriers, pilotCarriers)
+        return pilotCarriers, dataCarriers
+
+    def CarrierBins(self, carriers):
+        """IFFT bins of subcarriers, centered on 0Hz"""
+        return (carriers - self.K // 2) % (self.K * self.OverSamp)
+
+    def GenOFDM(self):
+        tick = time.perf_counter()
+        nfft = self.K * self.OverSamp
+        ncp  = self.CP * self.OverSamp
+        self.Fs = nfft * self.SubSpace                      # Sampling Frequency
+        pilotCarriers, dataCarriers = self.Carriers()
+
+        # ## Bits -> QAM, one lookup
+        rng = np.random.default_rng(self.Seed)
+        self.Bits = rng.integers(0, 2, (self.NumSymbols, len(dataCarriers) * self.Mu), dtype=np.uint8)
+        weights = 1 << np.arange(self.Mu - 1, -1, -1)
+        index = self.Bits.reshape(self.NumSymbols, len(dataCarriers), self.Mu) @ weights
+        grid = np.zeros((self.NumSymbols, nfft), dtype=np.complex128)
+        grid[:, self.CarrierBins(dataCarriers)] = QAMTable(self.Mu)[index]
+        grid[:, self.CarrierBins(pilotCarriers)] = self.PilotValue
+
+        # ## All symbols in one IFFT, cyclic prefix by slicing
+        OFDM = np.empty((self.NumSymbols, ncp + nfft), dtype=np.complex128)
+        OFDM[:, ncp:] = np.fft.ifft(grid, axis=1) * np.sqrt(nfft)
+        OFDM[:, :ncp] = OFDM[:, nfft:]                      # Last ncp samples of each symbol
+        IQ = OFDM.ravel()
+        self.IData = IQ.real
+        self.QData = IQ.imag
+        self.comment = "GenOFDM:" + f"K{self.K} CP{self.CP} {1 << self.Mu}QAM {self.NumSymbols}sym"
+        self.PostProcess('peak')
+
+        print(f"GenOFDM: {self.NumSymbols} symbols {self.K} carriers {1 << self.Mu}QAM "
+              f"{time.perf_counter() - tick:.4f}sec")
+        print(f"GenOFDM: {len(IQ)} Samples @ {self.Fs / 1e6:.3f}MHz")
+
+# #####################################################################
+# ## Run if Main
+# #####################################################################
+if __name__ == "__main__":
+    print(sys.version)
+    Wvform = IQGen()                                        # Create object
+    Wvform.NumSymbols = 10000                               # OFDM symbols
+    Wvform.OverSamp   = 4                                   # IFFT oversampling
+    Wvform.GenOFDM()
+    # Wvform.createWv()
+    # Wvform.plot_IQ_FFT()
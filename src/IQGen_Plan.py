@@ -0,0 +1,80 @@
+# ### Purpose : Shortest coherent record for a set of tones
+# ###
+# ### Every tone f completes whole cycles in N samples at Fs when f * N / Fs is
+# ### an integer, i.e. the record is a multiple of 1/F0, F0 = gcd(tone freqs).
+# ### The minimal loop is one 1/F0 period; N is the smallest 2^a 3^b 5^c
+# ### (FFT friendly) count with Fs = N * F0 >= FsMin.
+# ###
+# ### plan = CoherentPlan([1e6, 3e6], FsMin=30e6)
+# ###     {'Fs': 30e6, 'samples': 30, 'F0': 1e6, 'cycles': [1, 3]}
+import math
+import functools
+from fractions import Fraction
+
+MAXSAMPLES = 1 << 26                                        # Largest loop, 1GB of complex128
+
+def Rational(freq, maxDen=1000):
+    """Tone frequency in Hz as a Fraction, e.g. 1e6 / 3 -> 1000000/3"""
+    return Fraction(freq).limit_denominator(maxDen)
+
+def Lcm(a, b):
+    """Least common multiple of two ints (math.lcm needs Python 3.9)"""
+    return a * b // math.gcd(a, b)
+
+def ToneGCD(freqs, maxDen=1000):
+    """Largest F0 (Hz, Fraction) of which every |freq| is an integer multiple"""
+    fracs = [abs(Rational(f, maxDen)) for f in freqs if f]
+    if not fracs:
+        raise ValueError("ToneGCD: need at least one non zero tone")
+    den = functools.reduce(Lcm, [f.denominator for f in fracs])
+    num = functools.reduce(math.gcd, [int(f * den) for f in fracs])
+    return Fraction(num, den)
+
+def SmoothCeil(n, primes=(2, 3, 5)):
+    """Smallest integer >= n whose prime factors are all in primes"""
+    n = max(1, math.ceil(n))
+    best = None
+
+    def search(idx, value):
+        nonlocal best
+        if idx == len(primes) - 1:                          # Last prime fills the gap
+            while value < n:
+                value *= primes[idx]
+            best = value if best is None else min(best, value)
+            return
+        while 1:
+            search(idx + 1, value)
+            if value >= n:
+                return
+            value *= primes[idx]
+    search(0, 1)
+    return best
+
+def CoherentPlan(freqs, FsMin, FsMax=None, Fs=None, minSamples=1, primes=(2, 3, 5), maxDen=1000,
+                 maxSamples=MAXSAMPLES):
+    """Shortest phase continuous loop for tones freqs, return dict
+    Fs        : fixed clock, otherwise Fs = samples * F0 >= FsMin is chosen
+    minSamples: instrument minimum, whole loops are repeated to reach it
+    maxSamples: ValueError if the loop is longer, e.g. near equal tones
+    Fs, samples, F0 (Hz), cycles (per tone in the record), periods (1/F0 loops)"""
+    F0 = ToneGCD(freqs, maxDen)
+    if Fs is None:
+        samples = SmoothCeil(Fraction(FsMin) / F0, primes)
+        Fs = samples * F0
+        periods = 1
+    else:
+        ratio = Fraction(Fs).limit_denominator(10 ** 9) / F0    # Samples per 1/F0, maybe fractional
+        samples, periods = ratio.numerator, ratio.denominator
+    if FsMax is not None and Fs > FsMax:
+        raise ValueError(f"CoherentPlan: needs Fs {float(Fs) / 1e6:.3f}MHz > FsMax {FsMax / 1e6:.3f}MHz")
+    if samples > maxSamples:
+        raise ValueError(f"CoherentPlan: loop of {int(samples)} samples (F0 {float(F0):g}Hz) > maxSamples {maxSamples}")
+    if samples < minSamples:
+        reps = math.ceil(minSamples / samples)
+        samples *= reps
+        periods *= reps
+    return {'Fs': float(Fs),
+            'samples': int(samples),
+            'F0': float(F0),
+            'periods': int(periods),
+            'cycles': [float(Rational(f, maxDen) * periods / F0) for f in freqs]}
@@ -0,0 +1,63 @@
+# ### Purpose : Decimated time / frequency rendering, on screen or headless to file
+# ###
+# ### Long waveforms are reduced to a min/max envelope of width bins before
+# ### they reach matplotlib, which looks the same at screen resolution.
+# ### Figures for files are drawn on a plain Agg canvas, pyplot is not used.
+import numpy as np
+
+def MinMaxDecimate(y, width=1000, x=None):
+    """Return (x, y) min/max envelope of y with 2*width points
+    y is returned untouched if it is already that short, width 0 disables"""
+    y = np.asarray(y)
+    if x is None:
+        x = np.arange(len(y))
+    if not width or len(y) <= 2 * width:
+        return x, y
+    edges = np.linspace(0, len(y), width + 1).astype(int)[:-1]
+    env = np.empty(2 * width, dtype=y.dtype)
+    env[0::2] = np.minimum.reduceat(y, edges)
+    env[1::2] = np.maximum.reduceat(y, edges)
+    return np.repeat(np.asarray(x)[edges], 2), env
+
+def NewFigure(filename=''):
+    """Agg figure for file output, pyplot figure for the screen"""
+    if filename:
+        from matplotlib.figure import Figure                            # pylint: disable=C0415
+        from matplotlib.backends.backend_agg import FigureCanvasAgg     # pylint: disable=C0415
+        fig = Figure(figsize=(10, 7))
+        FigureCanvasAgg(fig)
+        return fig
+    import matplotlib.pyplot as plt                                     # pylint: disable=C0415
+    plt.clf()
+    return plt.gcf()
+
+def DrawIQ(fig, IData, QData, frq, mag, width=1000, IQpoints=0, Plot3=None):
+    """Time domain I/Q on top, spectrum below"""
+    ax = fig.add_subplot(2, 1, 1)                                       # Time Domain
+    ax.set_title("I:Blue Q:Yellow")
+    ax.plot(*MinMaxDecimate(IData, width), "b")
+    ax.plot(*MinMaxDecimate(QData, width), "y")
+    if Plot3 is not None:
+        ax.plot(*MinMaxDecimate(Plot3, width), "g")
+
+    ax = fig.add_subplot(2, 1, 2)                                       # Frequency Domain
+    if IQpoints:
+        ax.plot(frq, mag, 'bo')
+    ax.plot(*MinMaxDecimate(mag, width, frq))
+    ax.set_xlabel('Freq')
+    ax.set_ylabel('magnitude')
+    ax.grid(True)
+
+def DrawLine(fig, traces, x=None, width=1000):
+    """Traces over x (or sample index), blue/yellow"""
+    ax = fig.add_subplot(1, 1, 1)
+    for trace, color in zip(traces, ["b", "y", "g"]):
+        ax.plot(*MinMaxDecimate(trace, width, x), color)
+    ax.set_xlabel('time,sec')
+    ax.set_ylabel('magnitude')
+    ax.set_title('plot')
+    ax.grid(True)
+
+def SaveFigure(fig, filename):
+    fig.savefig(filename, dpi=100)
+    print(f"Plot : {filename}")
@@ -0,0 +1,82 @@
+# ### Purpose : Polyphase rational resampler, Kaiser windowed sinc lowpass
+# ###
+# ### IQ, FsNew = Resample(IQ, Fs, FsOut, trans=0.2)
+# ###     FsOut / Fs is taken as up / down (both <= MAXDEN).  The lowpass at
+# ###     up * Fs passes (1 - trans) of the lower rate's Nyquist band and stops
+# ###     ATTEN dB at its edge; Kaiser's formulas set beta and the tap count.
+# ###     Only the up phases of the filter are applied, no zero stuffed signal
+# ###     is built: len(h) / up multiplies per output sample.
+# ###     Filtering is circular, so a looped ARB waveform stays seamless when
+# ###     len(IQ) * up / down is a whole number.
+import functools
+from fractions import Fraction
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+ATTEN  = 80.0                                               # Stopband attenuation, dB
+TRANS  = 0.2                                                # Default transition fraction
+MAXDEN = 1000                                               # Largest up or down factor
+CHUNK  = 1 << 22                                            # Window samples per matrix product
+WIDTH  = 64                                                 # Output samples per window row, at least
+
+def Ratio(Fs, FsOut, maxDen=MAXDEN):
+    """(up, down) coprime with up / down ~ FsOut / Fs"""
+    ratio = (Fraction(FsOut) / Fraction(Fs)).limit_denominator(maxDen)
+    if ratio <= 0 or ratio.numerator > maxDen:
+        raise ValueError(f"Resample: {Fs / 1e6:.3f}MHz -> {FsOut / 1e6:.3f}MHz needs up > {maxDen}")
+    return ratio.numerator, ratio.denominator
+
+@functools.lru_cache(maxsize=16)
+def KaiserFilter(up, down, trans=TRANS, atten=ATTEN):
+    """Read only lowpass taps at up * Fs padded to a multiple of up, DC gain up,
+    and its delay in samples at up * Fs"""
+    band  = 1 / (2 * max(up, down))                         # Lower Nyquist, cycles/sample at up * Fs
+    width = trans * band                                    # Transition width
+    taps  = int(np.ceil((atten - 8) / (2.285 * 2 * np.pi * width))) | 1    # Odd, whole sample delay
+    n     = np.arange(taps) - (taps - 1) // 2
+    fc    = band - width / 2                                # Cutoff mid transition
+    h     = np.zeros(-(-taps // up) * up)
+    h[:taps] = 2 * fc * up * np.sinc(2 * fc * n) * np.kaiser(taps, 0.1102 * (atten - 8.7))
+    h.flags.writeable = False
+    return h, (taps - 1) // 2
+
+def Resample(IQ, Fs, FsOut, trans=TRANS, chunk=CHUNK):
+    """Resample complex IQ from Fs to about FsOut, return (IQ complex128, new Fs)
+    Output row q holds width = up * group samples; output f of row q reads the
+    L inputs ending at newest[f] + q * down * group.  Outputs with nearby newest
+    inputs share one window matrix, so each is a single real matrix product."""
+    if not 0 < trans < 1:
+        raise ValueError(f"Resample: transition fraction {trans} is not between 0 and 1")
+    up, down = Ratio(Fs, FsOut)
+    if up == down:
+        return np.asarray(IQ, dtype=np.complex128), Fs
+    if len(IQ) == 0:
+        return np.zeros(0, dtype=np.complex128), Fs * up / down
+    h, delay = KaiserFilter(up, down, trans)
+    L       = len(h) // up                                  # Taps per phase
+    group   = max(1, min(-(-WIDTH // up), L // down))       # Filter periods per row, windows stay short
+    width   = up * group
+    stride  = down * group                                  # Input step per row
+    outLen  = len(IQ) * up // down
+    rows    = -(-outLen // width)
+    newest  = (np.arange(width) * down + delay) // up       # Newest input of each output, row 0
+    x       = np.take(np.asarray(IQ), np.arange(1 - L, newest[-1] + (rows - 1) * stride + 1), mode='wrap')
+    xParts  = [np.ascontiguousarray(x.real, dtype=np.float64), np.ascontiguousarray(x.imag, dtype=np.float64)]
+    out     = np.empty((rows, width), dtype=np.complex128)
+    first   = 0
+    while first < width:                                    # Group outputs whose windows overlap
+        last = first + 1
+        while last < width and newest[last] - newest[first] < L:
+            last += 1
+        span = L + newest[last - 1] - newest[first]
+        taps = np.zeros((span, last - first))
+        for f in range(first, last):
+            at = newest[f] - newest[first]
+            taps[at:at + L, f - first] = h[(f * down + delay) % up::up][::-1]
+        step = max(1, chunk // span)
+        for part, xPart in zip([out.real, out.imag], xParts):
+            windows = sliding_window_view(xPart, span)[newest[first]::stride]
+            for row in range(0, rows, step):
+                part[row:row + step, first:last] = windows[row:row + step] @ taps
+        first = last
+    return out.reshape(-1)[:outLen], Fs * up / down
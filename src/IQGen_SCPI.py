@@ -0,0 +1,249 @@
+# ### Purpose : Raw socket SCPI session with streamed ARB upload, plus a local mock instrument
+# ###
+# ### :MMEM:DATA:UNPR "NVWFM://var//user//<wave.wv>",#<numSize><NumBytes><I0Q0...IxQx>
+# ###     numSize : Number of bytes in <NumBytes> string
+# ###     NumBytes: Number of bytes to follow, 4 per IQ pair (2 byte I + 2 byte Q)
+# ###     The block is sent chunk by chunk straight from IData/QData, it is
+# ###     never assembled in memory.
+# ###
+# ### SCPIPool() keeps one session per generator open across uploads.  Upload,
+# ### clock and select go out back to back without waiting for replies, the
+# ### error queue is read once per batch with Check().
+# ###
+# ### MockSCPI() is a TCP stand-in on localhost that understands definite
+# ### length blocks, *IDN? and SYST:ERR?, for testing uploads offline.
+import time
+import socket
+import threading
+from CreateWv3 import CHUNK, WvQuantBlocks
+
+SCPIPORT = 5025
+
+def BlockHeader(numBytes):
+    """IEEE 488.2 definite length block header #<numSize><NumBytes>"""
+    size = str(numBytes)
+    return f"#{len(size)}{size}".encode()
+
+class SCPISock:
+    """SCPI over a raw TCP socket (port 5025)"""
+    def __init__(self, host, port=SCPIPORT, timeout=10):
+        self.host = host
+        self.port = port
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rxBuf = b''
+
+    def write(self, cmd):
+        self.sock.sendall(cmd.encode() + b'\n')
+
+    def read(self):
+        while b'\n' not in self.rxBuf:
+            data = self.sock.recv(4096)
+            if not data:
+                raise ConnectionError(f"SCPISock: {self.host} closed the connection")
+            self.rxBuf += data
+        line, self.rxBuf = self.rxBuf.split(b'\n', 1)
+        return line.decode().strip()
+
+    def query(self, cmd):
+        self.write(cmd)
+        return self.read()
+
+    def write_block(self, cmd, IData, QData, chunk=CHUNK):
+        """Send cmd followed by I/Q as a big-endian int16 definite length block
+        Return saturated pair count."""
+        numSat = 0
+        self.sock.sendall(cmd.encode() + BlockHeader(4 * len(IData)))
+        for data, blkSat in WvQuantBlocks(IData, QData, chunk, dtype='>i2'):
+            self.sock.sendall(data)
+            numSat += blkSat
+        self.sock.sendall(b'\n')
+        return numSat
+
+    def close(self):
+        self.sock.close()
+
+class SCPIPool:
+    """Open SCPISock per (host, port), reused until close()
+    log: one {'host', 'port', 'op', 'name', 'bytes', 'sec'} entry per operation"""
+    def __init__(self, port=SCPIPORT, timeout=10):
+        self.port     = port
+        self.timeout  = timeout
+        self.sessions = {}
+        self.log      = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def Session(self, host, port=None):
+        """Connected SCPISock for host, opened on first use"""
+        key = (host, port or self.port)
+        if key not in self.sessions:
+            tick = time.perf_counter()
+            self.sessions[key] = SCPISock(host, key[1], self.timeout)
+            self.record(key, 'open', '', 0, tick)
+        return self.sessions[key]
+
+    def record(self, key, op, name, numBytes, tick):
+        self.log.append({'host': key[0],
+                         'port': key[1],
+                         'op': op,
+                         'name': name,
+                         'bytes': numBytes,
+                         'sec': time.perf_counter() - tick})
+
+    def Upload(self, host, name, IData, QData, Fs, select=1, port=None):
+        """Stream name.wv to host, set its clock and select it, no reply is awaited
+        Return saturated pair count."""
+        key  = (host, port or self.port)
+        SMW  = self.Session(*key)
+        tick = time.perf_counter()
+        numSat = SMW.write_block(f':MMEM:DATA:UNPR "NVWFM://var//user//{name}",', IData, QData)
+        self.record(key, 'upload', name, 4 * len(IData), tick)
+        tick = time.perf_counter()
+        cmd = f'SOUR1:BB:ARB:WAV:CLOC "/var/user/{name}",{Fs}'
+        if select:
+            cmd += f';:BB:ARB:WAV:SEL "/var/user/{name}"'
+        SMW.write(cmd)
+        self.record(key, 'config', name, len(cmd), tick)
+        return numSat
+
+    def Check(self):
+        """Drain the error queue of every session once, return {(host, port): [errors]}
+        Waits until each instrument has processed everything sent so far."""
+        errors = {}
+        for key, SMW in self.sessions.items():
+            tick = time.perf_counter()
+            reply = SMW.query('SYST:ERR:ALL?')
+            self.record(key, 'check', '', 0, tick)
+            errors[key] = [err for err in SplitErrors(reply) if not err.startswith('0,')]
+        return errors
+
+    def Batch(self, jobs):
+        """Upload every (host, name, IData, QData, Fs) job, then check errors once"""
+        for host, name, IData, QData, Fs in jobs:
+            self.Upload(host, name, IData, QData, Fs)
+        return self.Check()
+
+    def Latency(self):
+        """{op: (count, total sec, max sec)} summary of the log"""
+        summary = {}
+        for entry in self.log:
+            count, total, most = summary.get(entry['op'], (0, 0.0, 0.0))
+            summary[entry['op']] = (count + 1, total + entry['sec'], max(most, entry['sec']))
+        return summary
+
+    def close(self):
+        for SMW in self.sessions.values():
+            SMW.close()
+        self.sessions = {}
+
+def SplitErrors(reply):
+    """'-113,"Undefined header",0,"No error"' -> ['-113,"Undefined header"', '0,"No error"']"""
+    errors, quoted, start = [], 0, 0
+    for idx, char in enumerate(reply):
+        if char == '"':
+            quoted = not quoted
+        elif char == ',' and not quoted and reply[start:idx].count('"') == 2:
+            errors.append(reply[start:idx].strip())
+            start = idx + 1
+    errors.append(reply[start:].strip())
+    return errors
+
+class MockSCPI:
+    """Local stand-in SCPI instrument
+    files   : {name: bytes} of every MMEM:DATA:UNPR block received
+    commands: every non block command, in order"""
+    def __init__(self, host='127.0.0.1', port=0, idn='Rohde&Schwarz,SMW200A,Mock,0.0'):
+        self.idn      = idn
+        self.files    = {}
+        self.commands = []
+        self.errors   = []
+        self.server   = socket.create_server((host, port))
+        self.host, self.port = self.server.getsockname()[:2]
+        self.thread   = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def serve(self):
+        while 1:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return                                      # Server closed
+            threading.Thread(target=self.session, args=(conn,), daemon=True).start()
+
+    def session(self, conn):
+        buf  = bytearray()
+        need = 0                                            # Bytes a pending block still needs
+        with conn:
+            while 1:
+                try:
+                    data = conn.recv(1 << 20)
+                except OSError:
+                    return
+                if not data:
+                    return
+                buf += data
+                if len(buf) >= need:
+                    need = self.parse(conn, buf)
+
+    def parse(self, conn, buf):
+        """Handle every complete command in buf (consumed in place)
+        Return the buffer length needed before an incomplete block can be parsed."""
+        while 1:
+            newline = buf.find(b'\n')
+            block = buf.find(b',#')
+            if block != -1 and (newline == -1 or block < newline):
+                if len(buf) < block + 3:
+                    return 0
+                numSize = int(buf[block + 2:block + 3])
+                start = block + 3 + numSize
+                if len(buf) < start:
+                    return 0
+                stop = start + int(buf[block + 3:start])
+                if len(buf) < stop:
+                    return stop
+                name = buf[:block].decode().split(None, 1)[-1].strip('"')
+                self.files[name] = bytes(buf[start:stop])
+                del buf[:stop]
+                continue
+            if newline == -1:
+                return 0
+            cmd = buf[:newline].decode().strip()
+            del buf[:newline + 1]
+            if cmd:
+                self.command(conn, cmd)
+
+    def command(self, conn, cmd):
+        self.commands.append(cmd)
+        replies = []
+        for one in cmd.split(';'):
+            one = one.strip().lstrip(':')
+            head = one.split(None, 1)[0].upper() if one else ''
+            if not head.endswith('?'):
+                continue
+            if head == '*IDN?':
+                replies.append(self.idn)
+            elif head == 'SYST:ERR:ALL?':
+                replies.append(','.join(self.errors) or '0,"No error"')
+                self.errors = []
+            elif head.startswith('SYST:ERR'):
+                replies.append(self.errors.pop(0) if self.errors else '0,"No error"')
+            elif head == '*OPC?':
+                replies.append('1')
+            else:
+                self.errors.append(f'-113,"Undefined header;{one}"')
+        if replies:
+            conn.sendall(';'.join(replies).encode() + b'\n')
+
+    def close(self):
+        self.server.close()
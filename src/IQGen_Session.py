@@ -0,0 +1,69 @@
+# ### Purpose : Parameter only GUI session, versioned JSON
+# ###
+# ### {"version": 1, "module": "IQGen_2Tone", "genFunc": "Gen2Tone",
+# ###  "params": {"FC1": 1e6, ...}, "history": [{"time": .., "genFunc": .., "params": {..}}, ..]}
+# ###
+# ### No samples are stored, so save/load time does not depend on waveform size.
+# ### Wave() rebuilds the IQGen, Generate() fills it through the cache on first use.
+import os
+import json
+import time
+import importlib
+from IQGen_Cache import CacheParams
+
+SESSIONVERSION = 1
+HISTMAX = 50                                                # History entries kept
+
+class Session:
+    def __init__(self, module='IQGen_2Tone', genFunc='Gen2Tone', params=None, history=None):
+        self.module  = module
+        self.genFunc = genFunc
+        self.params  = params or {}
+        self.history = history or []
+
+    def Wave(self):
+        """New IQGen with the session parameters, nothing generated yet"""
+        wave = importlib.import_module(self.module).IQGen()
+        for key, val in self.params.items():
+            if hasattr(wave, key):
+                if isinstance(getattr(wave, key), complex) and isinstance(val, str):
+                    val = complex(val)                      # Saved as repr
+                setattr(wave, key, val)
+        return wave
+
+    def Generate(self, cache, wave=None):
+        """wave (or Wave()) with samples, from cache or the generator"""
+        wave = wave or self.Wave()
+        cache.Generate(wave, self.genFunc)
+        return wave
+
+    def Record(self, wave, genFunc=None):
+        """Take the parameters of wave as current, append them to history"""
+        self.genFunc = genFunc or self.genFunc
+        self.params  = CacheParams(wave)
+        entry = {'time': time.strftime("%Y-%m-%d %H:%M:%S"), 'genFunc': self.genFunc, 'params': self.params}
+        if not self.history or self.history[-1]['params'] != self.params or self.history[-1]['genFunc'] != self.genFunc:
+            self.history = (self.history + [entry])[-HISTMAX:]
+
+    def Save(self, filename):
+        data = {'version': SESSIONVERSION,
+                'module': self.module,
+                'genFunc': self.genFunc,
+                'params': self.params,
+                'history': self.history}
+        with open(filename + '.tmp', 'w') as fot:
+            json.dump(data, fot, indent=1)
+        os.replace(filename + '.tmp', filename)             # Never leave a half written session
+
+def SessionLoad(filename, default=None):
+    """Session from filename, default (or a new Session) if missing, unreadable or newer"""
+    try:
+        with open(filename, 'r') as fin:
+            data = json.load(fin)
+    except (OSError, ValueError):
+        return default or Session()
+    if not isinstance(data, dict) or data.get('version', 0) > SESSIONVERSION:
+        print(f"SessionLoad: {filename} is not a version {SESSIONVERSION} session, using defaults")
+        return default or Session()
+    return Session(data.get('module', 'IQGen_2Tone'), data.get('genFunc', 'Gen2Tone'),
+                   data.get('params', {}), data.get('history', []))
@@ -0,0 +1,70 @@
+# ### Purpose : Averaged, windowed spectrum (Welch) of I + jQ in bounded memory
+# ###
+# ### frq, mag = Welch(IData, QData, Fs, nfft=4096, overlap=0.5, window='hann', beta=8.6)
+# ###     Segments are strided views of one block at a time, so memory stays
+# ###     around chunk + nfft samples no matter how long the waveform is.
+# ###     mag is 10*log10(mean |FFT|^2 / sum(window)^2) + 30, a full scale
+# ###     tone on a bin reads the same as the single FFT in plot_IQ_FFT.
+import functools
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+CHUNK = 1 << 20                                             # Samples per processing block
+
+@functools.lru_cache(maxsize=16)
+def Window(window, nfft, beta=0.0):
+    """Cached read only window: 'hann' 'hamming' 'blackman' 'kaiser'(beta) 'rect'"""
+    if window == 'kaiser':
+        win = np.kaiser(nfft, beta)
+    elif window == 'hann':
+        win = np.hanning(nfft)
+    elif window == 'hamming':
+        win = np.hamming(nfft)
+    elif window == 'blackman':
+        win = np.blackman(nfft)
+    elif window == 'rect':
+        win = np.ones(nfft)
+    else:
+        raise ValueError(f"Window: unknown window '{window}'")
+    win.flags.writeable = False
+    return win
+
+@functools.lru_cache(maxsize=16)
+def FreqAxis(nfft, Fs):
+    """Cached read only fftshift'ed frequency axis"""
+    frq = np.fft.fftshift(np.fft.fftfreq(nfft, d=1 / Fs))
+    frq.flags.writeable = False
+    return frq
+
+def Welch(IData, QData, Fs, nfft=4096, overlap=0.5, window='hann', beta=8.6, chunk=CHUNK):
+    """Averaged power spectrum of IData + jQData, return (frq, mag dB)
+    nfft is reduced to the waveform length for short waveforms."""
+    samples = len(IData)
+    nfft    = int(min(nfft, samples))
+    step    = max(1, nfft - int(round(overlap * nfft)))     # Hop between segments
+    numSeg  = 1 + (samples - nfft) // step
+    segBlk  = max(1, chunk // step)                         # Segments per block
+    win     = Window(window, nfft, beta)
+    IQ      = np.empty(min(samples, (segBlk - 1) * step + nfft), dtype=np.complex128)
+
+    power = np.zeros(nfft)
+    for seg in range(0, numSeg, segBlk):
+        segEnd = min(seg + segBlk, numSeg)
+        start  = seg * step
+        stop   = (segEnd - 1) * step + nfft
+        blk    = IQ[:stop - start]
+        blk.real = IData[start:stop]
+        blk.imag = QData[start:stop]
+        segs = sliding_window_view(blk, nfft)[::step]       # (segments, nfft) strided view
+        spec = np.fft.fft(segs * win, axis=1)
+        spec = spec.real ** 2 + spec.imag ** 2
+        power += spec.sum(axis=0)
+
+    power /= numSeg * np.sum(win) ** 2
+    mag = 10 * np.log10(np.fft.fftshift(power) + 1e-30) + 30
+    return FreqAxis(nfft, Fs), mag
+
+if __name__ == "__main__":
+    t = np.arange(1 << 20) / 100e6
+    frqOut, magOut = Welch(np.cos(2 * np.pi * 1e6 * t), np.sin(2 * np.pi * 1e6 * t), 100e6, window='hann')
+    print(f"Welch: peak {magOut.max():.2f}dB at {frqOut[np.argmax(magOut)] / 1e6:.3f}MHz")
@@ -0,0 +1,94 @@
+# ### Purpose : Rohde & Schwarz waveform parameter sweep across a process pool
+# ###
+# ### Sweep('IQGen_2Tone', 'Gen1Tone_IQ', {'FC1': [100e6, 200e6], 'OverSamp': [10, 30]})
+# ###     Every grid point is generated in a worker process and written to its
+# ###     own *.wv, nothing is shared between jobs.
+import io
+import os
+import sys
+import re
+import json
+import time
+import hashlib
+import itertools
+import importlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+def SweepGrid(grid):
+    """Expand {'FC1':[..], 'OverSamp':[..]} into a list of parameter dicts"""
+    keys = list(grid)
+    return [dict(zip(keys, vals)) for vals in itertools.product(*(grid[k] for k in keys))]
+
+def SweepName(genFunc, params):
+    """*.wv filename, unique per grid point
+    Values are written in full (repr); the hash of all values keeps names
+    apart even where unsafe characters were replaced."""
+    parts = [genFunc]
+    for key, val in params.items():
+        parts.append(key + "-" + re.sub(r'[^\w.+-]+', '~', repr(val)).strip('~'))
+    parts.append(hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()[:8])
+    return "_".join(parts) + ".wv"
+
+def SweepJob(module, genFunc, params, path, png=0):
+    """Generate one grid point and write its *.wv.  Runs in a worker process."""
+    wave = importlib.import_module(module).IQGen()
+    for key, val in params.items():
+        if not hasattr(wave, key):
+            raise AttributeError(f"Sweep: {module}.IQGen has no attribute '{key}'")
+        setattr(wave, key, val)
+    WaveWrit = os.path.join(path, SweepName(genFunc, params))
+    wave.filename = WaveWrit[:-3] + ".env"                  # Only used if env is requested
+
+    log  = io.StringIO()
+    tick = time.perf_counter()
+    with contextlib.redirect_stdout(log):                   # Keep worker prints per job
+        wave.Generate(genFunc)
+        tGen = time.perf_counter() - tick
+        wave.createWv()
+        tWrite = time.perf_counter() - tick - tGen
+        if png:                                             # Headless time/freq snapshot
+            wave.PlotFile = WaveWrit[:-3] + ".png"
+            wave.plot_IQ_FFT()
+    tPlot = time.perf_counter() - tick - tGen - tWrite
+    return {'file': WaveWrit,
+            'params': params,
+            'samples': len(wave.IData),
+            'Fs': wave.Fs,
+            'bytes': os.path.getsize(WaveWrit),
+            'tGen': tGen,
+            'tWrite': tWrite,
+            'tPlot': tPlot,
+            'pid': os.getpid(),
+            'events': wave.Events,
+            'log': log.getvalue()}
+
+def Sweep(module, genFunc, grid, path='.', workers=None, manifest=True, png=0):
+    """Run genFunc of module.IQGen for every point of grid, return manifest dict
+    workers : process count, None for os.cpu_count(), 0 to run in this process
+    manifest: also write <genFunc>_manifest.json into path
+    png     : also save a time/frequency PNG next to every *.wv"""
+    os.makedirs(path, exist_ok=True)
+    points = SweepGrid(grid)
+    tick   = time.perf_counter()
+    if workers == 0:
+        jobs = [SweepJob(module, genFunc, params, path, png) for params in points]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(SweepJob, module, genFunc, params, path, png) for params in points]
+            jobs = [future.result() for future in futures]
+    result = {'module': module,
+              'genFunc': genFunc,
+              'grid': grid,
+              'workers': workers,
+              'tTotal': time.perf_counter() - tick,
+              'jobs': jobs}
+    print(f"Sweep: {len(jobs)} waveforms in {result['tTotal']:.3f}sec")
+    if manifest:
+        with open(os.path.join(path, f"{genFunc}_manifest.json"), 'w') as fot:
+            json.dump(result, fot, indent=1)
+    return result
+
+if __name__ == "__main__":
+    print(sys.version)
+    Sweep('IQGen_2Tone', 'Gen1Tone_IQ', {'FC1': [100e6, 200e6, 300e6, 400e6], 'NumPeriods': [12]})
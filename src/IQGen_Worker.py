@@ -0,0 +1,80 @@
+# ### Purpose : Background job runner for the GUI, results polled from the UI thread
+# ###
+# ### worker = Worker()
+# ### worker.submit('Plot', func, arg1, ..)    func(worker, arg1, ..) runs on the worker thread
+# ### for kind, name, data in worker.poll():   'progress' 'done' 'cancelled' 'error', never blocks
+# ### worker.cancel()                          Current job stops at its next worker.check()
+# ###
+# ### Tk is not thread safe, so jobs never touch widgets.  The GUI drains
+# ### poll() from GUI.after() and does all drawing on its own thread.
+import queue
+import threading
+
+class Cancelled(Exception):
+    """Raised inside a job by Worker.check() after Worker.cancel()"""
+
+class Worker:
+    def __init__(self):
+        self.jobs    = queue.Queue()
+        self.events  = queue.Queue()
+        self.stop    = threading.Event()                    # Cancel request for the running job
+        self.current = None                                 # Name of the running job
+        self.thread  = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, name, func, *args):
+        """Queue func(worker, *args) to run after earlier jobs"""
+        self.jobs.put((name, func, args))
+
+    def cancel(self):
+        """Cancel the running job and drop queued ones"""
+        while 1:
+            try:
+                name, _, _ = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self.events.put(('cancelled', name, None))
+        self.stop.set()
+
+    def check(self):
+        """Call from a job at safe points, raises Cancelled once cancel() was called"""
+        if self.stop.is_set():
+            raise Cancelled(self.current)
+
+    def progress(self, message):
+        """Report progress from a job, also a cancellation point"""
+        self.events.put(('progress', self.current, message))
+        self.check()
+
+    def poll(self):
+        """Yield (kind, name, data) events posted so far without blocking"""
+        while 1:
+            try:
+                yield self.events.get_nowait()
+            except queue.Empty:
+                return
+
+    def busy(self):
+        return self.current is not None or not self.jobs.empty()
+
+    def run(self):
+        while 1:
+            job = self.jobs.get()
+            if job is None:
+                return
+            name, func, args = job
+            self.current = name
+            self.stop.clear()
+            try:
+                self.events.put(('done', name, func(self, *args)))
+            except Cancelled:
+                self.events.put(('cancelled', name, None))
+            except Exception as err:                        # pylint: disable=W0703
+                self.events.put(('error', name, err))
+            finally:
+                self.current = None
+
+    def close(self):
+        self.cancel()
+        self.jobs.put(None)
+        self.thread.join()
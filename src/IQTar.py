@@ -0,0 +1,143 @@
+# Title     : R&S iq-tar read/write
+# Reference : src/Matlab/write_iqtar.m, RsIqTar.xsd fileFormatVersion 2
+# File      : <name>.iq.tar
+#    <name>.xml                      : Clock, Samples, Format, NumberOfChannels, DataFilename
+#    <name>.complex.<n>ch.float32    : Little endian float32, row = sample, per row every channel
+#                                      complex: I0ch0 Q0ch0 I0ch1 Q0ch1 ... I1ch0 Q1ch0 ...
+#                                      real   : x0ch0 x0ch1 ... x1ch0 ...
+import io
+import os
+import time
+import tarfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+import numpy as np
+
+CHUNK = 65536                                               # Samples converted per tar write
+
+class IQTarStream:
+    """Read only file object producing the float32 payload of iq block by block
+    tarfile.addfile() pulls from it, so the payload is never built in memory."""
+    def __init__(self, iq, chunk=CHUNK):
+        self.iq      = iq
+        self.chunk   = chunk
+        self.start   = 0
+        self.pending = memoryview(b'')
+        self.complex = np.iscomplexobj(iq)
+
+    def nextBlock(self):
+        blk = self.iq[self.start:self.start + self.chunk]
+        self.start += len(blk)
+        if self.complex:
+            data = np.empty(blk.shape + (2,), dtype='<f4')
+            data[..., 0] = blk.real
+            data[..., 1] = blk.imag
+        else:
+            data = np.ascontiguousarray(blk, dtype='<f4')
+        return memoryview(data).cast('B')
+
+    def read(self, size=-1):
+        """Return exactly size bytes unless the payload ends first"""
+        out = bytearray()
+        while size < 0 or len(out) < size:
+            if not len(self.pending):
+                if self.start >= len(self.iq):
+                    break
+                self.pending = self.nextBlock()
+            n = len(self.pending) if size < 0 else min(size - len(out), len(self.pending))
+            out += self.pending[:n]
+            self.pending = self.pending[n:]
+        return bytes(out)
+
+def IQTarXml(name, dataFile, samples, Fs, channels, Format, comment=''):
+    """*.xml member describing the payload"""
+    date = time.strftime("%Y-%m-%dT%H:%M:%S")
+    xml = '<?xml version="1.0" encoding="UTF-8"?>\n' +\
+          '<RS_IQ_TAR_FileFormat fileFormatVersion="2" xsi:noNamespaceSchemaLocation="http://www.rohde-schwarz.com/file/RsIqTar.xsd" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n' +\
+          f'  <Name>{escape(name)}</Name>\n' +\
+          f'  <Comment>{escape(comment)}</Comment>\n' +\
+          f'  <DateTime>{date}</DateTime>\n' +\
+          f'  <Samples>{samples:d}</Samples>\n' +\
+          f'  <Clock unit="Hz">{Fs:f}</Clock>\n' +\
+          f'  <Format>{Format}</Format>\n' +\
+          '  <DataType>float32</DataType>\n' +\
+          '  <ScalingFactor unit="V">1</ScalingFactor>\n'
+    if channels > 1:
+        xml += f'  <NumberOfChannels>{channels:d}</NumberOfChannels>\n'
+    xml += f'  <DataFilename>{escape(dataFile)}</DataFilename>\n' +\
+           '</RS_IQ_TAR_FileFormat>\n'
+    return xml.encode('utf-8')
+
+def IQTarBase(filename):
+    """Member base name: file name without the .iq.tar (or .tar) suffix only"""
+    base = os.path.basename(filename)
+    for suffix in ('.iq.tar', '.tar'):
+        if base.endswith(suffix):
+            return base[:-len(suffix)]
+    return base
+
+def IQTarWrite(filename, iq, Fs, comment='', chunk=CHUNK):
+    """Save iq to an iq-tar file
+    iq: complex or real vector, or samples x channels matrix (e.g. MIMO)"""
+    iq = np.asarray(iq)
+    if iq.ndim == 1:
+        iq = iq[:, np.newaxis]
+    if not filename.endswith('.tar'):
+        filename += '.iq.tar'
+    samples, channels = iq.shape
+    Format   = 'complex' if np.iscomplexobj(iq) else 'real'
+    base     = IQTarBase(filename)
+    dataFile = f"{base}.{Format}.{channels}ch.float32"
+    xml      = IQTarXml('IQTar.py', dataFile, samples, Fs, channels, Format, comment)
+    mtime    = time.time()
+
+    with tarfile.open(filename, 'w', format=tarfile.USTAR_FORMAT) as tar:
+        info = tarfile.TarInfo(f"{base}.xml")
+        info.size  = len(xml)
+        info.mtime = mtime
+        tar.addfile(info, io.BytesIO(xml))
+        info = tarfile.TarInfo(dataFile)
+        info.size  = samples * channels * (8 if Format == 'complex' else 4)
+        info.mtime = mtime
+        tar.addfile(info, IQTarStream(iq, chunk))
+    print(f"IQTar: {filename} {samples} Samples {channels}ch @ {Fs / 1e6:.3f}MHz")
+    return filename
+
+def IQTarRead(filename, mmap=1):
+    """Load iq-tar file, return (iq, Fs, meta)
+    iq is complex64 (or float32) samples, or samples x channels for multi channel.
+    Uncompressed archives are memory mapped when mmap is set, nothing is copied."""
+    try:
+        tar = tarfile.open(filename, 'r:')                 # Uncompressed, payload can be mapped
+        compressed = 0
+    except tarfile.ReadError:
+        tar = tarfile.open(filename, 'r:*')
+        compressed = 1
+    with tar:
+        xmlInfo = [m for m in tar.getmembers() if m.name.endswith('.xml')][0]
+        root = ET.fromstring(tar.extractfile(xmlInfo).read())
+        meta = {child.tag: (child.text or '').strip() for child in root}
+        channels = int(meta.get('NumberOfChannels', 1))
+        samples  = int(meta['Samples'])
+        Format   = meta.get('Format', 'complex')
+        dataInfo = tar.getmember(meta['DataFilename'])
+        shape    = (samples, channels, 2) if Format == 'complex' else (samples, channels)
+        if mmap and not compressed:
+            data = np.memmap(filename, dtype='<f4', mode='r', offset=dataInfo.offset_data, shape=shape)
+        else:
+            data = np.frombuffer(tar.extractfile(dataInfo).read(), dtype='<f4').reshape(shape)
+
+    if Format == 'complex':
+        data = data.view('<c8')[..., 0]                     # Zero copy I/Q pairs -> complex64
+    if channels == 1:
+        data = data[:, 0]
+    scale = float(meta.get('ScalingFactor', 1))
+    if scale != 1:
+        data = data * scale
+    return data, float(meta['Clock']), meta
+
+if __name__ == "__main__":
+    t = np.arange(2000)
+    IQTarWrite('example.iq.tar', np.exp(2j * np.pi * t / 40), 1e6)
+    iqRead, FsRead, _ = IQTarRead('example.iq.tar')
+    print(f"IQTar: {len(iqRead)} Samples @ {FsRead / 1e6:.3f}MHz")
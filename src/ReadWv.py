@@ -0,0 +1,146 @@
+# Title     : R&S Waveform read back
+# Reference : AppNote 1GP62 Sec4 pg 15
+# Input file:
+#    *.wv : {TYPE: SMU-WV,0}{CLOCK:..}{LEVEL OFFS:rms,peak}{SAMPLES:n}...{WAVEFORM-4n+1: #<I0Q0...>}
+#           IQData is a 2byte little endian integer, Real = IQData / 32767
+#    *.wv : {TYPE: SMU-MWV,0}...{MWV_SEGMENT_START:..}{MWV_SEGMENT_LENGTH:..} multi segment
+#    *.iqw: Headerless interleaved little endian float32 I,Q
+#
+# The IQ body is never read into memory, it is exposed as a read only np.memmap.
+import os
+import re
+import glob
+import numpy as np
+
+HEADCHUNK = 4096                                            # Header bytes read per step
+MAXHEAD   = 1 << 20                                         # Give up if no {WAVEFORM tag by here
+
+TagRegex  = re.compile(rb'\{([^:{}]+):\s*([^{}]*)\}')
+WaveRegex = re.compile(rb'\{WAVEFORM-(\d+):\s*#')
+
+def WvHeaderRead(fileIn):
+    """Parse *.wv header tags without touching the IQ body
+    Return dict of tag:value strings plus 'offset' of the first IQ byte"""
+    head = b''
+    with open(fileIn, 'rb') as fin:
+        while 1:
+            block = fin.read(HEADCHUNK)
+            head += block
+            wave = WaveRegex.search(head)
+            if wave or not block or len(head) > MAXHEAD:
+                break
+    if not wave:
+        raise ValueError(f"WvHeaderRead: {fileIn} has no {{WAVEFORM-n: #}} tag")
+    tags = {}
+    for tag in TagRegex.finditer(head, 0, wave.start()):
+        tags[tag.group(1).decode(errors='replace')] = tag.group(2).decode(errors='replace')
+    tags['WAVEFORM'] = wave.group(1).decode()
+    tags['offset'] = wave.end()
+    return tags
+
+class WvFile:
+    """Read back *.wv / *.iqw waveform
+    IQmap   : Nx2 np.memmap of the raw body, int16 for *.wv, float32 for *.iqw
+    IData   : Raw I view of IQmap, QData likewise
+    IQ()    : Scaled complex64 copy of a sample range
+    iterIQ(): Scaled complex64 blocks over the whole file
+    segments: Segment table of a multi segment file, [] otherwise"""
+    def __init__(self, fileIn, headerOnly=0):
+        self.filename = fileIn
+        self.IQmap    = None
+        if fileIn.endswith('.iqw'):
+            self.tags    = {}
+            self.offset  = 0
+            self.dtype   = np.dtype('<f4')
+            self.scale   = 1.0
+            self.samples = os.path.getsize(fileIn) // 8
+            self.Fs      = 0
+            self.comment = ''
+            self.RMS     = None
+            self.Peak    = None
+        else:
+            self.tags    = WvHeaderRead(fileIn)
+            self.offset  = self.tags['offset']
+            self.dtype   = np.dtype('<i2')
+            self.scale   = 1 / 32767
+            self.samples = (int(self.tags['WAVEFORM']) - 1) // 4
+            self.Fs      = float(self.tags.get('CLOCK', 0))
+            self.comment = self.tags.get('COMMENT', '')
+            self.RMS, self.Peak = [float(x) for x in self.tags.get('LEVEL OFFS', 'nan,nan').split(',')[:2]]
+        self.segments = WvSegments(self.tags)
+        if not headerOnly:
+            self.IQmap = np.memmap(fileIn, dtype=self.dtype, mode='r', offset=self.offset, shape=(self.samples, 2))
+
+    def __str__(self):
+        OutStr = 'File        : %s\n' % self.filename +\
+                 'Samples     : %d\n' % self.samples +\
+                 'Clock       : %.3f MHz\n' % (self.Fs / 1e6) +\
+                 'Comment     : %s\n' % self.comment
+        return OutStr
+
+    def __len__(self):
+        return self.samples
+
+    @property
+    def IData(self):
+        return self.IQmap[:, 0]
+
+    @property
+    def QData(self):
+        return self.IQmap[:, 1]
+
+    def IQ(self, start=0, stop=None):
+        """Scaled complex64 samples [start:stop]"""
+        raw = self.IQmap[start:stop]
+        out = np.empty(len(raw), dtype=np.complex64)
+        np.multiply(raw[:, 0], self.scale, out=out.real, casting='unsafe')
+        np.multiply(raw[:, 1], self.scale, out=out.imag, casting='unsafe')
+        return out
+
+    def iterIQ(self, chunk=65536):
+        """Yield scaled complex64 blocks of chunk samples"""
+        for start in range(0, self.samples, chunk):
+            yield self.IQ(start, start + chunk)
+
+    def Segment(self, idx):
+        """Scaled complex64 samples of segment idx"""
+        seg = self.segments[idx]
+        return self.IQ(seg['start'], seg['start'] + seg['samples'])
+
+def WvSegments(tags):
+    """Segment table from MWV_SEGMENT_* tags, [] for single segment files"""
+    if 'MWV_SEGMENT_START' not in tags:
+        return []
+    starts  = [int(x) for x in tags['MWV_SEGMENT_START'].split(',')]
+    lengths = [int(x) for x in tags['MWV_SEGMENT_LENGTH'].split(',')]
+    clocks  = [float(x) for x in tags.get('MWV_SEGMENT_CLOCK', '').split(',') if x.strip()] or [0.0] * len(starts)
+    levels  = [float(x) for x in tags.get('MWV_SEGMENT_LEVEL_OFFS', '').split(',') if x.strip()]
+    names   = [x.strip().strip('"') for x in tags.get('MWV_SEGMENT_FILES', '').split(',')]
+    return [{'start': start,
+             'samples': length,
+             'Fs': clocks[idx] if idx < len(clocks) else 0.0,
+             'RMS': levels[2 * idx] if 2 * idx + 1 < len(levels) else None,
+             'Peak': levels[2 * idx + 1] if 2 * idx + 1 < len(levels) else None,
+             'name': names[idx] if idx < len(names) else ''}
+            for idx, (start, length) in enumerate(zip(starts, lengths))]
+
+def WvCatalog(path, pattern='*.wv'):
+    """Header only index of every waveform matching pattern under path"""
+    catalog = []
+    for fileIn in sorted(glob.glob(os.path.join(path, '**', pattern), recursive=True)):
+        try:
+            wave = WvFile(fileIn, headerOnly=1)
+        except (ValueError, OSError) as err:
+            print(f"WvCatalog: {fileIn} {err}")
+            continue
+        catalog.append({'file': fileIn,
+                        'samples': wave.samples,
+                        'Fs': wave.Fs,
+                        'RMS': wave.RMS,
+                        'Peak': wave.Peak,
+                        'comment': wave.comment})
+    return catalog
+
+if __name__ == "__main__":
+    for item in WvCatalog('.', '*.wv') + WvCatalog('.', '*.iqw'):
+        print(item)
@@ -0,0 +1,172 @@
+'''Purpose: *.wv file creation'''
+import io
+import os
+import sys
+import struct
+import zipfile
+import tempfile
+import unittest
+import tracemalloc
+from unittest import mock
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import CreateWv3                                            # noqa: E402 pylint: disable=E0401,C0413
+import ReadWv                                               # noqa: E402 pylint: disable=E0401,C0413
+
+def LegacyWv(IQArry, comment, clock, date):
+    """Original CreateWv3 header + data loop"""
+    out = b''
+    samples = len(IQArry)
+    SUM = 0
+    MAX = 0
+    for IQ in IQArry:
+        SQR = pow(IQ[0], 2) + pow(IQ[1], 2)
+        SUM += SQR
+        MAX = max(MAX, SQR)
+    RMS = 10 * np.log10(samples / SUM)
+    MAX = 10 * np.log10(1 / MAX)
+    out += "{TYPE: SMU-WV,0}".encode()
+    out += f"{{COMMENT: {comment}}}".encode()
+    out += f"{{DATE:{date}}}".encode()
+    out += f"{{CLOCK:{clock}}}".encode()
+    out += f"{{CLOCK MARKER: {clock}}}".encode()
+    out += f"{{LEVEL OFFS:{RMS:.4f},{MAX:.4f}}}".encode()
+    out += f"{{SAMPLES:{samples:d}}}".encode()
+    out += "{MARKER LIST 1: 0:1;20:0}".encode()
+    out += "{MARKER LIST 2: 0:0}".encode()
+    out += "{MARKER LIST 3: 0:0}".encode()
+    out += "{MARKER LIST 4: 0:0}".encode()
+    out += f"{{WAVEFORM-{4 * samples + 1:d}: #".encode()
+    for IQ in IQArry:
+        out += struct.pack('<h', int(round(IQ[0] * 32767)))
+        out += struct.pack('<h', int(round(IQ[1] * 32767)))
+    out += "}".encode()
+    return out
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+        t = np.arange(1000)
+        self.IQArry = 0.8 * np.stack((np.cos(0.05 * t), np.sin(0.05 * t)), axis=1)
+        self.IQArry[7] = [0.5 / 32767, -0.5 / 32767]        # Round half even
+        self.IQArry[9] = [1.0, -1.0]
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+    def envWrite(self, IQArry, clock='30000000.000000'):
+        fileIn = os.path.join(self.tmp.name, 'CreateWv.env')
+        with open(fileIn, 'w') as fot:
+            fot.write("# Waveform created by Rohde & Schwarz\n")
+            fot.write("#Test Comment\n")
+            fot.write(f"{clock}\n")
+            for IQ in IQArry:
+                fot.write(f"{float(IQ[0])!r},{float(IQ[1])!r}\n")
+        return fileIn
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_CreateWv_Identical(self):
+        fileIn = self.envWrite(self.IQArry)
+        with mock.patch('time.strftime', return_value='2021-12-10;11:05:35'):
+            CreateWv3.CreateWv(fileIn)
+        with open(fileIn.replace('.env', '.wv'), 'rb') as fin:
+            wv = fin.read()
+        self.assertEqual(wv, LegacyWv(self.IQArry, 'Test Comment', '30000000.000000', '2021-12-10;11:05:35'))
+
+    def test_CreateWv_SmallChunk(self):
+        fileIn = self.envWrite(self.IQArry)
+        with mock.patch('time.strftime', return_value='2021-12-10;11:05:35'):
+            CreateWv3.CreateWv(fileIn, chunk=100)           # Many partial line blocks
+        with open(fileIn.replace('.env', '.wv'), 'rb') as fin:
+            wv = fin.read()
+        self.assertEqual(wv, LegacyWv(self.IQArry, 'Test Comment', '30000000.000000', '2021-12-10;11:05:35'))
+
+    def test_EnvRead_BadRow(self):
+        with self.assertRaises(ValueError):
+            list(CreateWv3.EnvRead(io.StringIO("0.1,0.2\n0.3,x\n")))
+
+    def test_WriteData_Chunks(self):
+        ref = io.BytesIO()
+        blk = io.BytesIO()
+        CreateWv3.WvWriteData(ref, self.IQArry[:, 0], self.IQArry[:, 1])
+        CreateWv3.WvWriteData(blk, self.IQArry[:, 0], self.IQArry[:, 1], chunk=7)
+        self.assertEqual(ref.getvalue(), blk.getvalue())
+
+    def test_WriteData_Saturate(self):
+        fot = io.BytesIO()
+        numSat = CreateWv3.WvWriteData(fot, np.array([1.5, 0.1, -2.0]), np.array([0.0, 0.1, 0.0]))
+        self.assertEqual(numSat, 2)
+        self.assertEqual(np.frombuffer(fot.getvalue(), '<i2').tolist(), [32767, 0, 3277, 3277, -32768, 0])
+
+    def test_Common_DirectExport(self):
+        from IQGen_Common import Common                     # pylint: disable=E0401,C0415
+        wave = Common()
+        wave.Fs       = 30e6
+        wave.IData    = self.IQArry[:, 0]
+        wave.QData    = self.IQArry[:, 1]
+        wave.comment  = 'Test Comment'
+        wave.filename = os.path.join(self.tmp.name, 'Direct.env')
+        with mock.patch('time.strftime', return_value='2021-12-10;11:05:35'):
+            wave.createWv()
+        self.assertFalse(os.path.exists(wave.filename))     # No *.env round trip
+        with open(os.path.join(self.tmp.name, 'Direct.wv'), 'rb') as fin:
+            wv = fin.read()
+        self.assertEqual(wv, LegacyWv(self.IQArry, 'Test Comment', '30000000.000000', '2021-12-10;11:05:35'))
+
+    def test_ReadWv_RoundTrip(self):
+        WaveWrit = os.path.join(self.tmp.name, 'Read.wv')
+        CreateWv3.WvFileWrite(WaveWrit, self.IQArry[:, 0], self.IQArry[:, 1], '30000000.000000', 'Rd')
+        wave = ReadWv.WvFile(WaveWrit)
+        self.assertIsInstance(wave.IQmap, np.memmap)
+        self.assertEqual((len(wave), wave.Fs, wave.comment), (1000, 30e6, 'Rd'))
+        IQ = np.concatenate(list(wave.iterIQ(chunk=300)))
+        np.testing.assert_allclose(IQ.real, self.IQArry[:, 0], atol=1 / 32767)
+        np.testing.assert_allclose(IQ.imag, self.IQArry[:, 1], atol=1 / 32767)
+        self.assertEqual(wave.IData[9], 32767)
+
+    def test_MultiWrite(self):
+        WaveWrit = os.path.join(self.tmp.name, 'Multi.wv')
+        waves = [mock.Mock(IData=self.IQArry[:600, 0], QData=self.IQArry[:600, 1], Fs=30e6),
+                 mock.Mock(IData=0.5 * self.IQArry[600:, 0], QData=0.5 * self.IQArry[600:, 1], Fs=60e6)]
+        with mock.patch('sys.stdout', new=io.StringIO()):
+            CreateWv3.WvMultiWrite(WaveWrit, waves, ['A.wv', 'B.wv'], 'Multi')
+        wave = ReadWv.WvFile(WaveWrit)
+        self.assertEqual((len(wave), wave.Fs, wave.tags['TYPE']), (1000, 60e6, 'SMU-MWV,0'))
+        self.assertEqual([(seg['start'], seg['samples'], seg['Fs'], seg['name']) for seg in wave.segments],
+                         [(0, 600, 30e6, 'A.wv'), (600, 400, 60e6, 'B.wv')])
+        for seg, src in zip(wave.segments, waves):
+            self.assertAlmostEqual(seg['RMS'], CreateWv3.WvStats(src.IData, src.QData)[0], places=4)
+        np.testing.assert_allclose(wave.Segment(1).real, 0.5 * self.IQArry[600:, 0], atol=1 / 32767)
+
+    def test_MultiWrite_NoCopy(self):
+        WaveWrit = os.path.join(self.tmp.name, 'Multi.wv')
+        IQ = np.exp(1j * np.linspace(0, 100, 1 << 20)).astype(np.complex64)      # 8MB complex64 store
+        waves = [mock.Mock(IData=IQ.real, QData=IQ.imag, Fs=30e6) for _ in range(2)]
+        tracemalloc.start()
+        with mock.patch('sys.stdout', new=io.StringIO()):
+            CreateWv3.WvMultiWrite(WaveWrit, waves, comment='NoCopy')
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peak, 4e6)                          # float64 copies of both segments: 32MB
+        wave = ReadWv.WvFile(WaveWrit)
+        np.testing.assert_allclose(wave.Segment(1), IQ, atol=1 / 32767)
+
+    def test_ReadWv_Sample(self):
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+        with zipfile.ZipFile(os.path.join(src, 'CreateWv.zip')) as zin:
+            zin.extract('CreateWv.wv', self.tmp.name)
+        catalog = ReadWv.WvCatalog(self.tmp.name)
+        self.assertEqual(len(catalog), 1)
+        self.assertEqual((catalog[0]['samples'], catalog[0]['Fs'], catalog[0]['RMS']), (360, 30e6, 4.067))
+        wave = ReadWv.WvFile(os.path.join(src, 'SampleWv', 'CW_10tones_32MHz_100usec.iq.tar.iqw'))
+        self.assertEqual(len(wave), 3200)
+        self.assertEqual(wave.IQ(0, 1)[0], np.complex64(wave.IQmap[0, 0] + 1j * wave.IQmap[0, 1]))
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
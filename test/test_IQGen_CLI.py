@@ -0,0 +1,57 @@
+'''Purpose: Headless command line generation'''
+import os
+import sys
+import tempfile
+import unittest
+import importlib
+import subprocess
+import contextlib
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+import IQGen_CLI                                            # noqa: E402 pylint: disable=E0401,C0413
+from ReadWv import WvFile                                   # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Generate(self):
+        out = os.path.join(self.tmp.name, 'Tone.1.wv')
+        with contextlib.redirect_stdout(None):
+            IQGen_CLI.main(['IQGen_2Tone', 'Gen1Tone_IQ', 'FC1=2e6', 'NumPeriods=4', '-o', out, '--iqtar'])
+        wave = WvFile(out)
+        self.assertEqual((len(wave), wave.Fs), (120, 60e6))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'Tone.1.iq.tar')))
+
+    def test_GeneratorArg(self):
+        out = os.path.join(self.tmp.name, 'Chirp.wv')
+        with contextlib.redirect_stdout(None):
+            IQGen_CLI.main(['IQGen_Mod', 'Gen_FMChirp', 'RampTime=5e-6', '-o', out])
+        self.assertEqual(len(WvFile(out)), 20000)
+
+    def test_AllGenerators(self):
+        for module in IQGen_CLI.MODULES:
+            for genFunc in IQGen_CLI.Generators(importlib.import_module(module).IQGen()):
+                with self.subTest(module=module, genFunc=genFunc):
+                    out = os.path.join(self.tmp.name, genFunc + '.wv')
+                    with contextlib.redirect_stdout(None):
+                        self.assertEqual(IQGen_CLI.main([module, genFunc, '-o', out]), 0)
+                    self.assertGreater(len(WvFile(out)), 0)
+
+    def test_NoPyplot(self):
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+        code = "import sys, IQGen_CLI, IQGen_2Tone, IQGen_Mod; print('matplotlib' in sys.modules)"
+        out = subprocess.run([sys.executable, '-c', code], cwd=src, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), 'False')
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
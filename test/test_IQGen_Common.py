@@ -0,0 +1,231 @@
+'''Purpose: Common waveform pipeline stages'''
+import os
+import sys
+import types
+import tempfile
+import unittest
+import contextlib
+import tracemalloc
+from unittest import mock
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Common import Common                             # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_2Tone import IQGen                               # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_Spectrum import Welch                            # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_Cache import WvCache, SourceFiles, UserCacheDir  # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.wave = Common()
+        self.wave.IData = np.array([0.5, 1.5, -2.0, 0.25])
+        self.wave.QData = np.array([0.0, -0.5, 0.5, 1.25])
+
+    def tearDown(self):                             # Run after each test
+        pass
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_PostProcess_Clip(self):
+        IData = self.wave.IData
+        self.wave.PostProcess()
+        self.assertTrue(np.shares_memory(self.wave.IData, IData))   # In place
+        self.assertEqual(self.wave.IData.tolist(), [0.5, 1.0, -1.0, 0.25])
+        self.assertEqual(self.wave.QData.tolist(), [0.0, -0.5, 0.5, 1.0])
+
+    def test_PostProcess_NormPeak(self):
+        self.wave.PostProcess('peak')
+        mag = np.abs(self.wave.IData + 1j * self.wave.QData)
+        self.assertAlmostEqual(mag.max(), 1.0)
+
+    def test_PostProcess_NormRMS(self):
+        self.wave.PostNorm  = 'rms'
+        self.wave.PostLevel = 0.5
+        self.wave.PostClip  = 0
+        self.wave.PostProcess('peak')                       # Object setting wins
+        mag = np.abs(self.wave.IData + 1j * self.wave.QData)
+        self.assertAlmostEqual(np.sqrt(np.mean(mag ** 2)), 0.5)
+
+    def test_PostProcess_Quant(self):
+        self.wave.PostQuant = 1
+        self.wave.PostProcess()
+        self.assertEqual(self.wave.IQi16.dtype, np.dtype('<i2'))
+        self.assertEqual(self.wave.IQi16[:, 0].tolist(), [16384, 32767, -32767, 8192])
+        self.assertEqual(self.wave.IData[0], 16384 / 32767)
+
+    def test_IQStore(self):
+        wave = IQGen()
+        with contextlib.redirect_stdout(None):
+            wave.Gen2Tone()
+        self.assertEqual(wave.IQ.dtype, np.complex128)      # float64 by default
+        wave.IQType = 'complex64'                           # Opt in to half the memory
+        with contextlib.redirect_stdout(None):
+            wave.Gen2Tone()
+        self.assertEqual(wave.IQ.dtype, np.complex64)
+        self.assertEqual(wave.IQ.nbytes, 8 * len(wave.IData))
+        self.assertTrue(np.shares_memory(wave.IData, wave.IQ))    # Views, no copies
+        IQ = wave.IQ
+        wave.QData = np.zeros(len(IQ))                      # Same length, written in place
+        self.assertIs(wave.IQ, IQ)
+        self.assertFalse(IQ.imag.any())
+        wave.IData = [0.5, 0.25]                            # New length, reallocated
+        self.assertEqual(wave.IQ.tolist(), [0.5, 0.25])
+
+    def test_IQStore_Length(self):
+        self.wave.QData = [1, 2, 3]                         # Q first, then I, new length
+        self.wave.IData = [4, 5, 6]
+        self.assertEqual(self.wave.IQ.tolist(), [4 + 1j, 5 + 2j, 6 + 3j])
+        self.wave.QData = [1, 2]
+        with self.assertRaises(ValueError):                 # Would silently zero Q
+            self.wave.IData = [4, 5, 6]
+        self.assertEqual(self.wave.QData.tolist(), [1, 2])
+        self.wave.QData = [3, 4, 5, 6]                      # Same half again, any length
+        self.wave.QData = [3, 4]
+        self.wave.IData = [7, 8]
+        self.wave.IQType = 'complex64'                      # Type change keeps both halves
+        self.wave.IData = [5, 6]
+        self.assertEqual((self.wave.IQ.dtype, self.wave.IQ.tolist()), (np.complex64, [5 + 3j, 6 + 4j]))
+        self.wave.IQ = np.zeros(5, dtype=np.complex64)     # Whole IQ replaced, nothing pending
+        self.wave.IData = [1, 2]
+        self.assertEqual(self.wave.IQ.tolist(), [1, 2])
+
+    def test_Stage_Events(self):
+        wave = IQGen()
+        wave.TraceMem = 1
+        seen = []
+        wave.OnEvent = seen.append
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(None):
+            wave.filename = os.path.join(tmp, 'Stage.env')
+            wave.Generate('Gen2Tone')
+            wave.createWv()
+            size = os.path.getsize(os.path.join(tmp, 'Stage.wv'))
+        self.assertEqual([event['stage'] for event in wave.Events], ['postprocess', 'generate', 'write'])
+        self.assertEqual(wave.Events, seen)
+        self.assertEqual(wave.Events[1]['name'], 'Gen2Tone')
+        self.assertEqual(wave.Events[2]['bytes'], size)
+        self.assertEqual(wave.Events[2]['samples'], len(wave.IQ))
+        self.assertGreaterEqual(wave.Events[1]['peakMB'], wave.Events[0]['peakMB'])
+        self.assertGreater(wave.Events[1]['peakMB'], 0)
+
+    def test_Stage_NoResetPeak(self):
+        wave = IQGen()
+        wave.TraceMem = 1
+        py38 = types.SimpleNamespace(**{name: getattr(tracemalloc, name) for name in
+                                        ['start', 'stop', 'is_tracing', 'get_traced_memory']})
+        with mock.patch('IQGen_Common.tracemalloc', py38), contextlib.redirect_stdout(None):
+            wave.Generate('Gen2Tone')                       # No reset_peak, as on Python 3.8
+        self.assertEqual([event['stage'] for event in wave.Events], ['postprocess', 'generate'])
+        self.assertGreater(wave.Events[1]['peakMB'], 0)
+
+    def test_Gen2Tone_Peak(self):
+        wave = IQGen()
+        wave.Gen2Tone()
+        mag = np.abs(wave.IData + 1j * wave.QData)
+        self.assertAlmostEqual(mag.max(), 1.0)
+
+    def test_Welch_SingleFFT(self):
+        wave = IQGen()
+        wave.Gen2Tone()
+        frq, mag = Welch(wave.IData, wave.QData, wave.Fs, nfft=len(wave.IData), window='rect')
+        IQ = np.fft.fftshift(np.fft.fft(wave.IData + 1j * wave.QData)) / len(wave.IData)
+        tones = mag > -100                                  # Skip numerical noise floor
+        self.assertEqual(np.count_nonzero(tones), 2)
+        np.testing.assert_allclose(mag[tones], 20 * np.log10(np.abs(IQ[tones])) + 30, atol=1e-9)
+        np.testing.assert_allclose(frq, np.fft.fftshift(np.fft.fftfreq(len(IQ), 1 / wave.Fs)))
+
+    def test_Welch_Chunked(self):
+        rng = np.random.default_rng(1)
+        IData, QData = rng.standard_normal((2, 50000))
+        _, mag = Welch(IData, QData, 1e6, nfft=512, overlap=0.5, window='hann')
+        _, magBlk = Welch(IData, QData, 1e6, nfft=512, overlap=0.5, window='hann', chunk=1000)
+        np.testing.assert_allclose(mag, magBlk, atol=1e-9)
+
+    def test_Welch_Leakage(self):
+        self.wave.Fs = 1e6
+        t = np.arange(8192) / self.wave.Fs
+        self.wave.IQ = np.exp(2j * np.pi * 1e6 * 10.5 / 256 * t)    # Tone between bins
+        self.wave.fBeta = 0                                 # Generator setting, not the window
+        leak = {}
+        for window in ['hann', 'kaiser', 'rect']:
+            self.wave.FFTWindow = window
+            frq, mag = self.wave.Spectrum(256)
+            far = np.abs(frq - frq[np.argmax(mag)]) > 5 * 1e6 / 256    # 5 bins and more away
+            leak[window] = mag.max() - mag[far].max()
+        self.assertEqual(Common().FFTWindow, 'hann')
+        self.assertGreater(leak['hann'], 50)
+        self.assertGreater(leak['kaiser'], 70)              # FFTBeta 8.6
+        self.assertLess(leak['rect'], 30)
+
+    def test_Cache_HitMiss(self):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(None):
+            Cache = WvCache(tmp)
+            wave = IQGen()
+            path = Cache.WvPath(wave, 'Gen2Tone')
+            again = IQGen()
+            self.assertEqual(Cache.WvPath(again, 'Gen2Tone'), path)
+            np.testing.assert_array_equal(again.IData, wave.IData)
+            self.assertEqual(again.Fs, wave.Fs)
+            other = IQGen()
+            other.FC2 = 5e6                                 # New key
+            Cache.Generate(other, 'Gen2Tone')
+            self.assertEqual(Cache.Stats()['hits'], 1)
+            self.assertEqual(Cache.Stats()['misses'], 2)
+            self.assertEqual(WvCache(tmp).Stats()['entries'], 2)   # Index persisted
+
+    def test_Cache_Quant(self):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(None):
+            Cache = WvCache(tmp)
+            wave = IQGen()
+            wave.PostQuant = 1
+            Cache.Generate(wave, 'Gen2Tone')
+            again = IQGen()
+            again.PostQuant = 1
+            again.IQi16 = np.zeros((3, 2), dtype='<i2')     # Left over from an earlier waveform
+            Cache.Generate(again, 'Gen2Tone')
+            self.assertEqual(Cache.Stats()['hits'], 1)
+            np.testing.assert_array_equal(again.IQi16, wave.IQi16)
+            plain = IQGen()
+            plain.IQi16 = again.IQi16
+            Cache.Generate(plain, 'Gen2Tone')               # PostQuant is part of the key
+            self.assertEqual(Cache.Stats()['misses'], 2)
+            Cache.Generate(plain, 'Gen2Tone')
+            self.assertIsNone(plain.IQi16)
+
+    def test_Cache_WvPathError(self):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(None):
+            Cache = WvCache(tmp)
+            wave = IQGen()
+            wave.filename = 'Mine.env'
+            with mock.patch.object(wave, 'createWv', side_effect=OSError('disk full')):
+                with self.assertRaises(OSError):
+                    Cache.WvPath(wave, 'Gen2Tone')
+            self.assertEqual(wave.filename, 'Mine.env')
+
+    def test_Cache_Evict(self):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(None):
+            Cache = WvCache(tmp, maxBytes=1)
+            first = Cache.Generate(IQGen(), 'Gen2Tone')
+            wave = IQGen()
+            wave.FC1 = 2e6
+            second = Cache.Generate(wave, 'Gen2Tone')
+            self.assertEqual(list(Cache.index), [second])   # Oldest dropped
+            self.assertFalse(os.path.exists(os.path.join(tmp, first + '.npz')))
+
+    def test_Cache_Sources(self):
+        names = {os.path.basename(fileIn) for fileIn in SourceFiles('IQGen_Mod')}
+        for name in ['IQGen_Mod.py', 'IQGen_Common.py', 'IQGen_NCO.py', 'IQGen_Resample.py', 'CreateWv3.py']:
+            self.assertIn(name, names)
+        self.assertIn('IQGen_Plan.py', {os.path.basename(fileIn) for fileIn in SourceFiles('IQGen_2Tone')})
+
+    def test_Cache_UserDir(self):
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.join('tmp', 'xdg')}):
+            self.assertEqual(UserCacheDir(), os.path.join('tmp', 'xdg', 'IQGen'))
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '', 'LOCALAPPDATA': ''}):
+            self.assertEqual(UserCacheDir('X'), os.path.join(os.path.expanduser('~'), '.cache', 'X'))
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,65 @@
+'''Purpose: IQGen_Mod generators match the per sample reference'''
+import os
+import sys
+import unittest
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Mod import IQGen                                 # noqa: E402 pylint: disable=E0401,C0413
+
+def LegacyFMChirp(FC1, FC2, Fs, RampTime):
+    """Original per sample Gen_FMChirp loop"""
+    time = np.arange(0, RampTime, 1 / Fs)
+    K = ((FC2 - FC1) / RampTime)
+    IData = [0.00] * time.size
+    QData = [0.00] * time.size
+    I_Dn  = [0.00] * time.size
+    Q_Dn  = [0.00] * time.size
+    for i, t in enumerate(time):
+        IData[i] = np.cos(2.0 * np.pi * (FC1 * t + K * t * t / 2))
+        QData[i] = np.sin(2.0 * np.pi * (FC1 * t + K * t * t / 2))
+        I_Dn[i]  = np.cos(2.0 * np.pi * (FC2 * t - K * t * t / 2))
+        Q_Dn[i]  = np.sin(2.0 * np.pi * (FC2 * t - K * t * t / 2))
+    return np.array(IData + I_Dn), np.array(QData + Q_Dn)
+
+def LegacyFM(FC1, FMod, Fs, NumPeriods):
+    """Original per sample Gen_FM loop"""
+    time = np.arange(0, NumPeriods / FC1, 1 / Fs)
+    mod_arry = np.sin(2.0 * np.pi * FMod * time)
+    IData = np.zeros_like(mod_arry)
+    QData = np.zeros_like(mod_arry)
+    for i, t in enumerate(time):
+        IData[i] = np.cos(2.0 * np.pi * FC1 * t + 3 * mod_arry[i])
+        QData[i] = np.sin(2.0 * np.pi * FC1 * t + 3 * mod_arry[i])
+    return IData, QData
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.wave = IQGen()
+
+    def tearDown(self):                             # Run after each test
+        pass
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Gen_FMChirp(self):
+        self.wave.Gen_FMChirp(RampTime=5e-6)
+        IData, QData = LegacyFMChirp(self.wave.FC1, self.wave.FC2, self.wave.Fs, 5e-6)
+        self.assertIsInstance(self.wave.IData, np.ndarray)
+        # NCO phase vs legacy float phase, both ~1e-12 off at 1262 cycles
+        np.testing.assert_allclose(self.wave.IData, IData, rtol=0, atol=1e-11)
+        np.testing.assert_allclose(self.wave.QData, QData, rtol=0, atol=1e-11)
+
+    def test_Gen_FM(self):
+        self.wave.NumPeriods = 2
+        self.wave.Gen_FM()
+        IData, QData = LegacyFM(self.wave.FC1, self.wave.FMod, self.wave.Fs, 2)
+        np.testing.assert_allclose(self.wave.IData, IData, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(self.wave.QData, QData, rtol=0, atol=1e-12)
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,55 @@
+'''Purpose: IFFT multitone generator against a time domain sum'''
+import os
+import sys
+import unittest
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Multitone import IQGen, CrestFactor, TonePhases  # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.wave = IQGen()
+        self.wave.PostNorm = 'none'
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_TimeDomainSum(self):
+        self.wave.NumTones   = 7
+        self.wave.NumPeriods = 3
+        self.wave.ToneAmpl   = [1, 0.5, 0.25, 1, 0.5, 0.25, 1]
+        self.wave.maxAmpl    = 100
+        with contextlib.redirect_stdout(None):
+            self.wave.GenMultitone()
+        t = np.arange(len(self.wave.IData)) / self.wave.Fs
+        IQ = np.zeros(len(t), dtype=complex)
+        for freq, ampl, phase in zip(self.wave.ToneFreqs(), self.wave.ToneAmpl, TonePhases(7)):
+            IQ += ampl * np.exp(1j * (2 * np.pi * freq * t + phase))
+        np.testing.assert_allclose(self.wave.IData, IQ.real, atol=1e-9)
+        np.testing.assert_allclose(self.wave.QData, IQ.imag, atol=1e-9)
+
+    def test_LowCrest(self):
+        self.wave.NumTones = 1000
+        self.wave.PostNorm = 'peak'                 # Normalize before clipping
+        crest = {}
+        for phase in ['zero', 'newman', 'schroeder']:
+            self.wave.TonePhase = phase
+            with contextlib.redirect_stdout(None):
+                self.wave.GenMultitone()
+            crest[phase] = CrestFactor(self.wave.IData, self.wave.QData)
+        self.assertAlmostEqual(crest['zero'], 30.0, places=6)      # 10*log10(NumTones)
+        self.assertLess(crest['newman'], 4)
+        self.assertLess(crest['schroeder'], 4)
+
+    def test_OutOfBand(self):
+        self.wave.ToneStart = 30e6
+        with self.assertRaises(ValueError):
+            self.wave.GenMultitone()
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
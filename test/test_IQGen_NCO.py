@@ -0,0 +1,58 @@
+'''Purpose: NCO tone, chirp and FM against an exact rational phase'''
+import os
+import sys
+import unittest
+from fractions import Fraction
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_NCO import Tone, Chirp, FM, FreqWord, PhaseWords, Expj   # noqa: E402 pylint: disable=E0401,C0413
+
+def ExactPhase(idx, freq, Fs, rate=0.0, phase=0.0):
+    """exp(j*(2*pi*(freq*n/Fs + rate*n*n/(2*Fs*Fs)) + phase)), cycles wrapped exactly"""
+    freq, Fs, rate = Fraction(freq), Fraction(Fs), Fraction(rate)
+    cycles = [float((freq * n / Fs + rate * n * n / (2 * Fs * Fs)) % 1) for n in idx]
+    return np.exp(1j * (2 * np.pi * np.array(cycles) + phase))
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        pass
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Words(self):
+        self.assertEqual(FreqWord(1e6, 4e6), 2 ** 62)
+        self.assertEqual(FreqWord(-1e6, 4e6), 3 * 2 ** 62)
+        np.testing.assert_allclose(Expj(PhaseWords([0.5, -np.pi / 2, 5 * np.pi])),
+                                   np.exp(1j * np.array([0.5, -np.pi / 2, np.pi])), atol=1e-15)
+
+    def test_Tone(self):
+        IQ = Tone(1.234567e6, 2e9, 3000, phase=0.3, block=64)   # Partial last block
+        self.assertEqual(len(IQ), 3000)
+        idx = range(0, 3000, 7)
+        np.testing.assert_allclose(IQ[idx], ExactPhase(idx, 1.234567e6, 2e9, phase=0.3), atol=1e-14)
+        self.assertEqual(len(Tone(1e6, 4e6, 0)), 0)
+
+    def test_LongTone(self):
+        samples = 2 ** 24 + 5                                   # Float t = n/Fs drifts here
+        IQ = Tone(-123.456789e6, 2e9, samples)
+        idx = range(samples - 50, samples)
+        np.testing.assert_allclose(IQ[idx], ExactPhase(idx, -123.456789e6, 2e9), atol=1e-12)
+
+    def test_Chirp(self):
+        idx = range(0, 5000, 3)
+        for freq, rate in [(5e6, 99e12), (500e6, -99e12)]:
+            IQ = Chirp(freq, rate, 2e9, 5000, phase=-1.0, block=32, resync=4)
+            np.testing.assert_allclose(IQ[idx], ExactPhase(idx, freq, 2e9, rate, -1.0), atol=1e-12)
+
+    def test_FM(self):
+        freqs = np.linspace(-1e6, 1e6, 10001)
+        IQ = FM(freqs, 2e9, phase=0.2)
+        np.testing.assert_allclose(IQ, np.exp(1j * (2 * np.pi * np.cumsum(freqs) / 2e9 + 0.2)), atol=1e-12)
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
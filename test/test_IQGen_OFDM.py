@@ -0,0 +1,51 @@
+'''Purpose: OFDM generator against the OFDM.m mapping and a receiver'''
+import os
+import sys
+import unittest
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_OFDM import IQGen, QAMTable                      # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.wave = IQGen()
+        self.wave.NumSymbols = 50
+        self.wave.OverSamp   = 2
+        self.wave.PostNorm   = 'none'
+        self.wave.maxAmpl    = 100
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_MappingTable(self):
+        table = {(0, 0, 0, 0): -3 - 3j, (0, 0, 0, 1): -3 - 1j, (0, 0, 1, 0): -3 + 3j, (0, 0, 1, 1): -3 + 1j,
+                 (0, 1, 0, 0): -1 - 3j, (0, 1, 0, 1): -1 - 1j, (0, 1, 1, 0): -1 + 3j, (0, 1, 1, 1): -1 + 1j,
+                 (1, 0, 0, 0): 3 - 3j, (1, 0, 0, 1): 3 - 1j, (1, 0, 1, 0): 3 + 3j, (1, 0, 1, 1): 3 + 1j,
+                 (1, 1, 0, 0): 1 - 3j, (1, 1, 0, 1): 1 - 1j, (1, 1, 1, 0): 1 + 3j, (1, 1, 1, 1): 1 + 1j}
+        LUT = QAMTable(4)
+        for bits, symbol in table.items():
+            self.assertEqual(LUT[int(''.join(map(str, bits)), 2)], symbol)
+
+    def test_Demodulate(self):
+        with contextlib.redirect_stdout(None):
+            self.wave.GenOFDM()
+        nfft = self.wave.K * self.wave.OverSamp
+        ncp  = self.wave.CP * self.wave.OverSamp
+        rx = (self.wave.IData + 1j * self.wave.QData).reshape(self.wave.NumSymbols, ncp + nfft)
+        np.testing.assert_allclose(rx[:, :ncp], rx[:, nfft:])                  # Cyclic prefix
+        grid = np.fft.fft(rx[:, ncp:], axis=1) / np.sqrt(nfft)
+        pilotCarriers, dataCarriers = self.wave.Carriers()
+        np.testing.assert_allclose(grid[:, self.wave.CarrierBins(pilotCarriers)], 3 + 3j, atol=1e-9)
+        LUT = QAMTable(4)
+        symbols = grid[:, self.wave.CarrierBins(dataCarriers)]
+        index = np.argmin(np.abs(symbols[..., np.newaxis] - LUT), axis=-1)
+        bits = (index[..., np.newaxis] >> np.arange(3, -1, -1)) & 1
+        np.testing.assert_array_equal(bits.reshape(self.wave.NumSymbols, -1), self.wave.Bits)
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
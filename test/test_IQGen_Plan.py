@@ -0,0 +1,74 @@
+'''Purpose: Coherent planner, shortest whole cycle loop for a set of tones'''
+import os
+import sys
+import unittest
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Plan import CoherentPlan, SmoothCeil, ToneGCD    # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_2Tone import IQGen                               # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.wave = IQGen()
+        self.wave.Coherent = 1
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_SmoothCeil(self):
+        self.assertEqual(SmoothCeil(7), 8)
+        self.assertEqual(SmoothCeil(31), 32)
+        self.assertEqual(SmoothCeil(1001), 1024)
+        self.assertEqual(SmoothCeil(49, primes=(2,)), 64)
+
+    def test_Plan(self):
+        self.assertEqual(float(ToneGCD([1e6, -3e6, 0])), 1e6)
+        plan = CoherentPlan([1e6, 3e6], FsMin=30e6)
+        self.assertEqual((plan['Fs'], plan['samples'], plan['F0']), (30e6, 30, 1e6))
+        self.assertEqual(plan['cycles'], [1, 3])
+        plan = CoherentPlan([1e6 / 3, 1.5e6], FsMin=4e6)        # F0 = 1/6 MHz
+        self.assertEqual((plan['Fs'], plan['samples'], plan['cycles']), (4e6, 24, [2, 9]))
+        plan = CoherentPlan([1e6, 3e6], FsMin=0, Fs=2.5e6)      # Fixed clock, two 1/F0 loops
+        self.assertEqual((plan['samples'], plan['periods']), (5, 2))
+        self.assertEqual(CoherentPlan([1e6], FsMin=4e6, minSamples=100)['samples'], 100)
+        with self.assertRaises(ValueError):
+            CoherentPlan([1e6, 1.1e6], FsMin=40e6, FsMax=30e6)
+
+    def test_PhaseContinuous(self):
+        self.wave.FC1 = 1.1e6
+        self.wave.FC2 = 2.3e6
+        self.wave.OverSamp = 10
+        with contextlib.redirect_stdout(None):
+            self.wave.Gen2Tone()
+        N = len(self.wave.IData)
+        self.assertEqual(N, 120)                            # F0 100kHz, Fs >= 11MHz
+        self.assertEqual(self.wave.Fs, 12e6)
+        t = np.arange(2 * N) / self.wave.Fs                 # Looped record equals the continued tones
+        IQ = 0.7071 * (np.exp(2j * np.pi * self.wave.FC1 * t) + np.exp(2j * np.pi * self.wave.FC2 * t))
+        IQ /= np.max(np.abs(IQ[:N]))
+        loop = np.tile(self.wave.IData + 1j * self.wave.QData, 2)
+        np.testing.assert_allclose(loop / np.max(np.abs(loop)), IQ, atol=1e-5)
+
+    def test_MaxSamples(self):
+        with self.assertRaises(ValueError):
+            CoherentPlan([1e6, 1e6 + 0.001], FsMin=30e6)        # F0 1mHz, 3e10 samples
+        with self.assertRaises(ValueError):
+            CoherentPlan([1e6, 3e6], FsMin=30e6, maxSamples=16)
+        self.wave.FC2 = self.wave.FC1 + 0.001
+        with contextlib.redirect_stdout(None):
+            self.wave.Gen2Tone()
+        self.assertEqual(len(self.wave.IData), 300)         # Falls back to OverSamp x NumPeriods
+
+    def test_OneTone(self):
+        self.wave.FC1 = 1e6
+        with contextlib.redirect_stdout(None):
+            self.wave.Gen1Tone_IQ()
+        self.assertEqual(len(self.wave.IData), 30)          # OverSamp 30, one cycle
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
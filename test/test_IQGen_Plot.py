@@ -0,0 +1,62 @@
+'''Purpose: Min/max decimation and headless plots to file'''
+import os
+import sys
+import tempfile
+import unittest
+import subprocess
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Plot import MinMaxDecimate                       # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_MinMaxDecimate(self):
+        y = np.random.default_rng(1).standard_normal(10007)
+        x = np.arange(len(y)) / 1e6
+        xd, env = MinMaxDecimate(y, 100, x)
+        self.assertEqual((len(xd), len(env)), (200, 200))
+        edges = np.linspace(0, len(y), 101).astype(int)
+        for idx in range(100):                              # Each bucket keeps its extremes
+            bucket = y[edges[idx]:edges[idx + 1]]
+            self.assertEqual(env[2 * idx], bucket.min())
+            self.assertEqual(env[2 * idx + 1], bucket.max())
+            self.assertEqual(xd[2 * idx], x[edges[idx]])
+        self.assertEqual((env.min(), env.max()), (y.min(), y.max()))
+
+    def test_MinMaxShort(self):
+        y = np.arange(20.0)
+        xd, env = MinMaxDecimate(y, 10)
+        self.assertIs(env, y)                               # Short enough, untouched
+        np.testing.assert_array_equal(xd, np.arange(20))
+        self.assertEqual(len(MinMaxDecimate(np.arange(5000), 0)[1]), 5000)
+
+    def test_PlotFile(self):
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+        png = os.path.join(self.tmp.name, 'Tone.png')
+        code = ("import sys, IQGen_2Tone\n"
+                "wave = IQGen_2Tone.IQGen()\n"
+                "wave.NumPeriods = 1000\n"
+                "wave.Gen2Tone()\n"
+                f"wave.PlotFile = {png!r}\n"
+                "wave.plot_IQ_FFT()\n"
+                "wave.plotLine(wave.IData, wave.QData)\n"
+                "print('matplotlib.pyplot' in sys.modules)\n")
+        out = subprocess.run([sys.executable, '-c', code], cwd=src, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip().splitlines()[-1], 'False')
+        with open(png, 'rb') as fin:
+            self.assertEqual(fin.read(8), b'\x89PNG\r\n\x1a\n')
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
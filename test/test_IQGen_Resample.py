@@ -0,0 +1,89 @@
+'''Purpose: Polyphase resampler against tones generated at the output rate'''
+import os
+import sys
+import unittest
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Resample import Resample, Ratio, KaiserFilter    # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_NCO import Tone                                  # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_Mod import IQGen                                 # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.wave = IQGen()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Ratio(self):
+        self.assertEqual(Ratio(30e6, 45e6), (3, 2))
+        self.assertEqual(Ratio(20e6, 2e9), (100, 1))
+        self.assertEqual(Ratio(10e6, 12.34e6), (617, 500))
+        with self.assertRaises(ValueError):
+            Ratio(1e6, 2.5e9)                                   # up > MAXDEN
+        h, delay = KaiserFilter(3, 2)
+        self.assertEqual(len(h) % 3, 0)
+        self.assertAlmostEqual(np.sum(h), 3, places=3)          # DC gain up
+
+    def test_Tone(self):
+        for Fs, FsOut in [(30e6, 45e6), (20e6, 2e9), (10e6, 12.34e6), (100e6, 10e6), (100e6, 99.9e6)]:
+            x = Tone(1e6, Fs, int(Fs / 1e4), phase=0.4)         # Whole cycles, loops seamlessly
+            y, FsNew = Resample(x, Fs, FsOut)
+            self.assertEqual((FsNew, len(y)), (FsOut, int(FsOut / 1e4)))
+            np.testing.assert_allclose(y, Tone(1e6, FsOut, len(y), phase=0.4), atol=1e-4)   # 80dB
+
+    def test_Empty(self):
+        y, FsNew = Resample(np.zeros(0, dtype=np.complex64), 30e6, 45e6)
+        self.assertEqual((len(y), y.dtype, FsNew), (0, np.complex128, 45e6))
+
+    def test_Approximate(self):
+        self.wave.Fs = 1e6
+        self.wave.IData = np.ones(1000)
+        self.wave.QData = np.zeros(1000)
+        with contextlib.redirect_stdout(None):
+            self.wave.Resample(np.pi * 1e6)                     # Irrational ratio, up/down <= 1000
+        event = self.wave.Events[-1]
+        self.assertEqual((event['stage'], event['FsOut']), ('resample', np.pi * 1e6))
+        self.assertEqual(event['Fs'], self.wave.Fs)
+        self.assertNotEqual(event['Fs'], event['FsOut'])
+        self.assertAlmostEqual(event['Fs'] / event['FsOut'], 1, places=5)
+
+    def test_Transition(self):
+        x = Tone(1e6, 30e6, 300)
+        for trans in [0, 1, -0.2, 8.6]:
+            with self.assertRaises(ValueError):
+                Resample(x, 30e6, 45e6, trans)
+        self.wave.Fs = 30e6
+        self.wave.IQ = x
+        self.wave.fBeta = 8.6                                   # GUI filter beta, not used by Resample
+        self.wave.fTrans = 0.4                                  # Wider transition, shorter filter
+        with contextlib.redirect_stdout(None):
+            self.wave.Resample(45e6)
+        np.testing.assert_allclose(self.wave.IQ, Resample(x, 30e6, 45e6, 0.4)[0])
+        self.assertLess(len(KaiserFilter(3, 2, 0.4)[0]), len(KaiserFilter(3, 2)[0]))
+        self.wave.fTrans = 0
+        with self.assertRaises(ValueError):
+            self.wave.Resample(30e6)
+
+    def test_Stopband(self):
+        x = Tone(1e6, 100e6, 10000) + Tone(45e6, 100e6, 10000)  # 45MHz beyond the 10MHz output band
+        y, _ = Resample(x, 100e6, 10e6)
+        np.testing.assert_allclose(y, Tone(1e6, 10e6, 1000), atol=1e-4)
+
+    def test_FsOut(self):
+        self.wave.FsChirp = 20e6                                # Narrow +/-2.5MHz sweep synthesized at 20MHz
+        self.wave.FsOut   = 2e9
+        with contextlib.redirect_stdout(None):
+            self.wave.Gen_FMChirpSum()
+        self.assertEqual((self.wave.Fs, len(self.wave.IData)), (2e9, 100 * 19999))     # fm1 has Points-1 steps
+        self.assertEqual([event['stage'] for event in self.wave.Events], ['resample', 'postprocess'])
+        self.assertLess(np.max(np.abs(self.wave.IQ[1000:-1000])), 0.71)     # Edges ring, loop is not continuous
+        self.assertGreater(np.min(np.abs(self.wave.IQ[1000:-1000])), 0.70)
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,75 @@
+'''Purpose: SCPI upload against the local mock instrument'''
+import io
+import os
+import sys
+import unittest
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_SCPI import MockSCPI, SCPISock, SCPIPool                  # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_2Tone import IQGen                               # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.mock = MockSCPI()
+        self.wave = IQGen()
+        with contextlib.redirect_stdout(None):
+            self.wave.Gen2Tone()
+        self.wave.VSGHost = self.mock.host
+        self.wave.VSGPort = self.mock.port
+
+    def tearDown(self):                             # Run after each test
+        self.mock.close()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_VSG_SCPI_Write(self):
+        with contextlib.redirect_stdout(None):
+            self.wave.VSG_SCPI_Write()
+        data = np.frombuffer(self.mock.files['NVWFM://var//user//IQGen.wv'], '>i2')
+        self.assertEqual(len(data), 2 * len(self.wave.IData))
+        np.testing.assert_array_equal(data[0::2], np.rint(self.wave.IData * 32767))
+        np.testing.assert_array_equal(data[1::2], np.rint(self.wave.QData * 32767))
+        self.assertEqual(self.mock.commands, [f'SOUR1:BB:ARB:WAV:CLOC "/var/user/IQGen.wv",{self.wave.Fs}',
+                                              'BB:ARB:WAV:SEL "/var/user/IQGen.wv"',
+                                              'SYST:ERR?'])
+
+    def test_Saturation(self):
+        self.wave.IData[:3] = 1.5                           # Beyond full scale, not clipped
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(self.wave.VSG_SCPI_Write(), 3)
+            with SCPIPool(port=self.mock.port) as pool:
+                self.assertEqual(self.wave.VSG_SCPI_Write(name='P.wv', pool=pool), 3)
+        self.assertEqual(out.getvalue().count('3 samples saturated'), 2)
+        self.assertEqual([event['saturated'] for event in self.wave.Events if event['stage'] == 'upload'], [3, 3])
+
+    def test_Block_Chunks(self):
+        SMW = SCPISock(self.mock.host, self.mock.port)
+        SMW.write_block(':MMEM:DATA:UNPR "NVWFM://var//user//A.wv",', self.wave.IData, self.wave.QData, chunk=7)
+        SMW.write_block(':MMEM:DATA:UNPR "NVWFM://var//user//B.wv",', self.wave.IData, self.wave.QData)
+        self.assertEqual(SMW.query('*IDN?;SYST:ERR?'), 'Rohde&Schwarz,SMW200A,Mock,0.0;0,"No error"')
+        SMW.close()
+        self.assertEqual(self.mock.files['NVWFM://var//user//A.wv'], self.mock.files['NVWFM://var//user//B.wv'])
+
+    def test_Pool_Batch(self):
+        with MockSCPI() as mock2, SCPIPool(port=self.mock.port) as pool:
+            for idx in range(3):
+                self.wave.VSG_SCPI_Write(name=f'W{idx}.wv', pool=pool)
+            pool.Session(mock2.host, mock2.port).write('BAD:CMD?')
+            errors = pool.Check()
+        self.assertEqual(sorted(self.mock.files), [f'NVWFM://var//user//W{idx}.wv' for idx in range(3)])
+        self.assertEqual(len(self.mock.commands), 4)                # One config line per upload + check
+        self.assertNotEqual(mock2.port, self.mock.port)            # Same host, two instruments
+        self.assertEqual(errors, {(self.mock.host, self.mock.port): [],
+                                  (mock2.host, mock2.port): ['-113,"Undefined header;BAD:CMD?"']})
+        latency = pool.Latency()
+        self.assertEqual([latency[op][0] for op in ('open', 'upload', 'config', 'check')], [2, 3, 3, 2])
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
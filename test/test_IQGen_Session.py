@@ -0,0 +1,74 @@
+'''Purpose: Parameter only GUI session save/load'''
+import os
+import sys
+import json
+import tempfile
+import unittest
+import contextlib
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Session import Session, SessionLoad, HISTMAX     # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_Cache import WvCache                             # noqa: E402 pylint: disable=E0401,C0413
+from IQGen_2Tone import IQGen                               # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file = os.path.join(self.tmp.name, 'Session.json')
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_RoundTrip(self):
+        sizes = []
+        for NumPeriods in [10000, 90000]:
+            wave = IQGen()
+            wave.NumPeriods = NumPeriods
+            with contextlib.redirect_stdout(None):
+                wave.Gen2Tone()
+            session = Session()
+            session.Record(wave)
+            session.Save(self.file)
+            sizes.append(os.path.getsize(self.file))
+        self.assertEqual(sizes[0], sizes[1])                # No samples saved
+        again = SessionLoad(self.file).Wave()
+        self.assertEqual((again.NumPeriods, again.FC1, len(again.IData)), (90000, wave.FC1, 0))
+
+    def test_History(self):
+        session = Session()
+        wave = IQGen()
+        for FC1 in [1e6, 1e6, 2e6] + [3e6 + n for n in range(HISTMAX)]:
+            wave.FC1 = FC1
+            session.Record(wave)
+        self.assertEqual(len(session.history), HISTMAX)
+        session = Session()
+        for FC1 in [1e6, 1e6, 2e6]:
+            wave.FC1 = FC1
+            session.Record(wave)
+        self.assertEqual([entry['params']['FC1'] for entry in session.history], [1e6, 2e6])
+
+    def test_LazyGenerate(self):
+        session = Session(params={'NumPeriods': 20})
+        cache = WvCache(os.path.join(self.tmp.name, 'cache'))
+        with contextlib.redirect_stdout(None):
+            first = session.Generate(cache)
+            second = session.Generate(cache)
+        self.assertEqual(len(first.IData), 600)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        self.assertEqual(second.IQ.tolist(), first.IQ.tolist())
+
+    def test_Version(self):
+        with open(self.file, 'w') as fot:
+            json.dump({'version': 99, 'params': {'FC1': 5}}, fot)
+        with contextlib.redirect_stdout(None):
+            self.assertEqual(SessionLoad(self.file).params, {})
+        self.assertEqual(SessionLoad(os.path.join(self.tmp.name, 'Missing.json')).params, {})
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
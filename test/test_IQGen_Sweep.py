@@ -0,0 +1,74 @@
+'''Purpose: Sweep grid, per point file names and the manifest'''
+import os
+import sys
+import json
+import tempfile
+import unittest
+import contextlib
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Sweep import Sweep, SweepGrid, SweepName         # noqa: E402 pylint: disable=E0401,C0413
+from ReadWv import WvFile                                   # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Grid(self):
+        points = SweepGrid({'FC1': [1e6, 2e6], 'PostNorm': ['peak', 'rms']})
+        self.assertEqual(len(points), 4)
+        self.assertEqual(points[1], {'FC1': 1e6, 'PostNorm': 'rms'})
+
+    def test_UniqueNames(self):
+        grid = {'FC1': [100e6, 100.0001e6], 'NumPeriods': [12], 'PostNorm': ['peak', 'rms'], 'ToneAmpl': [[1, 2], [12]]}
+        names = [SweepName('Gen1Tone_IQ', params) for params in SweepGrid(grid)]
+        self.assertEqual(len(set(names)), len(names))
+        self.assertIn('FC1-100000100.0', names[-1])
+        self.assertIn('PostNorm-rms', names[-1])
+        for name in names:
+            self.assertEqual(name, os.path.basename(name))  # No path separators from values
+
+    def test_Manifest(self):
+        grid = {'FC1': [1e6, 1.000001e6], 'PostNorm': ['peak', 'rms'], 'NumPeriods': [2]}
+        with contextlib.redirect_stdout(None):
+            result = Sweep('IQGen_2Tone', 'Gen2Tone', grid, path=self.tmp.name, workers=0)
+        with open(os.path.join(self.tmp.name, 'Gen2Tone_manifest.json')) as fin:
+            manifest = json.load(fin)
+        self.assertEqual(manifest['module'], 'IQGen_2Tone')
+        self.assertEqual(manifest['grid'], grid)
+        self.assertEqual(len(manifest['jobs']), 4)
+        self.assertEqual(len({job['file'] for job in manifest['jobs']}), 4)
+        for job, params in zip(manifest['jobs'], SweepGrid(grid)):
+            self.assertEqual(job['params'], params)
+            self.assertTrue(os.path.exists(job['file']))
+            self.assertEqual(job['bytes'], os.path.getsize(job['file']))
+            self.assertEqual(job['samples'], 60)                # OverSamp 30 x NumPeriods 2
+            self.assertIn('generate', [event['stage'] for event in job['events']])
+        self.assertEqual([job['file'] for job in result['jobs']], [job['file'] for job in manifest['jobs']])
+
+    def test_ProcessPool(self):
+        grid = {'FC1': [1e6, 2e6, 3e6], 'NumPeriods': [2]}
+        serial = os.path.join(self.tmp.name, 'serial')
+        with contextlib.redirect_stdout(None):
+            result = Sweep('IQGen_2Tone', 'Gen2Tone', grid, path=self.tmp.name, workers=2, png=1)
+            Sweep('IQGen_2Tone', 'Gen2Tone', grid, path=serial, workers=0, manifest=False)
+        self.assertEqual([job['params'] for job in result['jobs']], SweepGrid(grid))   # Grid order kept
+        for job in result['jobs']:
+            self.assertNotEqual(job['pid'], os.getpid())
+            self.assertTrue(os.path.exists(job['file'][:-3] + '.png'))
+            self.assertIn('GenCW:', job['log'])
+            ref = WvFile(os.path.join(serial, os.path.basename(job['file'])))
+            np.testing.assert_array_equal(WvFile(job['file']).IQ(), ref.IQ())     # Same samples as in process
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,59 @@
+'''Purpose: GUI background worker, results, errors and cancellation'''
+import os
+import sys
+import time
+import threading
+import unittest
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQGen_Worker import Worker                             # noqa: E402 pylint: disable=E0401,C0413
+
+def WaitEvents(worker, count, timeout=5):
+    events = []
+    stop = time.time() + timeout
+    while len(events) < count and time.time() < stop:
+        events += list(worker.poll())
+        time.sleep(0.01)
+    return events
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.worker = Worker()
+
+    def tearDown(self):                             # Run after each test
+        self.worker.close()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Done_Error(self):
+        self.worker.submit('Add', lambda worker, a, b: a + b, 1, 2)
+        self.worker.submit('Fail', lambda worker: 1 / 0)
+        events = WaitEvents(self.worker, 2)
+        self.assertEqual(events[0], ('done', 'Add', 3))
+        self.assertEqual(events[1][:2], ('error', 'Fail'))
+        self.assertIsInstance(events[1][2], ZeroDivisionError)
+
+    def test_Cancel(self):
+        started = threading.Event()
+
+        def job(worker):
+            started.set()
+            while 1:
+                worker.progress('spin')
+                time.sleep(0.005)
+        self.worker.submit('Spin', job)
+        self.worker.submit('Queued', lambda worker: 'never')
+        started.wait(5)
+        self.worker.cancel()
+        events = [event for event in WaitEvents(self.worker, 1000, timeout=0.5) if event[0] != 'progress']
+        self.assertEqual(sorted(events), [('cancelled', 'Queued', None), ('cancelled', 'Spin', None)])
+        self.assertFalse(self.worker.busy())
+        self.worker.submit('After', lambda worker: 'ok')        # Worker still usable
+        self.assertEqual(WaitEvents(self.worker, 1), [('done', 'After', 'ok')])
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
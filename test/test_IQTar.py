@@ -0,0 +1,64 @@
+'''Purpose: iq-tar read/write'''
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from IQTar import IQTarWrite, IQTarRead                     # noqa: E402 pylint: disable=E0401,C0413
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+        t = np.arange(5000)
+        self.iq = np.exp(2j * np.pi * t / 40).astype(np.complex64)
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_RoundTrip_Mmap(self):
+        filename = IQTarWrite(os.path.join(self.tmp.name, 'One'), self.iq, 1e6, chunk=333)
+        self.assertTrue(filename.endswith('One.iq.tar'))
+        iq, Fs, meta = IQTarRead(filename)
+        self.assertIsInstance(iq.base, np.memmap)
+        self.assertEqual((Fs, meta['Format'], meta['DataFilename']), (1e6, 'complex', 'One.complex.1ch.float32'))
+        np.testing.assert_array_equal(iq, self.iq)
+
+    def test_Markup_DottedName(self):
+        filename = IQTarWrite(os.path.join(self.tmp.name, 'tone_1.5GHz&A.iq.tar'), self.iq, 1e6, comment='I&Q <test> "x"')
+        iq, _, meta = IQTarRead(filename)
+        self.assertEqual(meta['Comment'], 'I&Q <test> "x"')
+        self.assertEqual(meta['DataFilename'], 'tone_1.5GHz&A.complex.1ch.float32')
+        with tarfile.open(filename) as tar:
+            self.assertEqual(sorted(tar.getnames()), ['tone_1.5GHz&A.complex.1ch.float32', 'tone_1.5GHz&A.xml'])
+        np.testing.assert_array_equal(iq, self.iq)
+
+    def test_Payload_Layout(self):
+        filename = IQTarWrite(os.path.join(self.tmp.name, 'Lay.iq.tar'), self.iq[:3], 1e6)
+        with tarfile.open(filename) as tar:
+            raw = tar.extractfile('Lay.complex.1ch.float32').read()
+        self.assertEqual(np.frombuffer(raw, '<f4').tolist(), np.column_stack((self.iq[:3].real, self.iq[:3].imag)).ravel().tolist())
+
+    def test_MultiChannel(self):
+        iq = np.stack((self.iq, 0.5 * self.iq, -self.iq), axis=1)
+        filename = IQTarWrite(os.path.join(self.tmp.name, 'Mimo.iq.tar'), iq, 2e6)
+        iqRead, _, meta = IQTarRead(filename, mmap=0)
+        self.assertEqual(meta['NumberOfChannels'], '3')
+        np.testing.assert_array_equal(iqRead, iq)
+
+    def test_Real(self):
+        filename = IQTarWrite(os.path.join(self.tmp.name, 'Real.iq.tar'), self.iq.real, 1e6)
+        iqRead, _, meta = IQTarRead(filename)
+        self.assertEqual(meta['Format'], 'real')
+        np.testing.assert_array_equal(iqRead, self.iq.real)
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -1,10 +1,12 @@
 '''Purpose: Import Library-->Create Object-->Catch obvious typos'''
-import unittest
+import os
 import sys
+import unittest
+import importlib
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
 
 class TestGeneral(unittest.TestCase):
     def setUp(self):                                # Run before each test
-        sys.path.append('..')
         print("", end="")
 
     def tearDown(self):                             # Run after each test
@@ -13,15 +15,20 @@ class TestGeneral(unittest.TestCase):
 ###############################################################################
 # ## <Test>
 ###############################################################################
-    def test_Covid_Class(self):
-        from src.covid import covid
-        self.baz = covid()
-        self.assertEqual(self.baz.foo, 'N')          # Check default value
+    def test_2Tone_Class(self):
+        from IQGen_2Tone import IQGen               # pylint: disable=E0401,C0415
+        self.baz = IQGen()
+        self.assertEqual(self.baz.OverSamp, 30)      # Check default value
+
+    def test_Mod_Class(self):
+        from IQGen_Mod import IQGen                 # pylint: disable=E0401,C0415
+        self.eggs = IQGen()
+        self.assertEqual(self.eggs.FMod, 10e3)       # Check default value
 
-    def test_Spam_Class(self):
-        from src.spam import spam
-        self.eggs = spam()
-        self.assertEqual(self.eggs.ham, 'ham')       # Check default value
+    def test_Modules(self):
+        for module in ['CreateWv3', 'ReadWv', 'IQTar', 'IQGen_Common', 'IQGen_Cache', 'IQGen_Multitone',
+                       'IQGen_OFDM', 'IQGen_Plot', 'IQGen_SCPI', 'IQGen_Spectrum', 'IQGen_Sweep']:
+            importlib.import_module(module)
 
 ###############################################################################
 # ## </Test>
@@ -0,0 +1,76 @@
+'''Purpose: Benchmark suite regression compare on saved JSON runs'''
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+import contextlib
+BENCH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bench')
+sys.path.insert(0, BENCH)
+from bench_Suite import Compare                             # noqa: E402 pylint: disable=E0401,C0413
+
+def Run(entries):
+    """Saved run with (name, samples, sec, peakMB) results"""
+    return {'date': '2026-10-17 12:00:00', 'python': '3.8.10', 'numpy': '1.24.4', 'platform': 'test', 'repeat': 3,
+            'results': [{'name': name, 'samples': samples, 'sec': sec, 'peakMB': peakMB}
+                        for name, samples, sec, peakMB in entries]}
+
+BASE = Run([('Gen2Tone', 10000, 0.010, 1.0),
+            ('Gen2Tone', 100000, 0.0001, 1.0),
+            ('Gen_FM', 10000, 0.010, 10.0),
+            ('FFT', 10000, 0.010, 0.1),
+            ('WvWrite', 10000, 0.010, 1.0),
+            ('CreateWv', 10000, 0.010, 1.0)])
+NEW  = Run([('Gen2Tone', 10000, 0.020, 1.0),                # 2x slower: flagged
+            ('Gen2Tone', 100000, 0.0002, 1.0),              # 2x slower, under the time floor
+            ('Gen_FM', 10000, 0.010, 20.0),                 # 2x memory: flagged
+            ('FFT', 10000, 0.010, 0.5),                     # 5x memory, under 1MB more
+            ('WvWrite', 10000, 0.012, 1.2),                 # Within threshold
+            ('CreateWv', 10000, 0.005, 1.0),                # Faster
+            ('Gen_FMChirp', 10000, 1.0, 100.0)])            # Not in base
+
+class TestGeneral(unittest.TestCase):
+    def setUp(self):                                # Run before each test
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):                             # Run after each test
+        self.tmp.cleanup()
+
+    def save(self, name, run):
+        fileOut = os.path.join(self.tmp.name, name)
+        with open(fileOut, 'w') as fot:
+            json.dump(run, fot)
+        return fileOut
+
+###############################################################################
+# ## <Test>
+###############################################################################
+    def test_Compare(self):
+        with open(self.save('base.json', BASE)) as fin:
+            base = json.load(fin)
+        with open(self.save('new.json', NEW)) as fin:
+            new = json.load(fin)
+        with contextlib.redirect_stdout(None):
+            regress = Compare(base, new)
+        self.assertEqual([(res['name'], res['samples']) for res in regress], [('Gen2Tone', 10000), ('Gen_FM', 10000)])
+        with contextlib.redirect_stdout(None):
+            self.assertEqual(Compare(base, new, threshold=2.5), [])     # 2x passes, the 5x is under 1MB
+            self.assertEqual(Compare(base, base), [])
+
+    def test_CompareFiles(self):
+        base, new = self.save('base.json', BASE), self.save('new.json', NEW)
+        script = os.path.join(BENCH, 'bench_Suite.py')
+        out = subprocess.run([sys.executable, script, new, '--compare', base], capture_output=True, text=True)
+        self.assertEqual(out.returncode, 1)
+        self.assertIn('Bench: 2 regressions', out.stdout)
+        self.assertEqual(out.stdout.count('REGRESSION'), 2)
+        out = subprocess.run([sys.executable, script, base, '--compare', base], capture_output=True, text=True)
+        self.assertEqual((out.returncode, out.stdout.splitlines()[-1]), (0, 'Bench: 0 regressions'))
+
+###############################################################################
+# ## </Test>
+###############################################################################
+if __name__ == '__main__':                          # pragma: no cover
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestGeneral)
+    unittest.TextTestRunner(verbosity=2).run(suite)